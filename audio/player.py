@@ -2,9 +2,7 @@ import subprocess
 import os
 import random
 import pygame
-import requests
 from pathlib import Path
-from yt_dlp import YoutubeDL
 
 PROJECT = Path(__file__).parent.parent
 CACHE   = PROJECT / "audio_cache"
@@ -37,6 +35,7 @@ class AudioPlayer:
         self._last_raw_path = None
 
     def download_youtube(self, artist: str, title: str) -> Path:
+        from yt_dlp import YoutubeDL   # slow to import; only needed once a track is fetched
         query = f"ytsearch1:{artist} - {title}"
         with YoutubeDL(YDL_OPTS) as ydl:
             info = ydl.extract_info(query, download=True)
@@ -64,16 +63,24 @@ class AudioPlayer:
         path = PROJECT / f"{stem}.{ext}"
         if path.exists(): self.play_file(self.convert_to_wav(path))
 
-    def play_full_from_youtube(self, artist, track):
+    def fetch_wav(self, artist, track):
+        """Download + convert without playing; None on failure."""
         try:
             self.delete_last_cache()
             raw_path = self.download_youtube(artist, track)
-            wav_path = self.convert_to_wav(raw_path)
-            self.play_file(wav_path)
+            return self.convert_to_wav(raw_path)
         except Exception as e:
-            print("[WARN] Music download/playback failed:", e)
-            # Optionally play a fallback sound or skip
+            print("[WARN] Music download failed:", e)
+            return None
+
+    def play_full_from_youtube(self, artist, track):
+        wav_path = self.fetch_wav(artist, track)
+        if wav_path is None:
             return
+        try:
+            self.play_file(wav_path)
+        except Exception as e:
+            print("[WARN] Music playback failed:", e)
 
     def pick_track_index(self, emotion: str, total: int) -> int:
         pool = [i for i in EMOTION_PLAYLIST.get(emotion, range(total)) if i < total]
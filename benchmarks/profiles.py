@@ -0,0 +1,65 @@
+# benchmarks/profiles.py
+"""
+Synthetic user_profile.json blobs shaped like the Google/Spotify collectors'
+output, scaled by item count and generated from a seed.
+"""
+from __future__ import annotations
+import datetime as _dt
+import random
+
+SIZES = {
+    "small":  10,
+    "medium": 1_000,
+    "large":  20_000,
+}
+
+_WORDS = (
+    "midnight orange echo paper glass river quiet static velvet ember "
+    "harbor signal winter lantern orbit copper hollow meadow neon thread"
+).split()
+
+_EVENT_KINDS = ("Interview", "Birthday", "Meeting", "Exam", "Concert", "Party", "Dentist", "Call")
+
+def _phrase(rng: random.Random, n: int = 3) -> str:
+    return " ".join(rng.choice(_WORDS) for _ in range(n)).title()
+
+def synthetic_profile(n: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    today = _dt.date.today()
+    events = []
+    for _ in range(n):
+        day = today + _dt.timedelta(days=rng.randint(-30, 60))
+        events.append({
+            "summary": f"{rng.choice(_EVENT_KINDS)} {_phrase(rng, 2)}",
+            "start": f"{day.isoformat()}T{rng.randint(8, 20):02d}:00:00Z",
+            "end":   f"{day.isoformat()}T{rng.randint(8, 20):02d}:30:00Z",
+        })
+    tracks = [
+        {"id": f"t{i}", "name": _phrase(rng), "artists": [_phrase(rng, 2)], "uri": f"spotify:track:t{i}"}
+        for i in range(max(20, n // 50))
+    ]
+    return {
+        "full_name": "Bench Player",
+        "google": {
+            "profile": {"name": "Bench Player", "given_name": "Bench", "email": "bench@example.com",
+                        "birthdate": (today - _dt.timedelta(days=365 * 30 - 5)).isoformat()},
+            "calendar_events": events,
+            "youtube_history": [
+                {"title": _phrase(rng, 4), "url": "", "channelTitle": _phrase(rng, 2)} for _ in range(n)
+            ],
+            "contacts": [{"name": _phrase(rng, 2), "email": "", "birthday": ""} for _ in range(max(10, n // 10))],
+            "gmail_subjects": [_phrase(rng, 5) for _ in range(5)],
+            "tasks": [_phrase(rng, 3) for _ in range(10)],
+            "youtube_channels": [_phrase(rng, 2) for _ in range(5)],
+        },
+        "spotify": {
+            "top_tracks": tracks,
+            "audio_features": {
+                t["id"]: {"id": t["id"], "valence": rng.random(), "energy": rng.random()} for t in tracks
+            },
+            "playlists": [_phrase(rng, 2) for _ in range(10)],
+            "genres": [rng.choice(_WORDS) + " pop" for _ in range(8)],
+            "top_artist": _phrase(rng, 2),
+            "liked_tracks": [_phrase(rng) for _ in range(5)],
+        },
+    }
@@ -0,0 +1,157 @@
+# benchmarks/run.py
+"""
+Hot-path benchmarks that run without the GGUF model or network.
+
+    python -m benchmarks.run                        # all sizes, JSON to stdout
+    python -m benchmarks.run --sizes small,large --latency-ms 20 --out bench.json
+    python -m benchmarks.run --compare bench.json   # print ratios vs an earlier run
+
+Every benchmark seeds `random` and the stub LLM, so two runs on the same
+tree do the same work and their JSON can be compared key by key.
+"""
+from __future__ import annotations
+import argparse
+import itertools
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from benchmarks.profiles import SIZES, synthetic_profile
+from benchmarks.stub_llm import StubLLM
+from llm import model_interface
+from llm.metrics import METRICS
+
+ROOT = Path(__file__).parent.parent
+
+def _timings(samples: list[float]) -> dict:
+    ms = sorted(s * 1000 for s in samples)
+    return {
+        "n":         len(ms),
+        "mean_ms":   round(statistics.fmean(ms), 4),
+        "median_ms": round(statistics.median(ms), 4),
+        "p95_ms":    round(ms[min(len(ms) - 1, int(len(ms) * 0.95))], 4),
+        "min_ms":    round(ms[0], 4),
+    }
+
+def _time(fn, repeat: int) -> list[float]:
+    out = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        out.append(time.perf_counter() - t0)
+    return out
+
+# ──────────────────────────────────────────────────────────────────────────
+# Benchmarks
+# ──────────────────────────────────────────────────────────────────────────
+def bench_construct(profile: dict, repeat: int) -> dict:
+    from maze.generator import MazeGenerator
+    # pregenerate=False: background NPC threads would share the stub's call
+    # counter and make later benchmarks nondeterministic.
+    return _timings(_time(lambda: MazeGenerator(profile, pregenerate=False), repeat))
+
+def _fresh_cells():
+    """Cells far from the origin that no walk has entered: each one builds a new room."""
+    return ((x, -1_000_000) for x in itertools.count())
+
+def bench_unique_room(maze, n: int) -> dict:
+    cells = _fresh_cells()
+    samples = _time(lambda: maze._new_room(next(cells)).description, n)
+    res = _timings(samples)
+    res["rooms_per_s"] = round(n / sum(samples), 1)
+    return res
+
+def bench_gen_npc(maze, n: int) -> dict:
+    METRICS.reset()
+    room = maze._new_room(next(_fresh_cells())).description
+    res = _timings(_time(lambda: maze._gen_npc(room, "a"), n))
+    m = METRICS.summary()
+    res["avg_attempts"]  = m["avg_npc_attempts"]
+    res["exhausted"]     = m["npc_exhausted"]
+    res["fallback_rate"] = m["fallback_rate"]
+    return res
+
+def bench_npc_stats(maze, repeat: int) -> dict:
+    return _timings(_time(maze.get_npc_stats, repeat))
+
+def bench_pick_track(profile: dict, repeat: int) -> dict:
+    from audio.player import AudioPlayer
+    player = AudioPlayer.__new__(AudioPlayer)   # skip pygame.mixer.init(); selection only
+    tracks = profile["spotify"]["top_tracks"]
+    feats = profile["spotify"]["audio_features"]
+    emotions = ["happy", "sad", "angry", "neutral"]
+    i = iter(range(repeat))
+    return _timings(_time(lambda: player.pick_track_by_emotion(emotions[next(i) % 4], tracks, feats), repeat))
+
+def run(sizes: list[str], latency_ms: float, valid_rate: float, seed: int, repeat: int) -> dict:
+    from maze.generator import MazeGenerator
+    results: dict[str, dict] = {}
+    for size in sizes:
+        profile = synthetic_profile(SIZES[size], seed)
+        model_interface.set_backend(StubLLM(latency_ms, valid_rate, seed))
+        random.seed(seed)
+        r: dict[str, dict] = {}
+        r["construct"] = bench_construct(profile, max(1, repeat // 10))
+        maze = MazeGenerator(profile, pregenerate=False)
+        r["unique_room"] = bench_unique_room(maze, repeat * 10)
+        r["gen_npc"] = bench_gen_npc(maze, repeat)
+        r["npc_stats"] = bench_npc_stats(maze, repeat)
+        r["pick_track"] = bench_pick_track(profile, repeat * 10)
+        results[size] = r
+        print(f"[INFO] {size}: done", file=sys.stderr)
+    model_interface.set_backend(None)
+    return results
+
+def git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+def compare(old: dict, new: dict) -> None:
+    """Print new/old ratios for every mean_ms both runs share (<1.0 is faster)."""
+    for size, benches in new["results"].items():
+        for name, res in benches.items():
+            prev = old.get("results", {}).get(size, {}).get(name)
+            if prev and prev.get("mean_ms"):
+                ratio = res["mean_ms"] / prev["mean_ms"]
+                print(f"{size:>7} {name:<12} {prev['mean_ms']:>10.3f} → {res['mean_ms']:>10.3f} ms  x{ratio:.2f}")
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Maze of Me hot-path benchmarks")
+    ap.add_argument("--sizes", default=",".join(SIZES), help="comma list of: " + ", ".join(SIZES))
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="stub LLM latency per call")
+    ap.add_argument("--valid-rate", type=float, default=0.7, help="share of stub replies with a hook token")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--repeat", type=int, default=50)
+    ap.add_argument("--out", type=Path, help="write JSON here instead of stdout")
+    ap.add_argument("--compare", type=Path, help="earlier JSON result to compare against")
+    args = ap.parse_args(argv)
+
+    sizes = [s.strip() for s in args.sizes.split(",") if s.strip()]
+    report = {
+        "meta": {
+            "git": git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {"sizes": sizes, "latency_ms": args.latency_ms, "valid_rate": args.valid_rate,
+                       "seed": args.seed, "repeat": args.repeat},
+        },
+        "results": run(sizes, args.latency_ms, args.valid_rate, args.seed, args.repeat),
+    }
+    text = json.dumps(report, indent=2)
+    if args.out:
+        args.out.write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    if args.compare:
+        compare(json.loads(args.compare.read_text(encoding="utf-8")), report)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# benchmarks/simulate.py
+"""
+Headless sessions over MazeGenerator for load tests and regression checks.
+
+No audio, no input(): each session plays a scripted or random sequence of
+actions and every action is timed.
+
+    python -m benchmarks.simulate                               # 1 random session, stub LLM
+    python -m benchmarks.simulate --sessions 8 --actions 200 --latency-ms 30
+    python -m benchmarks.simulate --profile user_profile.json --llm real --script walk.txt
+
+A script has one action per line (`#` starts a comment):
+
+    move 1          # 1/2/3/b like the CLI menu (left/right/forward/back)
+    greet
+    talk a          # a/b/c/d dialogue option
+    inspect
+    feedback 2      # 1..4 = Happy/Sad/Angry/Neutral
+
+Sessions run on threads, so with `--llm real` they queue on the model's
+scheduler exactly like concurrent players would.  With more than one
+session the stub's call order (and so its replies) is no longer
+deterministic; latency numbers are still comparable.
+"""
+from __future__ import annotations
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from benchmarks.profiles import SIZES, synthetic_profile
+from benchmarks.run import git_rev
+from benchmarks.stub_llm import StubLLM
+from llm import model_interface
+from llm.metrics import METRICS
+from utils.json_io import load_json
+
+ACTIONS  = ("move", "greet", "talk", "inspect", "feedback")
+FEEDBACK = {"1": "😊 Happy", "2": "😢 Sad", "3": "😡 Angry", "4": "😐 Neutral"}
+_WEIGHTS = {"move": 3, "talk": 3, "inspect": 2, "feedback": 1}
+
+Action = tuple[str, str]
+
+def parse_script(text: str) -> list[Action]:
+    out: list[Action] = []
+    for n, raw in enumerate(text.splitlines(), 1):
+        line = raw.split("#", 1)[0].strip()
+        if not line:
+            continue
+        kind, _, arg = line.partition(" ")
+        if kind not in ACTIONS:
+            raise ValueError(f"line {n}: unknown action {kind!r}")
+        out.append((kind, arg.strip()))
+    return out
+
+def random_actions(n: int, rng: random.Random) -> list[Action]:
+    """A plausible walk: greet after most moves, talk/inspect/feedback in between."""
+    out: list[Action] = [("move", "1")]
+    kinds, weights = zip(*_WEIGHTS.items())
+    while len(out) < n:
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "move":
+            out.append(("move", rng.choice("123b")))
+            if rng.random() < 0.8:
+                out.append(("greet", ""))
+        elif kind == "talk":
+            out.append(("talk", rng.choice("abcd")))
+        elif kind == "feedback":
+            out.append(("feedback", rng.choice(list(FEEDBACK))))
+        else:
+            out.append((kind, ""))
+    return out[:n]
+
+def run_session(profile: dict, actions: list[Action], pregenerate: bool = True) -> dict[str, list[float]]:
+    """Play `actions` on a fresh MazeGenerator; per-kind wall times in seconds."""
+    from maze.event_log import EventLog, EV_DIALOGUE, EV_FEEDBACK, EV_INSPECT, EV_ROOM
+    from maze.generator import MazeGenerator
+    times: dict[str, list[float]] = defaultdict(list)
+    t0 = time.perf_counter()
+    maze = MazeGenerator(profile, pregenerate=pregenerate)
+    times["construct"].append(time.perf_counter() - t0)
+    room, events = None, EventLog()
+    for kind, arg in actions:
+        if room is None and kind != "move":
+            kind, arg = "move", "1"   # every other action needs a room
+        t0 = time.perf_counter()
+        if kind == "move":
+            # a scripted turn into a wall takes the first open passage instead
+            room = maze.move(arg or "1") or maze.move(maze.open_moves()[0])
+            events.add(EV_ROOM, idx=events.counts[EV_ROOM] + 1, theme=room.theme, description=room.description)
+        elif kind == "greet":
+            reply, mem = maze.talk_with_context("greeting", room)
+            events.add(EV_DIALOGUE, question=None, reply=reply, memory=mem)
+        elif kind == "talk":
+            reply, mem = maze.talk_with_context(arg or "a", room)
+            events.add(EV_DIALOGUE, question=arg or "a", reply=reply, memory=mem)
+        elif kind == "inspect":
+            furniture = maze.get_room_furniture()
+            events.add(EV_INSPECT, furniture=furniture, comment=maze.inspect_furniture(furniture))
+        elif kind == "feedback":
+            label = FEEDBACK.get(arg, FEEDBACK["4"])
+            maze.record_feedback(label)
+            events.add(EV_FEEDBACK, label=label)
+        times[kind].append(time.perf_counter() - t0)
+    return times
+
+def _percentiles(samples: list[float]) -> dict:
+    ms = sorted(s * 1000 for s in samples)
+    pct = lambda p: round(ms[min(len(ms) - 1, int(len(ms) * p))], 3)
+    return {
+        "n":       len(ms),
+        "mean_ms": round(statistics.fmean(ms), 3),
+        "p50_ms":  pct(0.50),
+        "p90_ms":  pct(0.90),
+        "p99_ms":  pct(0.99),
+        "max_ms":  round(ms[-1], 3),
+    }
+
+def simulate(profile: dict, scripts: list[list[Action]], pregenerate: bool = True) -> dict:
+    METRICS.reset()
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(scripts)) as pool:
+        per_session = list(pool.map(lambda a: run_session(profile, a, pregenerate), scripts))
+    wall = time.perf_counter() - t0
+
+    merged: dict[str, list[float]] = defaultdict(list)
+    for times in per_session:
+        for kind, samples in times.items():
+            merged[kind].extend(samples)
+    rooms = len(merged.get("move", ()))
+    actions = sum(len(v) for k, v in merged.items() if k != "construct")
+    return {
+        "sessions":      len(scripts),
+        "wall_s":        round(wall, 3),
+        "rooms":         rooms,
+        "rooms_per_s":   round(rooms / wall, 2) if wall else 0.0,
+        "actions_per_s": round(actions / wall, 2) if wall else 0.0,
+        "latency":       {k: _percentiles(v) for k, v in sorted(merged.items())},
+        "llm":           METRICS.summary(),
+    }
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Headless Maze of Me sessions")
+    src = ap.add_mutually_exclusive_group()
+    src.add_argument("--profile", type=Path, help="profile JSON (default: synthetic --size)")
+    src.add_argument("--size", default="small", choices=list(SIZES))
+    ap.add_argument("--script", type=Path, help="action script; default is a random walk")
+    ap.add_argument("--actions", type=int, default=100, help="random-walk length per session")
+    ap.add_argument("--sessions", type=int, default=1)
+    ap.add_argument("--llm", choices=("stub", "real"), default="stub")
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="stub LLM latency per call")
+    ap.add_argument("--valid-rate", type=float, default=0.7, help="share of stub replies with a hook token")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--no-pregenerate", action="store_true", help="skip background NPC lines on move")
+    ap.add_argument("--out", type=Path, help="write JSON here instead of stdout")
+    args = ap.parse_args(argv)
+
+    profile: Optional[dict] = load_json(args.profile) if args.profile else synthetic_profile(SIZES[args.size], args.seed)
+    if not profile:
+        ap.error(f"could not read profile {args.profile}")
+    if args.script:
+        scripts = [parse_script(args.script.read_text(encoding="utf-8"))] * args.sessions
+    else:
+        scripts = [random_actions(args.actions, random.Random(args.seed + i)) for i in range(args.sessions)]
+
+    random.seed(args.seed)
+    if args.llm == "stub":
+        model_interface.set_backend(StubLLM(args.latency_ms, args.valid_rate, args.seed))
+    else:
+        model_interface.preload()
+    try:
+        results = simulate(profile, scripts, pregenerate=not args.no_pregenerate)
+    finally:
+        model_interface.set_backend(None)
+
+    report = {
+        "meta": {
+            "git": git_rev(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "params": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items() if k != "out"},
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.out:
+        args.out.write_text(text, encoding="utf-8")
+        print(f"[INFO] {results['rooms_per_s']} rooms/s over {results['sessions']} session(s) → {args.out}",
+              file=sys.stderr)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/stub_llm.py
+"""
+Deterministic stand-in for llama.cpp.
+
+Install with `model_interface.set_backend(StubLLM(...))`.  Replies are a
+pure function of (seed, prompt, call number), so two runs with the same
+settings make the same number of NPC retries.
+"""
+from __future__ import annotations
+import hashlib
+import random
+import re
+import time
+
+_HOOK_LINE_RE = re.compile(r"^<<(\w+)>> = ", re.M)
+
+_PHRASES = [
+    "The walls remember <<{k}>>, even when you pretend to forget.",
+    "Somewhere behind you, <<{k}>> is still waiting for an answer.",
+    "You carried <<{k}>> all the way here. Put it down?",
+    "Listen closely: <<{k}>> hums inside the plaster.",
+]
+
+class StubLLM:
+    """
+    latency_ms  – simulated wall time per call (sleeps in 5 ms slices so the
+                  scheduler can still interrupt it)
+    valid_rate  – share of replies that contain a usable hook token; the
+                  rest force validate_npc_line to fall back / retry
+    """
+
+    def __init__(self, latency_ms: float = 0.0, valid_rate: float = 0.7, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.valid_rate = valid_rate
+        self.seed = seed
+        self.calls = 0
+
+    def __call__(self, prompt: str, role: str, spec: dict, should_stop) -> str:
+        self.calls += 1
+        digest = hashlib.blake2b(f"{self.seed}:{self.calls}:{prompt}".encode(), digest_size=8).digest()
+        rng = random.Random(int.from_bytes(digest, "big"))
+        deadline = time.perf_counter() + self.latency_ms / 1000
+        while time.perf_counter() < deadline:
+            if should_stop():
+                return ""
+            time.sleep(min(0.005, max(0.0, deadline - time.perf_counter())))
+        if rng.random() >= self.valid_rate:
+            return "…"
+        keys = _HOOK_LINE_RE.findall(prompt) or ["name"]
+        return rng.choice(_PHRASES).format(k=rng.choice(keys))
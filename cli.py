@@ -1,32 +1,34 @@
 #cli.py
-import sys, time, random, threading, os, json
-from collections import deque, Counter
+import asyncio, sys, random, threading, os, json, shutil
+from collections import deque
 import colorama
 from colorama import Fore, Style
 
 from config           import Config
 from utils.platform_time import clear_screen
-from utils.json_io    import load_json, save_json
-from oauth.google     import GoogleCollector
-from oauth.spotify    import SpotifyCollector
-from audio.player     import AudioPlayer
-from maze.generator   import MazeGenerator
-import itertools
+from utils.session_journal import SessionJournal, legacy_event, profile_hash
+from utils.profile_store import ProfileStore
+from utils.profile_snapshot import load_profile, refresh_snapshot
+from utils.spinner import await_with_spinner
+from utils.profiling import OpProfiler
+# oauth.*, audio.player and maze.generator pull in heavy packages (googleapiclient,
+# requests_oauthlib, pygame…); they are imported where first needed so a returning
+# player never loads the OAuth stack.  tests/test_import_time.py keeps it that way.
+from maze.event_log   import EventLog, EV_ROOM, EV_DIALOGUE, EV_INSPECT, EV_FEEDBACK, EV_MINIGAME
+from maze.log_segments import SegmentStore
+from llm.metrics      import METRICS
+from llm              import model_interface
 
 colorama.init(autoreset=True)
 
-SESSION_SAVE_FILE = "mazeme_save.json"
+SESSION_SAVE_FILE = "mazeme_save.jsonl"   # append-only journal, see utils/session_journal.py
+LEGACY_SAVE_FILE  = "mazeme_save.json"    # full-state saves from older versions
+LOG_SEGMENTS_DIR  = "mazeme_log"            # older log events, see maze/log_segments.py
+LOG_VIEW          = 30                      # events shown by menu option 6 (per page)
+PASSAGES = {"1": "left", "2": "right", "3": "forward", "b": "back"}
+PROFILE_DIR       = "profiles"                # --profile without MAZE_PROFILE_DIR
 
-def show_spinner(stop_event):
-    spinner = itertools.cycle(['|', '/', '-', '\\'])
-    while not stop_event.is_set():
-        sys.stdout.write(Fore.YELLOW + "\rNPC is thinking... " + next(spinner) + Style.RESET_ALL)
-        sys.stdout.flush()
-        time.sleep(0.07)
-    sys.stdout.write('\r' + ' ' * 30 + '\r')
-    sys.stdout.flush()
-
-def animated_intro():
+async def animated_intro():
     art = [
         r"    __  __                  ____        __           ",
         r"   |  \/  | __ _  ___ ___  |  _ \  ___ / _| ___ _ __ ",
@@ -37,121 +39,220 @@ def animated_intro():
     ]
     for line in art:
         print(Fore.CYAN + line + Style.RESET_ALL)
-        time.sleep(0.06)
+        await asyncio.sleep(0.06)
     print()
     # Easter egg message
     if random.randint(1, 20) == 10:
         print(Fore.MAGENTA + "Easter Egg: The Maze remembers everything... or does it?" + Style.RESET_ALL)
         print()
 
-def typewriter(txt, color=Fore.GREEN, delay=.01):
-    for c in txt: sys.stdout.write(color + c); sys.stdout.flush(); time.sleep(delay)
+async def in_daemon(fn, *args):
+    """
+    fn(*args) on a daemon thread.  Unlike asyncio.to_thread, quitting never
+    waits for it (asyncio.run joins the default executor on the way out).
+    """
+    loop = asyncio.get_running_loop()
+    fut = loop.create_future()
+    def settle(setter, arg):
+        if not fut.done():
+            setter(arg)
+    def work():
+        try:
+            try:
+                res = fn(*args)
+            except BaseException as e:   # EOFError / KeyboardInterrupt from input()
+                loop.call_soon_threadsafe(settle, fut.set_exception, e)
+            else:
+                loop.call_soon_threadsafe(settle, fut.set_result, res)
+        except RuntimeError:
+            pass   # loop already closed: the game has exited
+    threading.Thread(target=work, daemon=True).start()
+    return await fut
+
+async def ainput(prompt=""):
+    """input() on a daemon thread, so tasks keep running while the player types."""
+    return await in_daemon(input, prompt)
+
+async def typewriter(txt, color=Fore.GREEN, delay=.01):
+    for c in txt: sys.stdout.write(color + c); sys.stdout.flush(); await asyncio.sleep(delay)
     print(Style.RESET_ALL, end="")
 
-def choose(prompt, options):
+async def choose(prompt, options):
     print(prompt)
     for key, text in options:
         print(f"  {key}) {text}")
     valid = {k for k, _ in options}
     while True:
-        ch = input(Fore.CYAN+"➤ "+Style.RESET_ALL).strip().lower()
+        ch = (await ainput(Fore.CYAN+"➤ "+Style.RESET_ALL)).strip().lower()
         if ch in valid:
             return ch
         print(Fore.RED+"❓ Invalid option. Please type one of: " + ", ".join(valid) + Style.RESET_ALL)
 
-def save_session(state):
-    with open(SESSION_SAVE_FILE, "w", encoding="utf-8") as f:
-        json.dump(state, f)
-
 def load_session():
-    if not os.path.exists(SESSION_SAVE_FILE):
-        return None
-    with open(SESSION_SAVE_FILE, "r", encoding="utf-8") as f:
-        return json.load(f)
+    """Replay the session journal (or an old full-state save) into resumable state."""
+    state = SessionJournal.replay(SESSION_SAVE_FILE)
+    if state is None and os.path.exists(LEGACY_SAVE_FILE):
+        with open(LEGACY_SAVE_FILE, "r", encoding="utf-8") as f:
+            state = json.load(f)
+        state["rooms"] = [{"idx": i, "theme": t, "description": d}
+                          for i, (d, t) in enumerate(zip(state.pop("visited"), state.pop("moods")), 1)]
+        state["events"] = ([{"kind": EV_ROOM, **r} for r in state["rooms"]]
+                           + [e for e in map(legacy_event, state.pop("log")) if e])
+    return state
 
 def delete_session():
-    if os.path.exists(SESSION_SAVE_FILE):
-        os.remove(SESSION_SAVE_FILE)
-
-def get_npc_response_bg(maze, dialogue_key, curr_room, log, result_holder, stop_event):
-    # Run LLM in background, store result in result_holder dict
-    npc_reply, npc_mem = maze.talk_with_context(dialogue_key, curr_room, log)
-    result_holder['npc_reply'] = npc_reply
-    result_holder['npc_mem'] = npc_mem
-    stop_event.set()
-
-def main():
+    for fp in (SESSION_SAVE_FILE, LEGACY_SAVE_FILE):
+        if os.path.exists(fp):
+            os.remove(fp)
+    shutil.rmtree(LOG_SEGMENTS_DIR, ignore_errors=True)
+
+def collect_profile():
+    """Run the missing collectors into one store and return the trimmed profile."""
+    from oauth.google  import GoogleCollector
+    from oauth.spotify import SpotifyCollector
+    store = ProfileStore(Config.PROFILE_PATH)
+    # flush even if a later collector fails, so a finished Google login isn't redone
+    try:
+        if not store.get("google"):
+            g = GoogleCollector()
+            g.authenticate()
+            g.fetch_and_save(store)
+            store.flush()
+
+        # ── Spotify (mandatory) ───────────────────────────────
+        if not store.get("spotify"):
+            s = SpotifyCollector()
+            s.authenticate()
+            s.fetch_and_save(store)
+    finally:
+        store.flush()   # no-op when nothing is dirty
+    return refresh_snapshot(Config.PROFILE_PATH, store.data)
+
+async def main():
+    # --profile / MAZE_PROFILE_DIR: cProfile + tracemalloc around moves, talks, inspections and audio
+    profiler = OpProfiler(Config.PROFILE_DIR or (PROFILE_DIR if "--profile" in sys.argv[1:] else None))
     clear_screen()
-    animated_intro()
+    await animated_intro()
 
     # Model file check (robust error)
     model_path = os.path.join("models", "Phi-3-mini-4k-instruct-q4.gguf")
     if not os.path.exists(model_path):
         print(Fore.RED + "\n❌ Model file not found: models/Phi-3-mini-4k-instruct-q4.gguf" + Style.RESET_ALL)
         print(Fore.YELLOW + "Please run 'download_model.bat' in the 'models' folder before starting the game.\n" + Style.RESET_ALL)
-        input("Press Enter to exit...")
+        await ainput("Press Enter to exit...")
         sys.exit(1)
+    model_interface.preload()
 
+    from audio.player import AudioPlayer
     player = AudioPlayer(); player.play_main_music("main_music", "mp3")
 
     # Session: ask to load/continue game
     save_data = load_session()
+    journal = None
     if save_data:
         print(Fore.YELLOW + "Previous session found. Would you like to continue? (y/n)" + Style.RESET_ALL)
-        if input(Fore.CYAN+"➤ "+Style.RESET_ALL).strip().lower().startswith("y"):
-            prof      = save_data["prof"]
+        if (await ainput(Fore.CYAN+"➤ "+Style.RESET_ALL)).strip().lower().startswith("y"):
+            if "prof" in save_data:
+                # legacy save: profile embedded, may differ from user_profile.json
+                prof, prof_path = save_data["prof"], None
+            else:
+                prof_path = save_data["profile_path"]
+                prof = load_profile(prof_path)
+                if prof and profile_hash(prof_path) != save_data["profile_hash"]:
+                    print(Fore.YELLOW + "Your profile changed since this session started; continuing with the current one." + Style.RESET_ALL)
+                journal = SessionJournal.resume(SESSION_SAVE_FILE)
             room_idx  = save_data["room_idx"]
-            log       = save_data["log"]
-            visited   = save_data["visited"]
-            moods     = save_data["moods"]
             npc_greeted = save_data["npc_greeted"]
         else:
             delete_session()
-            prof = load_json(Config.PROFILE_PATH)
-            room_idx, log, visited, moods, npc_greeted = 0, [], [], [], False
+            save_data = None
+            prof, prof_path = load_profile(Config.PROFILE_PATH), Config.PROFILE_PATH
+            room_idx, npc_greeted = 0, False
     else:
-        prof = load_json(Config.PROFILE_PATH)
-        room_idx, log, visited, moods, npc_greeted = 0, [], [], [], False
-
-    typewriter("🔑 Logging-in with Google…\n\n")
-    if not (prof and prof.get("google")):
-        g = GoogleCollector()
-        g.authenticate()
-        g.fetch_and_save()
-        prof = load_json(Config.PROFILE_PATH)
-
-    # ── Spotify (mandatory) ───────────────────────────────
-    if not prof.get("spotify"):
-        s = SpotifyCollector()
-        s.authenticate()
-        s.fetch_and_save()
-        prof = load_json(Config.PROFILE_PATH)
+        prof, prof_path = load_profile(Config.PROFILE_PATH), Config.PROFILE_PATH
+        room_idx, npc_greeted = 0, False
+
+    await typewriter("🔑 Logging-in with Google…\n\n")
+    if not (prof and prof.get("google") and prof.get("spotify")):
+        # OAuth flows block on the browser; keep them off the event loop
+        prof, prof_path = await asyncio.to_thread(collect_profile), Config.PROFILE_PATH
+
+    from maze.generator import MazeGenerator
+    maze = MazeGenerator(prof, prof_path, seed=save_data.get("maze_seed") if save_data else None,
+                         room_parts=save_data.get("room_parts") if save_data else None)
+    # rooms are journaled as seeds: rebuild where the player stood and the rooms the log still shows
+    curr_room = maze.restore(save_data["rooms"]) if save_data else None
+    spill = SegmentStore(LOG_SEGMENTS_DIR)
+    if journal is None:
+        spill.clear()   # new journal: event numbers start over
+    events = EventLog.from_records(save_data["events"] if save_data else (), describe=maze.describe,
+                                   spill=spill)
+
+    if journal is None:
+        journal = SessionJournal.start(SESSION_SAVE_FILE, Config.PROFILE_PATH, maze.seed, maze.room_parts)
+        if save_data:
+            # carry a legacy full-state save over into the journal
+            for r in save_data["rooms"]:
+                journal.append("room", **r)
+            for rec in save_data["events"]:
+                if rec["kind"] != EV_ROOM:
+                    journal.append("event", **rec)
+            if npc_greeted:
+                journal.append("greeted")
+            os.remove(LEGACY_SAVE_FILE)
+    # the replayed history now lives in the maze, the bounded event log and its
+    # spill segments; don't keep every journaled event alive for the whole session
+    del save_data
+
+    def record(kind, **data):
+        ev = events.add(kind, **data)
+        if kind != EV_ROOM:   # rooms are journaled as "room" records
+            journal.append("event", **ev.to_record())
 
     tracks = prof["spotify"]["top_tracks"] if prof.get("spotify") else []
     feats = prof["spotify"].get("audio_features", {}) if prof.get("spotify") else {}
-    maze    = MazeGenerator(prof)
     q, buf, done = deque(), {}, set()
     track_n = len(tracks)
 
+    bg_tasks = set()
+    def background(aw):
+        # keep a reference so the task isn't collected mid-flight
+        task = asyncio.ensure_future(aw)
+        bg_tasks.add(task)
+        task.add_done_callback(bg_tasks.discard)
+
+    def preload(idx):
+        # audio runs on daemon threads so quitting doesn't wait for a download
+        background(in_daemon(profiler.wrap("audio.preload", player.preload_track),
+                             idx, tracks, buf, q, done, feats))
+
+    music_room = 0
+    async def room_music(emotion, room_no):
+        # Runs as a task: the menu is already back while the track downloads.
+        idx = player.pick_track_by_emotion(emotion, tracks, feats)
+        player.delete_last_cache()
+        done.add(idx)
+        tr  = tracks[idx]
+        wav = buf.pop(idx, None)
+        if not (wav and wav.exists()):
+            wav = await in_daemon(profiler.wrap("audio.fetch", player.fetch_wav), tr["artists"][0], tr["name"])
+        if wav and room_no == music_room:   # player may have moved on meanwhile
+            profiler.call("audio.play", player.play_file, wav)
+        # Preload next track in background for next room
+        avail = [i for i in range(track_n) if i not in done and i not in buf and i not in q]
+        if not avail: done.clear(); avail=list(range(track_n))
+        preload(random.choice(avail))
+
     # Start
     if track_n:
-        first = random.randrange(track_n)
-        threading.Thread(target=player.preload_track,
-                         args=(first,tracks,buf,q,done,feats),daemon=True).start()
+        preload(random.randrange(track_n))
 
-    typewriter("🔍 Entering the Maze…\n\n", Fore.CYAN)
-    curr_room = None
-
-    # Restore session vars if continuing
-    if save_data:
-        maze.set_progress(visited, moods)
-        npc_greeted = npc_greeted
-    else:
-        npc_greeted = False
+    await typewriter("🔍 Entering the Maze…\n\n", Fore.CYAN)
+    if curr_room is not None:
+        print(Fore.CYAN + f"Room #{room_idx} " + Style.BRIGHT + curr_room.theme + Style.RESET_ALL + " " + curr_room.description)
 
     # Main loop vars
     last_feedback = None
-    room_count = len(visited)
     DIALOGUE_OPTIONS = [
         ("a", "Who are you?"),
         ("b", "Explain this room."),
@@ -172,6 +273,7 @@ def main():
 ║ 1) Go Left        – move left                ║
 ║ 2) Go Right       – move right               ║
 ║ 3) Go Forward     – move ahead               ║
+║ b) Go Back        – retrace your last step   ║
 ║ 4) Talk to figure – interact                 ║
 ║ 5) Inspect room/furniture                    ║
 ║ 6) View interaction log                      ║
@@ -186,50 +288,64 @@ def main():
     # In-game mini-game trigger
     MINI_GAME_ROOMS = {"special", "exam", "puzzle"}
 
-    def show_loading_spinner(msg="Loading..."):
-        stop_event = threading.Event()
-        def spinner():
-            sp = itertools.cycle(['|', '/', '-', '\\'])
-            while not stop_event.is_set():
-                sys.stdout.write(Fore.YELLOW + f"\r{msg} " + next(sp) + Style.RESET_ALL)
-                sys.stdout.flush()
-                time.sleep(0.07)
-            sys.stdout.write('\r' + ' ' * 40 + '\r')
-            sys.stdout.flush()
-        t = threading.Thread(target=spinner)
-        t.start()
-        return stop_event
+    async def spin(op, fn, *args, msg="Loading..."):
+        # LLM calls block; run them on a thread while the loop keeps the spinner/music going
+        return await await_with_spinner(asyncio.to_thread(profiler.wrap(op, fn), *args), msg,
+                                        color=Fore.YELLOW, reset=Style.RESET_ALL)
 
     while True:
         print(MENU)
-        ch = input(Fore.CYAN+"➤ "+Style.RESET_ALL).strip().lower()
+        ch = (await ainput(Fore.CYAN+"➤ "+Style.RESET_ALL)).strip().lower()
         if ch in ("h","?"):
             print(MENU)
             continue
         if ch == "0":
             print(Fore.GREEN+"👋 Goodbye."+Style.RESET_ALL)
             print(Fore.YELLOW + "Want to send feedback or feature requests? Open an issue at https://github.com/bakill3/maze-of-me/issues" + Style.RESET_ALL)
+            journal.delete()
             delete_session()
+            if Config.METRICS_PATH:
+                METRICS.export_jsonl(Config.METRICS_PATH)
             break
 
         if ch == "7":  # Save & exit
-            state = {
-                "prof": prof,
-                "room_idx": room_idx,
-                "log": log,
-                "visited": visited,
-                "moods": moods,
-                "npc_greeted": npc_greeted
-            }
-            save_session(state)
+            # every event is already journaled; just close the file
+            journal.close()
+            events.flush()
+            if Config.METRICS_PATH:
+                METRICS.export_jsonl(Config.METRICS_PATH)
             print(Fore.YELLOW + "Session saved. See you next time!" + Style.RESET_ALL)
             break
 
+        if ch == "6":
+            shown = events.recent(LOG_VIEW)
+            if not shown:
+                print(Fore.CYAN + "Nothing has happened yet." + Style.RESET_ALL)
+                continue
+            if len(events) > len(shown):
+                print(Fore.YELLOW + f"\n(last {len(shown)} of {len(events)} events)" + Style.RESET_ALL)
+            print()
+            for ev in shown:
+                print((Fore.CYAN if ev.kind == EV_ROOM else Fore.WHITE) + ev.text + Style.RESET_ALL)
+            # page back through older events (spilled to disk once they leave memory)
+            while shown[0].seq > 0:
+                more = (await ainput(Fore.CYAN + "m) older events, Enter) back ➤ " + Style.RESET_ALL)).strip().lower()
+                if more != "m":
+                    break
+                shown = events.before(shown[0].seq, LOG_VIEW)
+                if not shown:
+                    print(Fore.YELLOW + "(nothing older was kept)" + Style.RESET_ALL)
+                    break
+                print(Fore.YELLOW + f"\n── events #{shown[0].seq + 1}–#{shown[-1].seq + 1} ──" + Style.RESET_ALL)
+                for ev in shown:
+                    print((Fore.CYAN if ev.kind == EV_ROOM else Fore.WHITE) + ev.text + Style.RESET_ALL)
+            continue
+
         if ch == "8":
             # Show stats/progress
-            total = len(visited)
+            total = events.counts[EV_ROOM]
             if total:
-                c = Counter(moods)
+                c = events.moods
                 most = c.most_common(1)[0][0]
                 print(Fore.CYAN + f"\nYou visited {total} rooms. Most common mood: {most}" + Style.RESET_ALL)
                 print(Fore.YELLOW + "Mood breakdown: " + ", ".join(f"{m}:{n}" for m, n in c.items()) + Style.RESET_ALL)
@@ -248,133 +364,88 @@ def main():
                     print(Fore.YELLOW + "Contact mentions: " + ", ".join(f"{k}:{v}" for k,v in npc_stats['contact_mentions'].items()) + Style.RESET_ALL)
             else:
                 print(Fore.CYAN + "No progress yet! Enter a room to begin." + Style.RESET_ALL)
+            # --- Inference metrics ---
+            m = METRICS.summary()
+            if m['inferences']:
+                print(Fore.BLUE + f"\nLLM calls: {m['inferences']} · avg prompt {m['avg_prompt_tokens']} tok "
+                      f"({m['avg_prompt_eval_ms']} ms) · avg reply {m['avg_gen_tokens']} tok "
+                      f"({m['avg_gen_ms']} ms, {m['gen_tokens_per_s']} tok/s)" + Style.RESET_ALL)
+                print(Fore.BLUE + f"NPC lines: {m['npc_lines']} · avg attempts {m['avg_npc_attempts']} · "
+                      f"retries exhausted {m['npc_exhausted']} · fallback rate {m['fallback_rate']:.0%} · "
+                      f"cancelled {m['npc_cancelled']}" + Style.RESET_ALL)
+                if m['cache_hit_rates']:
+                    print(Fore.BLUE + "Cache hit rates: " + ", ".join(f"{k}:{v:.0%}" for k, v in m['cache_hit_rates'].items()) + Style.RESET_ALL)
             continue
 
-        if ch in ("1","2","3"):
-            stop_event = show_loading_spinner("Moving to next room...")
+        if ch in ("1","2","3","b"):
+            room = profiler.call("move", maze.move, ch)   # template-only, returns immediately
+            if room is None:
+                print(Fore.RED + ("There is nowhere to go back to." if ch == "b" else "A wall blocks that way.") + Style.RESET_ALL)
+                continue
             room_idx += 1
-            curr_room = maze.move(ch)
-            stop_event.set()
+            curr_room = room
             npc_greeted = False
-            visited.append(curr_room.description)
-            moods.append(curr_room.theme)
-            log.append(f"Room #{room_idx}: {curr_room.theme} – {curr_room.description}")
+            x, y = maze.position
+            journal.append("room", idx=room_idx, theme=curr_room.theme, x=x, y=y, seed=curr_room.seed)
+            record(EV_ROOM, idx=room_idx, theme=curr_room.theme, x=x, y=y, seed=curr_room.seed,
+                   description=curr_room.description)
+            # music downloads while the description types out and the menu waits
+            if track_n:
+                music_room = room_idx
+                background(room_music(curr_room.theme, room_idx))
             print(Fore.CYAN + f"\nRoom #{room_idx}\n" + Style.BRIGHT, end="")
             print(curr_room.theme, end=" ")
-            typewriter(curr_room.description+"\n\n", Fore.WHITE)
+            await typewriter(curr_room.description+"\n\n", Fore.WHITE)
+            print(Fore.YELLOW + "Passages: " + ", ".join(PASSAGES[k] for k in maze.open_moves()) + Style.RESET_ALL)
 
             # Mini-game in "special" rooms (randomly, or by keyword)
             if any(key in curr_room.theme.lower() or key in curr_room.description.lower() for key in MINI_GAME_ROOMS):
                 print(Fore.GREEN + "\nMini-game: Solve this riddle or type 'skip' to continue." + Style.RESET_ALL)
                 print("What walks on four legs in the morning, two legs at noon, and three legs in the evening?")
-                stop_event = show_loading_spinner("Waiting for your answer...")
-                ans = input(Fore.CYAN+"➤ "+Style.RESET_ALL).strip().lower()
-                stop_event.set()
+                ans = (await ainput(Fore.CYAN+"➤ "+Style.RESET_ALL)).strip().lower()
                 if "man" in ans or "human" in ans:
                     print(Fore.GREEN + "Correct! The Sphinx would be proud." + Style.RESET_ALL)
-                    log.append("Mini-game: solved Sphinx riddle")
+                    record(EV_MINIGAME, game="Sphinx riddle", result="solved")
                 elif ans == "skip":
                     print(Fore.YELLOW + "Skipped the riddle. The maze grows more mysterious..." + Style.RESET_ALL)
-                    log.append("Mini-game: skipped Sphinx riddle")
+                    record(EV_MINIGAME, game="Sphinx riddle", result="skipped")
                 else:
                     print(Fore.RED + "Not quite right, but the maze lets you pass..." + Style.RESET_ALL)
-                    log.append(f"Mini-game: incorrect answer '{ans}'")
+                    record(EV_MINIGAME, game="Sphinx riddle", result="incorrect", answer=ans)
 
-            # --- Improved music loading ---
-            if track_n:
-                emotion = curr_room.theme
-                stop_event = show_loading_spinner("Loading music...")
-                idx = player.pick_track_by_emotion(emotion, tracks, feats)
-                player.delete_last_cache()
-                done.add(idx)
-                tr  = tracks[idx]
-                wav = buf.pop(idx, None)
-                if wav and wav.exists():
-                    player.play_file(wav)
-                else:
-                    # Start download in background, play a fallback if needed
-                    bg_event = threading.Event()
-                    def bg_download():
-                        player.play_full_from_youtube(tr["artists"][0], tr["name"])
-                        bg_event.set()
-                    t = threading.Thread(target=bg_download)
-                    t.start()
-                    # Optionally play a short sound or message while waiting
-                    t.join(timeout=2.5)  # Wait up to 2.5s, then continue
-                stop_event.set()
-                # Preload next track in background for next room
-                avail = [i for i in range(track_n) if i not in done and i not in buf and i not in q]
-                if not avail: done.clear(); avail=list(range(track_n))
-                nxt = random.choice(avail)
-                threading.Thread(target=player.preload_track,
-                                 args=(nxt,tracks,buf,q,done,feats),daemon=True).start()
             continue
         if ch == "4":
             if not curr_room:
                 print(Fore.RED + "You haven't entered a room yet." + Style.RESET_ALL)
                 continue
             if not npc_greeted:
-                stop_event = show_loading_spinner("NPC is thinking...")
-                result_holder = {}
-                bg_event = threading.Event()
-                t = threading.Thread(target=get_npc_response_bg, args=(maze, "greeting", curr_room, log, result_holder, bg_event))
-                t.start()
-                while not bg_event.is_set():
-                    time.sleep(0.05)
-                stop_event.set()
-                npc_reply = result_holder.get('npc_reply', '')
-                npc_mem = result_holder.get('npc_mem', '')
+                npc_reply, npc_mem = await spin("talk", maze.talk_with_context, "greeting", curr_room, msg="NPC is thinking...")
                 print(Fore.MAGENTA + "NPC: " + Style.BRIGHT + npc_reply + Style.RESET_ALL)
-                log.append(f"[NPC] (greeting): {npc_reply}")
+                record(EV_DIALOGUE, question=None, reply=npc_reply, memory=npc_mem)
                 npc_greeted = True
+                journal.append("greeted")
                 print(Fore.YELLOW + "\nHow will you address the figure?\n" + Style.RESET_ALL)
-                d_opt = choose("Choose:", DIALOGUE_OPTIONS)
+                d_opt = await choose("Choose:", DIALOGUE_OPTIONS)
             else:
                 print(Fore.YELLOW + "\nHow will you address the figure?\n" + Style.RESET_ALL)
-                d_opt = choose("Choose:", DIALOGUE_OPTIONS)
-                stop_event = show_loading_spinner("NPC is thinking...")
-                result_holder = {}
-                bg_event = threading.Event()
-                t = threading.Thread(target=get_npc_response_bg, args=(maze, d_opt, curr_room, log, result_holder, bg_event))
-                t.start()
-                while not bg_event.is_set():
-                    time.sleep(0.05)
-                stop_event.set()
-                npc_reply = result_holder.get('npc_reply', '')
-                npc_mem = result_holder.get('npc_mem', '')
+                d_opt = await choose("Choose:", DIALOGUE_OPTIONS)
+                npc_reply, npc_mem = await spin("talk", maze.talk_with_context, d_opt, curr_room, msg="NPC is thinking...")
                 print(Fore.MAGENTA + "NPC: " + Style.BRIGHT + npc_reply + Style.RESET_ALL)
-                log.append(f"[Player] asked: '{dict(DIALOGUE_OPTIONS)[d_opt]}' – [NPC] replied: {npc_reply}")
-                if npc_mem:
-                    log.append(f"  (NPC remembered: {npc_mem})")
+                record(EV_DIALOGUE, question=dict(DIALOGUE_OPTIONS)[d_opt], reply=npc_reply, memory=npc_mem)
                 print(Fore.YELLOW + "\nHow do you feel about this exchange?\n" + Style.RESET_ALL)
-                stop_event = show_loading_spinner("Recording your reaction...")
-                fb = choose("React:", FEEDBACK_OPTIONS)
-                stop_event.set()
+                fb = await choose("React:", FEEDBACK_OPTIONS)
                 last_feedback = dict(FEEDBACK_OPTIONS)[fb]
-                log.append(f"Player emotional feedback: {last_feedback}")
+                record(EV_FEEDBACK, label=last_feedback)
                 maze.record_feedback(last_feedback)
                 continue
             dialogue_label = dict(DIALOGUE_OPTIONS)[d_opt]
-            stop_event = show_loading_spinner("NPC is thinking...")
-            result_holder = {}
-            bg_event = threading.Event()
-            t = threading.Thread(target=get_npc_response_bg, args=(maze, d_opt, curr_room, log, result_holder, bg_event))
-            t.start()
-            while not bg_event.is_set():
-                time.sleep(0.05)
-            stop_event.set()
-            npc_reply = result_holder.get('npc_reply', '')
-            npc_mem = result_holder.get('npc_mem', '')
+            npc_reply, npc_mem = await spin("talk", maze.talk_with_context, d_opt, curr_room, msg="NPC is thinking...")
             print(Fore.MAGENTA + "NPC: " + Style.BRIGHT + npc_reply + Style.RESET_ALL)
-            log.append(f"[Player] asked: '{dialogue_label}' – [NPC] replied: {npc_reply}")
-            if npc_mem:
-                log.append(f"  (NPC remembered: {npc_mem})")
+            record(EV_DIALOGUE, question=dialogue_label, reply=npc_reply, memory=npc_mem)
             print(Fore.YELLOW + "\nHow do you feel about this exchange?\n" + Style.RESET_ALL)
-            stop_event = show_loading_spinner("Recording your reaction...")
-            fb = choose("React:", FEEDBACK_OPTIONS)
-            stop_event.set()
+            fb = await choose("React:", FEEDBACK_OPTIONS)
             last_feedback = dict(FEEDBACK_OPTIONS)[fb]
-            log.append(f"Player emotional feedback: {last_feedback}")
+            record(EV_FEEDBACK, label=last_feedback)
             maze.record_feedback(last_feedback)
             continue
 
@@ -384,17 +455,15 @@ def main():
                 continue
             furniture = maze.get_room_furniture()
             print(Fore.YELLOW + f"\nInspecting: {furniture}\n" + Style.RESET_ALL)
-            stop_event = show_loading_spinner("Inspecting item...")
-            npc_comment = maze.inspect_furniture(furniture)
-            stop_event.set()
+            npc_comment = await spin("inspect", maze.inspect_furniture, furniture, msg="Inspecting item...")
             print(Fore.MAGENTA + "NPC: " + Style.BRIGHT + npc_comment + Style.RESET_ALL)
-            log.append(f"Inspected furniture: {furniture} – [NPC] commented: {npc_comment}")
+            record(EV_INSPECT, furniture=furniture, comment=npc_comment)
             # Show items in the room
             items = maze.get_room_items()
             if items:
                 print(Fore.YELLOW + f"\nYou see items here: {', '.join(items)}" + Style.RESET_ALL)
                 print(Fore.YELLOW + "Type the name of an item to collect it, or press Enter to skip." + Style.RESET_ALL)
-                item_choice = input(Fore.CYAN+"➤ "+Style.RESET_ALL).strip()
+                item_choice = (await ainput(Fore.CYAN+"➤ "+Style.RESET_ALL)).strip()
                 if item_choice and item_choice in items:
                     if maze.collect_item(item_choice):
                         print(Fore.GREEN + f"Collected: {item_choice}" + Style.RESET_ALL)
@@ -414,5 +483,7 @@ def main():
 
         print(Fore.RED+"❓ Unknown command."+Style.RESET_ALL)
 
+    profiler.close()
+
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
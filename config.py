@@ -8,6 +8,16 @@ class Config:
     ROOT              = Path(__file__).parent
     PROFILE_PATH      = ROOT / "user_profile.json"
     MODELS_DIR        = ROOT / "models"
+    SMALL_MODEL_NAME  = os.getenv("MAZE_SMALL_MODEL", "")   # optional GGUF for inspect/background roles
+    METRICS_PATH      = os.getenv("MAZE_METRICS_FILE", "")  # JSON lines export of inference metrics
+    PROMPT_TOKEN_BUDGET = int(os.getenv("MAZE_PROMPT_TOKENS", "600"))  # NPC prompt size cap (n_ctx is 1024)
+    CONTENT_PACK      = Path(os.getenv("MAZE_CONTENT_PACK", ROOT / "maze" / "packs" / "base.jsonl"))  # room templates
+    PROFILE_DIR       = os.getenv("MAZE_PROFILE_DIR", "")   # per-operation profiles (also: --profile)
+
+    # game server (python -m server)
+    SESSIONS_DIR      = Path(os.getenv("MAZE_SESSIONS_DIR", ROOT / "sessions"))
+    SESSION_IDLE_S    = float(os.getenv("MAZE_SESSION_IDLE_S", "600"))   # evict to disk after this
+    MAX_LIVE_SESSIONS = int(os.getenv("MAZE_MAX_SESSIONS", "32"))        # in memory at once
 
     SPOTIFY_CLIENT_ID     = os.getenv("SPOTIFY_CLIENT_ID", "")
     SPOTIFY_CLIENT_SECRET = os.getenv("SPOTIFY_CLIENT_SECRET", "")
@@ -0,0 +1,120 @@
+"""
+Inference metrics: token counts, latency, retries, fallbacks, cache hits.
+
+A single process-wide METRICS object collects counters and a bounded ring
+of recent records.  When Config.METRICS_PATH is set every record is also
+appended to that file as one JSON line, so a crashed session still leaves
+its numbers behind.
+"""
+
+from __future__ import annotations
+import json
+import threading
+import time
+from collections import Counter, deque
+from pathlib import Path
+from typing import Optional
+
+from config import Config
+
+RECENT_RECORDS = 500
+
+class InferenceMetrics:
+    def __init__(self, sink: Optional[Path] = None, keep: int = RECENT_RECORDS):
+        self._lock = threading.Lock()
+        self._records: deque = deque(maxlen=keep)
+        self.counters: Counter = Counter()
+        self.sink = Path(sink) if sink else None
+
+    # ------------------------------------------------------------------  record
+    def record_inference(self, role: str, prompt_tokens: int, gen_tokens: int,
+                         prompt_eval_s: float, gen_s: float, interrupted: bool = False) -> None:
+        with self._lock:
+            c = self.counters
+            c["inferences"] += 1
+            c["prompt_tokens"] += prompt_tokens
+            c["gen_tokens"] += gen_tokens
+            c["prompt_eval_ms"] += int(prompt_eval_s * 1000)
+            c["gen_ms"] += int(gen_s * 1000)
+            if interrupted:
+                c["interrupted"] += 1
+        self._emit({
+            "type": "inference", "role": role,
+            "prompt_tokens": prompt_tokens, "gen_tokens": gen_tokens,
+            "prompt_eval_ms": round(prompt_eval_s * 1000, 1),
+            "gen_ms": round(gen_s * 1000, 1), "interrupted": interrupted,
+        })
+
+    def record_npc(self, role: str, attempts: int, outcome: str, total_s: float) -> None:
+        """One _gen_npc call. outcome: 'ok', 'exhausted' or 'cancelled'."""
+        with self._lock:
+            self.counters["npc_lines"] += 1
+            self.counters["npc_attempts"] += attempts
+            self.counters[f"npc_{outcome}"] += 1
+        self._emit({
+            "type": "npc", "role": role, "attempts": attempts,
+            "outcome": outcome, "total_ms": round(total_s * 1000, 1),
+        })
+
+    def incr(self, name: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[name] += n
+
+    def record_cache(self, name: str, hit: bool) -> None:
+        self.incr(f"cache_{name}_{'hits' if hit else 'misses'}")
+
+    # ------------------------------------------------------------------  report
+    def summary(self) -> dict:
+        with self._lock:
+            c = Counter(self.counters)
+        n = c["inferences"]
+        caches = {}
+        for key in c:
+            if key.startswith("cache_") and key.endswith("_hits"):
+                name = key[len("cache_"):-len("_hits")]
+                hits, misses = c[key], c[f"cache_{name}_misses"]
+                caches[name] = round(hits / (hits + misses), 3) if hits + misses else 0.0
+        return {
+            "inferences":         n,
+            "avg_prompt_tokens":  round(c["prompt_tokens"] / n, 1) if n else 0.0,
+            "avg_gen_tokens":     round(c["gen_tokens"] / n, 1) if n else 0.0,
+            "avg_prompt_eval_ms": round(c["prompt_eval_ms"] / n, 1) if n else 0.0,
+            "avg_gen_ms":         round(c["gen_ms"] / n, 1) if n else 0.0,
+            "gen_tokens_per_s":   round(c["gen_tokens"] / (c["gen_ms"] / 1000), 1) if c["gen_ms"] else 0.0,
+            "interrupted":        c["interrupted"],   # cancelled or preempted mid-stream
+            "npc_cancelled":      c["npc_cancelled"],
+            "npc_lines":          c["npc_lines"],
+            "avg_npc_attempts":   round(c["npc_attempts"] / c["npc_lines"], 2) if c["npc_lines"] else 0.0,
+            "npc_exhausted":      c["npc_exhausted"],
+            "fallback_rate":      round(c["validate_fallbacks"] / c["validations"], 3) if c["validations"] else 0.0,
+            "cache_hit_rates":    caches,
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self.counters.clear()
+            self._records.clear()
+
+    def recent(self) -> list[dict]:
+        with self._lock:
+            return list(self._records)
+
+    def export_jsonl(self, path: str | Path) -> None:
+        """Append the current summary as one JSON line (records are already streamed)."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps({"type": "summary", "ts": time.time(), **self.summary()}) + "\n")
+
+    def _emit(self, rec: dict) -> None:
+        rec["ts"] = time.time()
+        with self._lock:
+            self._records.append(rec)
+            if self.sink is None:
+                return
+            try:
+                with open(self.sink, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(rec) + "\n")
+            except OSError as e:
+                print(f"[WARN] Metrics export disabled: {e}")
+                self.sink = None
+
+METRICS = InferenceMetrics(Config.METRICS_PATH)
@@ -1,51 +1,212 @@
 """
 Phi-3 Mini LLaMA wrapper – only NPC speech.
+
+Calls are routed by *role* (interactive dialogue, furniture inspection,
+background pre-generation).  Each role names a GGUF file plus its own
+sampling settings; roles that point at the same file share one Llama
+instance, so a tiny model can take the bulk work off the main one.
+Every Llama instance is driven by its own InferenceScheduler, so callers
+on different threads never touch a context concurrently.
+
+Models load on first use (or via preload()).  set_backend() swaps
+llama.cpp for any callable, which is how benchmarks run without a GGUF.
 """
 
 from __future__ import annotations
 import os
-import json
+import threading
+import time
 from pathlib import Path
-from llama_cpp import Llama
+from typing import Callable, Optional
 from config import Config
+from utils.profile_snapshot import load_profile
+from llm.metrics import METRICS
+from llm.tokens import set_tokenizer
+from llm.scheduler import (
+    InferenceScheduler, InferenceCancelled, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND,
+)
 
 MODEL_NAME = "Phi-3-mini-4k-instruct-q4.gguf"
 MODEL_PATH = Config.MODELS_DIR / MODEL_NAME
 
-print(f"\n[INFO] Loading model from: {MODEL_PATH}")
-print(f"[INFO] Model file exists: {MODEL_PATH.exists()}")
+ROLE_DIALOGUE   = "dialogue"     # greeting + replies the player is waiting on
+ROLE_INSPECT    = "inspect"      # furniture comments
+ROLE_BACKGROUND = "background"   # next-room pre-generation
+
+# Optional small model for inspections / pre-generation (e.g. a 0.5B GGUF).
+SMALL_MODEL_NAME = Config.SMALL_MODEL_NAME or MODEL_NAME
+
+# role -> model file + per-role sampling
+ROLES: dict[str, dict] = {
+    ROLE_DIALOGUE:   {"model": MODEL_NAME,       "max_tokens": 40, "temperature": 0.8, "priority": PRIORITY_INTERACTIVE},
+    ROLE_INSPECT:    {"model": SMALL_MODEL_NAME, "max_tokens": 40, "temperature": 0.7, "priority": PRIORITY_INTERACTIVE},
+    ROLE_BACKGROUND: {"model": SMALL_MODEL_NAME, "max_tokens": 40, "temperature": 0.8, "priority": PRIORITY_BACKGROUND},
+}
 
-if not MODEL_PATH.exists():
-    raise FileNotFoundError(
-        f"\n[ERROR] Model not found: {MODEL_PATH}\n"
-        f"Please run 'download.bat' in the 'models' folder before starting the game.\n"
+# Backend signature: (prompt, role, spec, should_stop) -> text
+Backend = Callable[[str, str, dict, Callable[[], bool]], str]
+
+_MODELS: dict[str, "Llama"] = {}
+_MODELS_LOCK = threading.Lock()
+# one scheduler (= one worker thread) per Llama instance or backend
+_SCHEDULERS: dict[int, InferenceScheduler] = {}
+_BACKEND: Optional[Backend] = None
+
+def _load(model_path: Path) -> "Llama":
+    from llama_cpp import Llama
+    # Use a safe, low context window and thread count for Windows stability
+    llm = Llama(
+        model_path=str(model_path),
+        n_ctx=1024,  # Lower context window for less RAM usage
+        n_threads=3, # Slightly higher for more speed if stable
+        verbose=False,
     )
+    _SCHEDULERS[id(llm)] = InferenceScheduler(model_path.name)
+    return llm
 
-# Use a safe, low context window and thread count for Windows stability
-_llm = Llama(
-    model_path=str(MODEL_PATH),
-    n_ctx=1024,  # Lower context window for less RAM usage
-    n_threads=3, # Slightly higher for more speed if stable
-    verbose=False,
-)
+def _main_model() -> "Llama":
+    # caller holds _MODELS_LOCK
+    llm = _MODELS.get(MODEL_NAME)
+    if llm is not None:
+        return llm
+    print(f"\n[INFO] Loading model from: {MODEL_PATH}")
+    print(f"[INFO] Model file exists: {MODEL_PATH.exists()}")
+    if not MODEL_PATH.exists():
+        raise FileNotFoundError(
+            f"\n[ERROR] Model not found: {MODEL_PATH}\n"
+            f"Please run 'download.bat' in the 'models' folder before starting the game.\n"
+        )
+    llm = _MODELS[MODEL_NAME] = _load(MODEL_PATH)
+    # prompt budgets are measured in the dialogue model's tokens
+    set_tokenizer(lambda text: len(llm.tokenize(text.encode("utf-8"), add_bos=False)))
+    return llm
+
+def preload() -> None:
+    """Load the main model now instead of on the first NPC line."""
+    if _BACKEND is None:
+        with _MODELS_LOCK:
+            _main_model()
+
+def set_backend(backend: Optional[Backend]) -> None:
+    """Route every role through `backend` instead of llama.cpp (None restores it)."""
+    global _BACKEND
+    old, _BACKEND = _BACKEND, backend
+    if old is not None and old is not backend:
+        sched = _SCHEDULERS.pop(id(old), None)
+        if sched is not None:
+            sched.close()
+    if backend is not None and id(backend) not in _SCHEDULERS:
+        _SCHEDULERS[id(backend)] = InferenceScheduler("backend")
+
+def register_role(role: str, model: str | None = None, **sampling) -> None:
+    """Add or retune a role. `model` is a file name inside Config.MODELS_DIR."""
+    spec = dict(ROLES.get(role, ROLES[ROLE_DIALOGUE]))
+    if model:
+        spec["model"] = model
+    spec.update(sampling)
+    ROLES[role] = spec
+
+def _model_for(role: str) -> "Llama":
+    name = ROLES.get(role, ROLES[ROLE_DIALOGUE])["model"]
+    with _MODELS_LOCK:
+        llm = _MODELS.get(name)
+        if llm is not None:
+            return llm
+        if name == MODEL_NAME:
+            return _main_model()
+        path = Config.MODELS_DIR / name
+        if not path.exists():
+            print(f"[WARN] Model for role '{role}' not found ({path}); using {MODEL_NAME}.")
+            llm = _main_model()
+        else:
+            print(f"[INFO] Loading '{role}' model from: {path}")
+            llm = _load(path)
+        _MODELS[name] = llm
+        return llm
 
 # Read given name for prompt stopping
 try:
-    GIVEN = json.loads(Config.PROFILE_PATH.read_text("utf-8")).get("full_name", "").split()[0]
+    GIVEN = (load_profile(Config.PROFILE_PATH) or {}).get("full_name", "").split()[0]
 except Exception:
     GIVEN = ""
 
 STOP = ["\n", "Assistant:", f"{GIVEN}:", "<END>"]
 
-def _run(prompt: str, max_tokens: int, temperature: float) -> str:
+def _generate(llm: "Llama", prompt: str, role: str, spec: dict, should_stop) -> str:
+    # Streamed so the scheduler can interrupt between tokens; the first
+    # chunk marks the end of prompt evaluation.
+    parts = []
+    stopped = False
+    t0 = time.perf_counter()
+    t_first = None
+    for chunk in llm(
+        prompt=prompt,
+        max_tokens=spec["max_tokens"],
+        temperature=spec["temperature"],
+        stop=STOP,
+        stream=True,
+    ):
+        if t_first is None:
+            t_first = time.perf_counter()
+        parts.append(chunk["choices"][0]["text"])
+        if should_stop():
+            stopped = True
+            break
+    t_end = time.perf_counter()
+    t_first = t_first or t_end
+    METRICS.record_inference(
+        role,
+        prompt_tokens=len(llm.tokenize(prompt.encode("utf-8"))),
+        gen_tokens=len(parts),
+        prompt_eval_s=t_first - t0,
+        gen_s=t_end - t_first,
+        interrupted=stopped,
+    )
+    return "".join(parts).strip()
+
+def _call_backend(backend: Backend, prompt: str, role: str, spec: dict, should_stop) -> str:
+    # Backends don't expose a tokenizer; whitespace words stand in for tokens.
+    t0 = time.perf_counter()
+    text = backend(prompt, role, spec, should_stop)
+    METRICS.record_inference(
+        role,
+        prompt_tokens=len(prompt.split()),
+        gen_tokens=len(text.split()),
+        prompt_eval_s=0.0,
+        gen_s=time.perf_counter() - t0,
+    )
+    return text.strip()
+
+def _run(prompt: str, role: str = ROLE_DIALOGUE, tag=None, owner=None) -> str:
+    spec = ROLES.get(role, ROLES[ROLE_DIALOGUE])
+    backend = _BACKEND
+    if backend is not None:
+        engine, job = backend, lambda should_stop: _call_backend(backend, prompt, role, spec, should_stop)
+    else:
+        llm = _model_for(role)
+        engine, job = llm, lambda should_stop: _generate(llm, prompt, role, spec, should_stop)
     try:
-        res = _llm(prompt=prompt, max_tokens=max_tokens, temperature=temperature, stop=STOP)
-        return res["choices"][0]["text"].strip()
+        return _SCHEDULERS[id(engine)].run(
+            job,
+            priority=spec.get("priority", PRIORITY_INTERACTIVE),
+            tag=tag,
+            owner=owner,
+        )
+    except InferenceCancelled:
+        raise
     except Exception as e:
         print(f"[ERROR] Llama model inference failed: {e}")
         return ""
 
-def query_npc(prompt: str) -> str:
-    return _run(prompt, max_tokens=40, temperature=0.8)
+def query_npc(prompt: str, role: str = ROLE_DIALOGUE, tag=None, owner=None) -> str:
+    """
+    Blocking NPC completion. Raises InferenceCancelled if `tag` gets cancelled.
+    `owner` (one per player session) gets a fair share of the model.
+    """
+    return _run(prompt, role, tag, owner)
+
+def cancel_npc_jobs(tag) -> int:
+    """Drop queued/running jobs submitted with `tag` on every model."""
+    return sum(s.cancel(tag) for s in list(_SCHEDULERS.values()))
 
 # In build_npc_prompt (llm/prompt_builder.py), consider truncating player_history and player_emotions to last 3-5 entries for speed.
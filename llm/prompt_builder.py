@@ -1,7 +1,10 @@
 from __future__ import annotations
 from textwrap import dedent
-import re, random
-from typing import Dict, List, Optional
+import itertools, re, random
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from llm.metrics import METRICS
+from llm.tokens import count_tokens
 
 def _profile_blurb(profile: dict) -> str:
     gp = profile.get("google", {}).get("profile", {})
@@ -35,27 +38,33 @@ def _fallback_with_hook(hooks: Dict[str, str], player_emotions: Optional[List[st
     ]
     return random.choice([resp for resp in responses if resp.strip()]) or "You feel a presence, but it says nothing."
 
-def build_npc_prompt(
-    profile: dict,
-    last_room_desc: str,
-    hooks: Dict[str, str],
-    dialogue_key: Optional[str] = None,
-    player_history: Optional[str] = "",
-    player_emotions: Optional[List[str]] = None,
-    contacts: Optional[List[str]] = None
-) -> str:
-    """
-    Prompt for **The Whisperer** (NPC) -- with memory, emotion, and contact intent.
-    """
-    # Restore richer context for realism
-    if isinstance(player_history, list):
-        player_history = player_history[-3:]
-        player_history = " | ".join(player_history)
-    if isinstance(player_emotions, list):
-        player_emotions = player_emotions[-5:]
-    # Use all contacts and hooks for realism
-    recent_emotions = ", ".join(player_emotions or []) or "none"
-    contacts_line = ", ".join(contacts or [])
+DEFAULT_PROMPT_BUDGET = 600   # tokens; n_ctx is 1024 and replies stay under 40
+CONTACT_MISSES = 3            # contacts that don't fit before the contact scan gives up
+MAX_NAME_WORDS = 4            # longest contact name looked up in the room text
+
+# hook keys that suit each dialogue intent, best first
+_INTENT_HOOKS = {
+    "greeting": ("name", "event", "birthday", "special"),
+    "a": ("name", "contact", "artist"),                      # Who are you?
+    "b": ("event", "special", "task", "gmail"),              # Explain this room.
+    "c": ("special", "birthday", "contact", "gmail"),        # You’re lying.
+    "d": ("track", "playlist", "youtube", "ytvideo", "genre"),   # Stay silent.
+}
+_WORD_RE = re.compile(r"\w{3,}")
+
+def _words(text: str) -> set:
+    return set(_WORD_RE.findall(text.lower()))
+
+def rank_by_relevance(items: List[Tuple[str, str]], context: str, preferred: Sequence[str] = ()) -> List[Tuple[str, str]]:
+    """Order (key, value) pairs by word overlap with `context`, `preferred` keys first; stable."""
+    ctx = _words(context)
+    def score(i_kv):
+        i, (k, v) = i_kv
+        bonus = len(preferred) - preferred.index(k) if k in preferred else 0
+        return (-(2 * len(ctx & _words(v)) + bonus), i)
+    return [kv for _, kv in sorted(enumerate(items), key=score)]
+
+def _assemble(profile, room_desc, hook_lines, contacts_line, dialogue_key, player_history, recent_emotions) -> str:
     sys_msg = dedent(f"""
         You are **The Whisperer**, a cryptic—but subtly human—figure in a psychological maze.
         Respond with exactly ONE mysterious, unsettling, or caring line (6-26 words).
@@ -65,13 +74,13 @@ def build_npc_prompt(
         Recent player emotions: {recent_emotions}
         Never break character. Never repeat the room description. End with <END>.
     """).strip()
-    hook_block = "\n".join(f"<<{k}>> = {v}" for k, v in hooks.items()) if hooks else "(no hooks today)"
+    hook_block = "\n".join(hook_lines) if hook_lines else "(no hooks today)"
     user_msg = dedent(f"""
         Player profile: {_profile_blurb(profile)}
         Personal hooks you may reference (choose one, insert verbatim!):
         {hook_block}
         Current room description:
-        "{last_room_desc}"
+        "{room_desc}"
         Player last dialogue/action: "{dialogue_key or 'none'}"
         Previous interaction: "{player_history or 'none'}"
         Your single mysterious sentence:
@@ -82,19 +91,102 @@ def build_npc_prompt(
         "### ASSISTANT ###\n"
     )
 
+def build_npc_prompt(
+    profile: dict,
+    last_room_desc: str,
+    hooks: Dict[str, str],
+    dialogue_key: Optional[str] = None,
+    player_history: Optional[str] = "",
+    player_emotions: Optional[List[str]] = None,
+    contacts: Optional[List[str]] = None,
+    budget: Optional[int] = None,
+) -> str:
+    """
+    Prompt for **The Whisperer** (NPC) -- with memory, emotion, and contact intent.
+    Hooks and contacts are ranked by relevance to the room and dialogue key and
+    added while the prompt stays within `budget` tokens (at least one hook is kept).
+    """
+    # Restore richer context for realism
+    if isinstance(player_history, list):
+        player_history = player_history[-3:]
+        player_history = " | ".join(player_history)
+    if isinstance(player_emotions, list):
+        player_emotions = player_emotions[-5:]
+    recent_emotions = ", ".join(player_emotions or []) or "none"
+    budget = budget or DEFAULT_PROMPT_BUDGET
+    parts = (dialogue_key, player_history, recent_emotions)
+
+    room_desc = last_room_desc
+    used = count_tokens(_assemble(profile, room_desc, [], "", *parts))
+    if used > budget:
+        # Only the room text can be long enough to matter; keep its opening.
+        words = last_room_desc.split()
+        over = used - count_tokens(last_room_desc)
+        keep = len(words) * max(0, budget - over) // max(1, count_tokens(last_room_desc))
+        room_desc = " ".join(words[:max(8, keep)]) + "…"
+        used = count_tokens(_assemble(profile, room_desc, [], "", *parts))
+
+    context = f"{last_room_desc} {dialogue_key or ''}"
+    hook_lines = []
+    for k, v in rank_by_relevance(list(hooks.items()), context, _INTENT_HOOKS.get(dialogue_key or "", ())):
+        line = f"<<{k}>> = {v}"
+        n = count_tokens(line) + 1
+        if hook_lines and used + n > budget:
+            continue
+        hook_lines.append(line)
+        used += n
+
+    # Contacts can number in the thousands: ones the room mentions go first,
+    # then profile order, and the scan stops once the budget is spent (or a
+    # few names in a row don't fit), so its cost doesn't grow with the list.
+    named = _named_contacts(contacts or [], context)
+    seen = set(named)
+    names = []
+    misses = 0
+    for c in itertools.chain(named, (c for c in contacts or [] if c and c not in seen)):
+        if budget - used < 2 or misses >= CONTACT_MISSES:
+            break
+        n = count_tokens(c) + 1
+        if used + n > budget:
+            misses += 1
+            continue
+        names.append(c)
+        used += n
+
+    return _assemble(profile, room_desc, hook_lines, ", ".join(names), *parts)
+
+_contact_index: tuple = (None, {})   # (contacts list, {lower-cased name: name}) for the last list seen
+
+def _named_contacts(contacts: List[str], text: str) -> List[str]:
+    """Contacts whose full name appears in `text`, in order of appearance."""
+    global _contact_index
+    src, index = _contact_index
+    if src is not contacts:
+        # the maze passes the same list every time, so this is built once
+        index = {c.lower(): c for c in reversed(contacts) if c}
+        _contact_index = (contacts, index)
+    words = re.findall(r"[\w'-]+", text.lower())
+    found: Dict[str, None] = {}
+    for i in range(len(words)):
+        for n in range(1, MAX_NAME_WORDS + 1):
+            c = index.get(" ".join(words[i:i + n]))
+            if c is not None:
+                found[c] = None
+    return list(found)
+
 def validate_npc_line(text: str, hooks: Dict[str, str], player_emotions: Optional[List[str]]=None, contacts: Optional[List[str]]=None) -> str:
     player_emotions = player_emotions or []
     contacts = contacts or []
+    METRICS.incr("validations")
     raw = (text or "").strip()
-    if not raw:
-        return _fallback_with_hook(hooks, player_emotions, contacts)
+    line = ""
     m = _HOOK_TOKEN_RE.search(raw)
-    if not m:
-        return _fallback_with_hook(hooks, player_emotions, contacts)
-    key = m.group(1)
-    value = hooks.get(key, "")
-    if not value:
-        return _fallback_with_hook(hooks, player_emotions, contacts)
-    line = _HOOK_TOKEN_RE.sub(value, raw, count=1)
-    line = line.replace("<END>", "").strip()
-    return line or _fallback_with_hook(hooks, player_emotions, contacts)
+    if m:
+        value = hooks.get(m.group(1), "")
+        if value:
+            line = _HOOK_TOKEN_RE.sub(value, raw, count=1)
+            line = line.replace("<END>", "").strip()
+    if line:
+        return line
+    METRICS.incr("validate_fallbacks")
+    return _fallback_with_hook(hooks, player_emotions, contacts)
@@ -0,0 +1,154 @@
+"""
+Single-worker inference queue.
+
+A llama.cpp context is not thread-safe, so every call for one model goes
+through one InferenceScheduler.  Interactive jobs jump ahead of queued
+background work and interrupt a running background job between tokens
+(it is re-queued, not lost).  Jobs carry an optional tag so stale work,
+e.g. for a room the player already left, can be dropped in one call.
+
+Jobs may also name an owner (one per player session).  Within a priority
+level owners are served round-robin: an owner's k-th queued job is placed
+in round k, so one busy session cannot starve the others.
+"""
+
+from __future__ import annotations
+import heapq
+import itertools
+import threading
+from concurrent.futures import CancelledError, Future
+from typing import Any, Callable, Hashable, Optional
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND  = 10
+
+class InferenceCancelled(Exception):
+    """The job was cancelled before it produced a result."""
+
+class _Job:
+    __slots__ = ("fn", "priority", "round", "seq", "tag", "owner", "future", "cancelled", "preempted")
+
+    def __init__(self, fn, priority: int, rnd: int, seq: int, tag: Optional[Hashable], owner: Optional[Hashable]):
+        self.fn        = fn
+        self.priority  = priority
+        self.round     = rnd
+        self.seq       = seq
+        self.tag       = tag
+        self.owner     = owner
+        self.future: Future = Future()
+        self.cancelled = False
+        self.preempted = False
+
+    def __lt__(self, other: "_Job") -> bool:
+        return (self.priority, self.round, self.seq) < (other.priority, other.round, other.seq)
+
+class InferenceScheduler:
+    """Serializes jobs on one worker thread, lowest priority value first."""
+
+    def __init__(self, name: str = "llm"):
+        self._heap: list[_Job] = []
+        self._seq = itertools.count()
+        self._cv = threading.Condition()
+        self._running: Optional[_Job] = None
+        self._round = 0                                   # round of the last dispatched job
+        self._owner_round: dict[Hashable, int] = {}       # owner -> round of its newest queued job
+        self._closed = False
+        self._worker = threading.Thread(target=self._loop, name=f"{name}-scheduler", daemon=True)
+        self._worker.start()
+
+    def submit(self, fn: Callable[[Callable[[], bool]], Any],
+               priority: int = PRIORITY_INTERACTIVE,
+               tag: Optional[Hashable] = None,
+               owner: Optional[Hashable] = None) -> Future:
+        """Queue `fn(should_stop)`; fn should poll should_stop() between tokens."""
+        with self._cv:
+            if self._closed:
+                raise RuntimeError("scheduler is closed")
+            if owner is None:
+                rnd = self._round
+            else:
+                rnd = max(self._owner_round.get(owner, -1) + 1, self._round)
+                self._owner_round[owner] = rnd
+            job = _Job(fn, priority, rnd, next(self._seq), tag, owner)
+            heapq.heappush(self._heap, job)
+            self._cv.notify()
+        return job.future
+
+    def run(self, fn, priority: int = PRIORITY_INTERACTIVE, tag: Optional[Hashable] = None,
+            owner: Optional[Hashable] = None) -> Any:
+        """Submit and block for the result. Raises InferenceCancelled."""
+        try:
+            return self.submit(fn, priority, tag, owner).result()
+        except CancelledError:
+            raise InferenceCancelled(tag) from None
+
+    def cancel(self, tag: Hashable) -> int:
+        """Cancel queued and running jobs carrying `tag`. Returns how many."""
+        n = 0
+        with self._cv:
+            for job in self._heap:
+                if job.tag == tag and not job.cancelled:
+                    job.cancelled = True
+                    n += 1
+            if self._running is not None and self._running.tag == tag and not self._running.cancelled:
+                self._running.cancelled = True
+                n += 1
+        return n
+
+    def close(self) -> None:
+        """Refuse new jobs; the worker exits once the queued ones have run."""
+        with self._cv:
+            self._closed = True
+            self._cv.notify()
+
+    def pending(self) -> int:
+        with self._cv:
+            return len(self._heap)
+
+    def _should_stop(self, job: _Job) -> bool:
+        with self._cv:
+            if job.cancelled:
+                return True
+            if self._heap and self._heap[0].priority < job.priority:
+                job.preempted = True
+                return True
+        return False
+
+    def _loop(self) -> None:
+        while True:
+            with self._cv:
+                while not self._heap:
+                    if self._closed:
+                        return
+                    self._cv.wait()
+                job = heapq.heappop(self._heap)
+                self._round = max(self._round, job.round)
+                if self._owner_round.get(job.owner, -1) <= self._round:
+                    # nothing newer queued for this owner: forget it
+                    self._owner_round.pop(job.owner, None)
+                if job.cancelled:
+                    if not job.future.done():
+                        job.future.set_exception(InferenceCancelled(job.tag))
+                    continue
+                # Re-queued (preempted) jobs are already RUNNING.
+                if not job.future.running() and not job.future.set_running_or_notify_cancel():
+                    continue
+                job.preempted = False
+                self._running = job
+            try:
+                result = job.fn(lambda: self._should_stop(job))
+            except BaseException as e:
+                with self._cv:
+                    self._running = None
+                job.future.set_exception(e)
+                continue
+            with self._cv:
+                self._running = None
+                if not job.cancelled and job.preempted:
+                    # Interrupted by interactive work: run it again later.
+                    heapq.heappush(self._heap, job)
+                    continue
+            if job.cancelled:
+                job.future.set_exception(InferenceCancelled(job.tag))
+            else:
+                job.future.set_result(result)
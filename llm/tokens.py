@@ -0,0 +1,49 @@
+# llm/tokens.py
+"""
+Cached token counts for prompt budgeting.
+
+model_interface installs the llama.cpp tokenizer once the dialogue model
+is loaded; until then (and with a stub backend) a chars/4 estimate is
+used.  Prompt pieces repeat across retries and rooms, so counts are kept
+in a bounded LRU keyed by the exact string.
+"""
+from __future__ import annotations
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from llm.metrics import METRICS
+
+CACHE_SIZE = 4096
+
+_tokenizer: Optional[Callable[[str], int]] = None
+_cache: "OrderedDict[str, int]" = OrderedDict()
+_lock = threading.Lock()
+
+def set_tokenizer(fn: Optional[Callable[[str], int]]) -> None:
+    """Count with `fn(text) -> n_tokens` from now on (None: estimate)."""
+    global _tokenizer
+    with _lock:
+        _tokenizer = fn
+        _cache.clear()
+
+def estimate_tokens(text: str) -> int:
+    return max(len(text.split()), (len(text) + 3) // 4)
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    with _lock:
+        n = _cache.get(text)
+        if n is not None:
+            _cache.move_to_end(text)
+        fn = _tokenizer
+    METRICS.record_cache("tokens", n is not None)
+    if n is not None:
+        return n
+    n = fn(text) if fn is not None else estimate_tokens(text)
+    with _lock:
+        _cache[text] = n
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return n
@@ -1,8 +1,10 @@
 # llm_worker.py
 import sys
 import json
+from config import Config
 from utils.json_io import load_json
-from maze.generator import MazeGenerator
+from utils.profiling import OpProfiler
+from maze.generator import MazeGenerator, Room
 
 if __name__ == "__main__":
     req = sys.stdin.read()
@@ -12,13 +14,11 @@ if __name__ == "__main__":
     room = req_data["room"]
     log = req_data["log"]
     action = req_data.get("action", "greeting")
+    # --profile / MAZE_PROFILE_DIR: report goes to stderr, stdout carries the reply
+    profiler = OpProfiler(Config.PROFILE_DIR or ("profiles" if "--profile" in sys.argv[1:] else None))
     # Minimal MazeGenerator to handle prompt construction
-    maze = MazeGenerator(profile)
-    class DummyRoom:
-        def __init__(self, desc, theme, furniture):
-            self.description = desc
-            self.theme = theme
-            self.furniture = furniture
-    d_room = DummyRoom(room["description"], room["theme"], room["furniture"])
-    npc_reply, _ = maze.talk_with_context(action, d_room, log)
+    maze = profiler.call("init", MazeGenerator, profile, pregenerate=False)
+    d_room = Room(room["theme"], room["description"], room["furniture"])
+    npc_reply, _ = profiler.call("talk", maze.talk_with_context, action, d_room, log)
     print(npc_reply)
+    profiler.close(out=sys.stderr)
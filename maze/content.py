@@ -0,0 +1,203 @@
+# File: maze/content.py
+"""
+Room content packs.
+
+A pack is JSON lines: a header with each mood's furniture and wall
+colours, then one room template per line:
+
+    {"pack": "base", "version": 1, "moods": {"sad": {"furniture": [...], "colors": [...]}, ...}}
+    {"mood": "sad", "text": "Rain taps the {furniture}. ... {hook}."}
+
+Templates may use {name}, {hook}, {event}, {contact}, {furniture} and
+{wall_color}.  They are checked once, when the pack's index is built;
+bad lines are skipped with a warning.  The index (`<pack>.idx`, rebuilt
+whenever the pack changes) holds the header and the byte offset of every
+valid template, grouped by mood.  Both files are memory-mapped, so opening
+a pack with tens of thousands of templates reads a few bytes, and a
+template is parsed and compiled only when a room first uses it.
+
+    python -m maze.content path/to/pack.jsonl     # validate + index a pack
+"""
+from __future__ import annotations
+import json
+import mmap
+import os
+import string
+import struct
+import sys
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+PACK_VERSION   = 1
+INDEX_VERSION  = 1
+FIELDS         = frozenset(("name", "hook", "event", "contact", "furniture", "wall_color"))
+TEMPLATE_CACHE = 512
+DEFAULT_PACK   = Path(__file__).parent / "packs" / "base.jsonl"
+
+_MAGIC  = b"MZCP"
+_HEADER = struct.Struct("<4sHqqI")   # magic, version, source mtime_ns, source size, meta length
+_OFFSET = struct.Struct("<Q")
+
+class PackError(ValueError):
+    """The pack file is unusable (bad header, mood without furniture/colours…)."""
+
+class Template:
+    """A template split once into (literal, field) pieces, so rendering is a join."""
+    __slots__ = ("id", "pieces")
+
+    def __init__(self, tid: int, pieces: tuple):
+        self.id = tid
+        self.pieces = pieces
+
+    def render(self, fields: dict) -> str:
+        return "".join(lit + fields[f] if f else lit for lit, f in self.pieces)
+
+def compile_template(text: str) -> tuple:
+    """(literal, field) pieces of `text`; ValueError on unknown or formatted fields."""
+    pieces = []
+    for lit, field, spec, conv in string.Formatter().parse(text):
+        if field is not None and (field not in FIELDS or spec or conv):
+            raise ValueError(f"unsupported placeholder {{{field}}}")
+        pieces.append((lit, field))
+    return tuple(pieces)
+
+# ---------------------------------------------------------------------------- index
+def _scan(path: Path) -> tuple[dict, dict[str, list[int]]]:
+    """Validate the pack; its header and the offsets of its good templates per mood."""
+    with open(path, "rb") as f:
+        try:
+            header = json.loads(f.readline())
+        except ValueError as e:
+            raise PackError(f"{path}: bad header ({e})") from None
+        if header.get("version") != PACK_VERSION or not isinstance(header.get("moods"), dict):
+            raise PackError(f"{path}: not a version {PACK_VERSION} content pack")
+        for mood, m in header["moods"].items():
+            if not (m.get("furniture") and m.get("colors")):
+                raise PackError(f"{path}: mood {mood!r} needs furniture and colors")
+        offsets: dict[str, list[int]] = {mood: [] for mood in header["moods"]}
+        n = 1
+        while True:
+            off = f.tell()
+            raw = f.readline()
+            if not raw:
+                break
+            n += 1
+            if not raw.strip():
+                continue
+            try:
+                rec = json.loads(raw)
+                compile_template(rec["text"])
+                offsets[rec["mood"]].append(off)
+            except (ValueError, KeyError, TypeError) as e:
+                print(f"[WARN] {path.name}:{n}: template skipped ({e})")
+    for mood, offs in offsets.items():
+        if not offs:
+            raise PackError(f"{path}: mood {mood!r} has no usable templates")
+    return header, offsets
+
+def build_index(path: Path) -> bytes:
+    st = os.stat(path)
+    header, offsets = _scan(path)
+    moods = {m: {**header["moods"][m], "count": len(offsets[m])} for m in header["moods"]}
+    meta = json.dumps({"pack": header.get("pack", path.stem), "moods": moods},
+                      ensure_ascii=False).encode("utf-8")
+    meta += b" " * (-(_HEADER.size + len(meta)) % _OFFSET.size)   # align the offsets table
+    body = b"".join(_OFFSET.pack(o) for m in moods for o in offsets[m])
+    return _HEADER.pack(_MAGIC, INDEX_VERSION, st.st_mtime_ns, st.st_size, len(meta)) + meta + body
+
+def index_path_for(path: Path) -> Path:
+    return path.with_suffix(".idx")
+
+def _index_is_current(idx: bytes, path: Path) -> bool:
+    if len(idx) < _HEADER.size:
+        return False
+    magic, version, mtime_ns, size, _ = _HEADER.unpack_from(idx)
+    st = os.stat(path)
+    return magic == _MAGIC and version == INDEX_VERSION and (mtime_ns, size) == (st.st_mtime_ns, st.st_size)
+
+# ---------------------------------------------------------------------------- pack
+class ContentPack:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._fh = open(self.path, "rb")
+        self._mm = mmap.mmap(self._fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._idx_fh = None
+        self._idx = idx = self._open_index()
+        _, _, _, _, meta_len = _HEADER.unpack_from(idx)
+        meta = json.loads(bytes(idx[_HEADER.size:_HEADER.size + meta_len]))
+        self._table = _HEADER.size + meta_len
+        self.name: str = meta["pack"]
+        self._meta = {m: (tuple(v["furniture"]), tuple(v["colors"])) for m, v in meta["moods"].items()}
+        self.moods: tuple[str, ...] = tuple(self._meta)
+        # per mood: (first offset slot, count) into the offsets table
+        self._slots: dict[str, tuple[int, int]] = {}
+        start = 0
+        for m, v in meta["moods"].items():
+            self._slots[m] = (start, v["count"])
+            start += v["count"]
+        self.template = lru_cache(maxsize=TEMPLATE_CACHE)(self._load_template)
+
+    def _open_index(self):
+        """The current index, memory-mapped (or built in memory if it can't be saved)."""
+        ip = index_path_for(self.path)
+        if ip.exists() and ip.stat().st_size >= _HEADER.size:
+            fh = open(ip, "rb")
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            if _index_is_current(mm, self.path):
+                self._idx_fh = (fh, mm)
+                return mm
+            mm.close()
+            fh.close()
+        data = build_index(self.path)
+        try:
+            tmp = ip.with_suffix(".idx.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, ip)
+        except OSError:
+            pass   # read-only install: keep the index in memory
+        return data
+
+    def count(self, mood: str) -> int:
+        return self._slots[mood][1]
+
+    def furniture(self, mood: str) -> tuple[str, ...]:
+        return self._meta[mood][0]
+
+    def colors(self, mood: str) -> tuple[str, ...]:
+        return self._meta[mood][1]
+
+    def _load_template(self, mood: str, i: int) -> Template:
+        start, n = self._slots[mood]
+        if not 0 <= i < n:
+            raise IndexError(f"{mood} template {i} out of range ({n})")
+        off, = _OFFSET.unpack_from(self._idx, self._table + (start + i) * _OFFSET.size)
+        end = self._mm.find(b"\n", off)
+        rec = json.loads(self._mm[off:end if end != -1 else len(self._mm)])
+        return Template(start + i, compile_template(rec["text"]))
+
+    def close(self) -> None:
+        self.template.cache_clear()
+        self._mm.close()
+        self._fh.close()
+        if self._idx_fh is not None:
+            self._idx_fh[1].close()
+            self._idx_fh[0].close()
+
+_open: dict[Path, ContentPack] = {}
+_open_lock = threading.Lock()
+
+def load_pack(path: str | Path = DEFAULT_PACK) -> ContentPack:
+    """The pack at `path`, opened on first use and shared afterwards."""
+    path = Path(path)
+    with _open_lock:
+        pack = _open.get(path)
+        if pack is None:
+            pack = _open[path] = ContentPack(path)
+        return pack
+
+if __name__ == "__main__":
+    for arg in sys.argv[1:] or [str(DEFAULT_PACK)]:
+        pack = ContentPack(arg)
+        print(f"[INFO] {pack.name}: " + ", ".join(f"{m}={pack.count(m)}" for m in pack.moods))
+        pack.close()
@@ -0,0 +1,174 @@
+# File: maze/event_log.py
+"""
+Typed, bounded interaction log.
+
+Events are small records (room entered, dialogue, inspection, feedback,
+mini-game) instead of pre-formatted strings, so nothing has to re-parse
+text to find "the last dialogue".  The log keeps:
+
+* a ring buffer of the most recent events (what menu 6 shows),
+* a short ring per event type, so `last(kind)` is O(1) and `of(kind, k)`
+  is O(k),
+* running totals per type and per room mood, for the stats screen.
+
+Events that fall off the recent ring are spilled, in batches, to
+compressed segments (maze/log_segments.py) when a SegmentStore is given;
+before() pages back through memory and then those segments.  The session
+journal still holds the full history for resuming.
+"""
+from __future__ import annotations
+import itertools
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Iterable, Optional
+
+from maze.log_segments import SegmentStore
+
+EV_ROOM     = "room"
+EV_DIALOGUE = "dialogue"
+EV_INSPECT  = "inspect"
+EV_FEEDBACK = "feedback"
+EV_MINIGAME = "minigame"
+EV_TEXT     = "text"        # free text from saves made before typed events
+EVENT_KINDS = (EV_ROOM, EV_DIALOGUE, EV_INSPECT, EV_FEEDBACK, EV_MINIGAME, EV_TEXT)
+
+RECENT_SIZE   = 200
+PER_KIND_SIZE = 50
+SEGMENT_SIZE  = 500   # events per spilled segment
+
+class Event:
+    __slots__ = ("kind", "seq", "ts", "data")
+
+    def __init__(self, kind: str, seq: int, data: dict, ts: Optional[float] = None):
+        self.kind = kind
+        self.seq  = seq
+        self.ts   = time.time() if ts is None else ts
+        self.data = data
+
+    def __getitem__(self, key: str) -> Any:
+        return self.data[key]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def to_record(self) -> dict:
+        return {"kind": self.kind, "ts": self.ts, **self.data}
+
+    @property
+    def text(self) -> str:
+        """The line cli.py used to store for this event."""
+        d = self.data
+        if self.kind == EV_ROOM:
+            return f"Room #{d['idx']}: {d['theme']} – {d['description']}"
+        if self.kind == EV_DIALOGUE:
+            if d.get("question"):
+                line = f"[Player] asked: '{d['question']}' – [NPC] replied: {d['reply']}"
+            else:
+                line = f"[NPC] (greeting): {d['reply']}"
+            if d.get("memory"):
+                line += f"\n  (NPC remembered: {d['memory']})"
+            return line
+        if self.kind == EV_INSPECT:
+            return f"Inspected furniture: {d['furniture']} – [NPC] commented: {d['comment']}"
+        if self.kind == EV_FEEDBACK:
+            return f"Player emotional feedback: {d['label']}"
+        if self.kind == EV_MINIGAME:
+            if d["result"] == "incorrect":
+                return f"Mini-game: incorrect answer '{d.get('answer', '')}'"
+            return f"Mini-game: {d['result']} {d['game']}"
+        return d.get("text", "")
+
+class EventLog:
+    def __init__(self, recent: int = RECENT_SIZE, per_kind: int = PER_KIND_SIZE,
+                 spill: Optional[SegmentStore] = None, segment_size: int = SEGMENT_SIZE):
+        self._spill = spill
+        self._segment_size = segment_size
+        self._pending: list[dict] = []   # spilled, not yet written
+        self._describe: Optional[Callable[[tuple], str]] = None
+        self._seq = itertools.count()
+        self._recent: deque = deque(maxlen=recent)
+        self._by_kind: dict[str, deque] = {k: deque(maxlen=per_kind) for k in EVENT_KINDS}
+        self.counts: Counter = Counter()
+        self.moods: Counter = Counter()
+
+    @classmethod
+    def from_records(cls, records: Iterable[dict], describe: Optional[Callable[[tuple], str]] = None,
+                     **kwargs: Any) -> "EventLog":
+        """
+        Rebuild a log from journaled records.  Rooms are journaled by position
+        and seed; `describe((x, y))` supplies their text when they are shown.
+        Events already in the spill segments from an earlier run are not
+        spilled again.
+        """
+        log = cls(**kwargs)
+        log._describe = describe
+        for rec in records:
+            rec = dict(rec)
+            kind, ts = rec.pop("kind"), rec.pop("ts", None)
+            log.add(kind, ts=ts, **rec)
+        if describe is not None:
+            for ev in itertools.chain(log._recent, log._by_kind[EV_ROOM]):
+                if ev.kind == EV_ROOM and "description" not in ev.data:
+                    ev.data["description"] = describe((ev.data["x"], ev.data["y"]))
+        return log
+
+    def add(self, kind: str, ts: Optional[float] = None, **data: Any) -> Event:
+        if kind not in self._by_kind:
+            raise ValueError(f"unknown event kind {kind!r}")
+        ev = Event(kind, next(self._seq), data, ts)
+        if self._spill is not None and len(self._recent) == self._recent.maxlen:
+            self._evict(self._recent[0])
+        self._recent.append(ev)
+        self._by_kind[kind].append(ev)
+        self.counts[kind] += 1
+        if kind == EV_ROOM:
+            self.moods[data["theme"]] += 1
+        return ev
+
+    def __len__(self) -> int:
+        return sum(self.counts.values())
+
+    # ------------------------------------------------------------------  spill
+    def _evict(self, ev: Event) -> None:
+        if ev.seq <= self._spill.last_seq:
+            return   # written by an earlier run of this session
+        self._pending.append({"seq": ev.seq, **ev.to_record()})
+        if len(self._pending) >= self._segment_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write spilled events that are still waiting for a full segment."""
+        if self._spill is not None and self._pending:
+            self._spill.append(self._pending)
+            self._pending = []
+
+    def _from_record(self, rec: dict) -> Event:
+        data = dict(rec)
+        ev = Event(data.pop("kind"), data.pop("seq"), data, data.pop("ts", None))
+        if ev.kind == EV_ROOM and "description" not in data and self._describe is not None:
+            data["description"] = self._describe((data["x"], data["y"]))
+        return ev
+
+    def before(self, seq: int, k: int) -> list[Event]:
+        """Up to `k` events older than event #`seq`, oldest first, from memory and then disk."""
+        out = [ev for ev in self._recent if ev.seq < seq][-k:]
+        if len(out) < k:
+            edge = out[0].seq if out else seq
+            older = [r for r in self._pending if r["seq"] < edge]
+            need = k - len(out)
+            if len(older) < need and self._spill is not None:
+                older = self._spill.before(older[0]["seq"] if older else edge, need - len(older)) + older
+            out = [self._from_record(r) for r in older[-need:]] + out
+        return out
+
+    def last(self, kind: Optional[str] = None) -> Optional[Event]:
+        ring = self._recent if kind is None else self._by_kind[kind]
+        return ring[-1] if ring else None
+
+    def of(self, kind: str, k: Optional[int] = None) -> list[Event]:
+        """Up to `k` most recent events of `kind`, oldest first."""
+        ring = self._by_kind[kind]
+        return list(ring) if k is None else list(itertools.islice(reversed(ring), k))[::-1]
+
+    def recent(self, k: Optional[int] = None) -> list[Event]:
+        return list(self._recent) if k is None else list(itertools.islice(reversed(self._recent), k))[::-1]
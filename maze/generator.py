@@ -2,78 +2,70 @@
 # File: maze/generator.py (2025-05-21 • Full interactive NPC, emotion, inspect, memory)
 # ------------------------------------------------------------------------------#
 from __future__ import annotations
-import random, datetime as _dt, threading
-from typing     import Optional, Deque, List
+import random, datetime as _dt, sys, threading, time
+from typing     import Optional, Deque, Iterable, List
 from pathlib    import Path
-from collections import deque
+from collections import deque, OrderedDict
 
-from llm.model_interface import query_npc
+from llm.model_interface import (
+    query_npc, cancel_npc_jobs, InferenceCancelled, ROLE_DIALOGUE, ROLE_INSPECT, ROLE_BACKGROUND,
+)
 from llm.prompt_builder  import build_npc_prompt, validate_npc_line
-from utils.json_io       import load_json
+from llm.metrics         import METRICS
+from maze.ingest         import load_ingested
+from maze.npc_stats      import NpcStats
+from maze.memory         import MemoryIndex
+from maze.content        import load_pack
+from maze.room           import Room
+from maze.grid           import MazeGrid, Pos, ORIGIN, N, mix, step, direction
 from config              import Config
 
-ROOMS_FILE = Path(__file__).parent / "rooms.json"
-ROOMS = load_json(ROOMS_FILE) if ROOMS_FILE.exists() else {
-    "happy": [
-        [
-            "Sunbeams dance across {wall_color} walls and a {furniture}. Hope swells as memories of {hook} resurface.",
-            "A faint, upbeat melody echoes from the {furniture}—perhaps you remember {hook}?",
-            "The scent of citrus lingers, and somewhere, a calendar reminder for {hook} whispers from the corners.",
-        ],
-        ["plush sofa", "vintage jukebox", "beanbag"],
-        ["honey yellow", "peach", "warm cream"],
-    ],
-    "sad": [
-        [
-            "Muted {wall_color} walls press inwards. A lone {furniture} creaks. Drips echo the countdown to {hook}.",
-            "Your footsteps echo like memories you'd rather forget—was it {hook}?",
-            "Rain taps the {furniture}. The air is thick with something left unsaid: {hook}.",
-        ],
-        ["rocking chair", "dusty piano", "torn loveseat"],
-        ["washed-out blue", "ashen grey", "cold teal"],
-    ],
-    "angry": [
-        [
-            "Ragged shadows slash the {wall_color} walls; a {furniture} rattles. Your pulse matches the room’s fury at {hook}.",
-            "Something overturned the {furniture}. Was it anger about {hook}?",
-            "The air burns, the {furniture} looks battered—did you remember {hook}?",
-        ],
-        ["metal desk", "barred window", "shattered mirror"],
-        ["scarlet", "burnt umber", "dark crimson"],
-    ],
-    "neutral": [
-        [
-            "Bare {wall_color} walls and a simple {furniture}. Silence reigns—only {hook} remains.",
-            "A corridor of smooth {wall_color} stretches ahead. {hook} lingers in the quiet air.",
-            "The {furniture} waits, perfectly centered. The maze itself seems to pause for {hook}.",
-        ],
-        ["wooden stool", "plain cot", "unmarked door"],
-        ["bone white", "pale beige", "soft grey"],
-    ],
-}
-
-EMOTIONS        = list(ROOMS.keys())
 ROOM_CACHE_SIZE = 40
 NPC_CACHE_SIZE  = 30
 NPC_RETRIES     = 7
+MEMORY_K        = 2   # past events recalled into each NPC prompt
+NPC_READY_WAIT  = 0.25 # seconds a greeting waits for the pre-generated line
+ROOM_MEMORY     = 64  # built rooms kept by position; older ones are rebuilt from their seed
+NPC_LINE_CACHE  = 128 # greeting lines kept by room seed for revisits
+TRAIL_SIZE      = 256 # how many steps "Go back" can retrace
 
-class Room:
-    def __init__(self, desc: str, theme: str, furniture: str, items=None):
-        self.description = desc
-        self.theme       = theme
-        self.furniture   = furniture
-        self.items       = items or []
+# menu key -> turn relative to the current heading
+TURNS = {"1": -1, "2": 1, "3": 0}
+BACK  = "b"
+
+# dream rooms aren't drawn from the pack
+_DREAM_EVENT_ITEMS = ("Memory fragment",)
+_DREAM_YT_ITEMS    = ("YouTube memory",)
+_DREAM_ITEMS       = ("Unknown memory",)
+
+class _PendingNpc:
+    """NPC line for a room that a background thread fills in."""
+    __slots__ = ("line", "ready")
+
+    def __init__(self):
+        self.line: Optional[str] = None
+        self.ready = threading.Event()
 
 class MazeGenerator:
     """Interactive maze/NPC with memory, emotion, context, contacts."""
 
-    def __init__(self, profile_blob: dict):
+    def __init__(self, profile_blob: dict, profile_path: Optional[Path] = None, pregenerate: bool = True,
+                 seed: Optional[int] = None, room_parts: Optional[dict] = None):
+        """
+        `profile_path` (the file `profile_blob` came from) enables the ingest cache.
+        `seed` (see `self.seed`) and `room_parts` (see `self.room_parts`) reproduce
+        a journaled maze; by default the seed is random and the parts are today's.
+        Construction never waits on the LLM: the first room is template-only and
+        its NPC line is produced in the background unless `pregenerate` is False.
+        """
+        self.seed = random.getrandbits(63) if seed is None else seed
+        self._pack = load_pack(Config.CONTENT_PACK)
+        self._pregenerate = pregenerate
         self.pro = profile_blob
         self._recent_rooms: Deque[str] = deque(maxlen=ROOM_CACHE_SIZE)
         self._recent_npcs : Deque[str] = deque(maxlen=NPC_CACHE_SIZE)
         self._recent_dialogues: Deque[str] = deque(maxlen=10)
         self._emotion_feedback = deque(maxlen=8)
-        self._contacts: List[str] = []
         self._yt_channels = self.pro.get("google", {}).get("youtube_channels", [])
         self._gmail = self.pro.get("google", {}).get("gmail_subjects", [])
         self._tasks = self.pro.get("google", {}).get("tasks", [])
@@ -82,88 +74,49 @@ class MazeGenerator:
         self._top_artist = self.pro.get("spotify", {}).get("top_artist", "")
         self._liked_tracks = self.pro.get("spotify", {}).get("liked_tracks", [])
 
-        # Load contacts (names only for hooks)
-        try:
-            self._contacts = [c.get("name","") for c in self.pro.get("google", {}).get("contacts", []) if c.get("name")]
-        except Exception:
-            self._contacts = []
-
-        self._yt = [v["title"] for v in self.pro.get("google", {})
-                                          .get("youtube_history", [])]
-        random.shuffle(self._yt)
-
-        today = _dt.date.today()
-        self._calendar_events = [
-            {
-                "summary": ev.get("summary", ""),
-                "start": ev.get("start", "")[:10],  # YYYY-MM-DD
-            }
-            for ev in self.pro.get("google", {}).get("calendar_events", [])
-        ]
-
-        self._today = next((
-            ev["summary"] for ev in self._calendar_events
-            if ev["start"] == today.isoformat()
-        ), "")
-
-        self._upcoming_events = []
-        for ev in self._calendar_events:
-            try:
-                ev_date = _dt.datetime.strptime(ev["start"], "%Y-%m-%d").date()
-                delta = (ev_date - today).days
-                if 0 < delta <= 14:
-                    self._upcoming_events.append(
-                        {"summary": ev["summary"], "days": delta, "date": ev_date}
-                    )
-            except Exception:
-                continue
-
-        self._special_events = []
-        for ev in self._upcoming_events:
-            s = ev["summary"].lower()
-            if "interview" in s:
-                self._special_events.append(f"Interview: {ev['summary']} in {ev['days']} days")
-            if "birthday" in s:
-                self._special_events.append(f"Birthday: {ev['summary']} in {ev['days']} days")
-            if "meeting" in s:
-                self._special_events.append(f"Meeting: {ev['summary']} in {ev['days']} days")
-            if "exam" in s:
-                self._special_events.append(f"Exam: {ev['summary']} in {ev['days']} days")
-
-        self._birthday_hook = ""
-        try:
-            dob = self.pro.get("google", {}).get("profile", {}).get("birthdate", "")
-            if dob:
-                dob_dt = _dt.datetime.strptime(dob, "%Y-%m-%d").date()
-                next_birthday = dob_dt.replace(year=today.year)
-                if next_birthday < today:
-                    next_birthday = next_birthday.replace(year=today.year + 1)
-                days_until = (next_birthday - today).days
-                if days_until <= 14:
-                    self._birthday_hook = f"Your birthday in {days_until} days"
-        except Exception:
-            pass
+        data = load_ingested(self.pro, profile_path)
+        self._contacts: List[str] = data["contacts"]
+        self._yt = data["yt"]
+        self._has_calendar = data["has_calendar"]
+        self._today = data["today"]
+        self._upcoming_events = data["upcoming"]
+        self._special_events = data["special"]
+        self._dream_events = data["dream"]
+        self._birthday_hook = data["birthday_hook"]
+        self._npc_stats = NpcStats(self._contacts, self._yt_channels, self._playlists)
+        self._memory = MemoryIndex()   # what happened in rooms, not the rooms themselves
 
         self._room_counter = 0
         self._curr_room: Optional[Room] = None
-        self._curr_npc : str           = "…"
+        self._curr_npc : Optional[_PendingNpc] = None
         self._last_dialogue: Optional[str] = None
-        self._bg_thread: Optional[threading.Thread] = None
-        self._next_room, self._next_npc = self._build_pair_blocking()
 
-    def _rand(self, seq): return random.choice(seq)
+        # room seeds derive from the maze seed and the profile, so a seed only replays on the same data
+        self._grid = MazeGrid(mix(self.seed, data["profile_key"]))
+        # One seeded title stands in for the old shuffle-then-[0].
+        self._yt_pick = random.Random(self._grid.seed).choice(self._yt) if self._yt else ""
+        self._room_parts(room_parts)
+        self._pos: Optional[Pos] = None
+        self._heading = N
+        self._trail: Deque[Pos] = deque(maxlen=TRAIL_SIZE)
+        self._cells: dict[Pos, tuple[str, int]] = {}   # visited/prefetched: (mood, room seed)
+        self._rooms: "OrderedDict[Pos, Room]" = OrderedDict()
+        self._npc_lines: "OrderedDict[int, str]" = OrderedDict()
+        self._taken: set[tuple[Pos, str]] = set()
+        # the first move enters the origin; its room and NPC line start now
+        self._next_pos: Optional[Pos] = ORIGIN
+        self._next_room = self._new_room(ORIGIN)
+        self._next_npc  = self._start_npc(self._next_room, ORIGIN)
     
-    def set_progress(self, visited, moods):
-        self._visited = visited
-        self._moods = moods
-
-    def _make_room_sentence(self, mood: str) -> tuple[str, str, list]:
-        hooks = [
-            self.pro.get("google", {}).get("profile", {}).get("given_name", ""),
-            self._today or "",
-            self._birthday_hook or "",
-            self._yt[0] if self._yt else "",
-        ]
+    @property
+    def room_parts(self) -> dict:
+        """The date-dependent strings rooms are filled from; journal them to rebuild rooms on another day."""
+        return {"hooks": list(self._hook_pool), "context": list(self._context)}
+
+    def _room_parts(self, snapshot: Optional[dict] = None) -> None:
+        """Interned strings every room of this maze is filled from, built once."""
+        given = self.pro.get("google", {}).get("profile", {}).get("given_name", "")
+        hooks = [given, self._today or "", self._birthday_hook or "", self._yt_pick]
         if self._special_events: hooks.append(self._special_events[0])
         if self._upcoming_events: hooks.append(f"{self._upcoming_events[0]['summary']} in {self._upcoming_events[0]['days']} days")
         if self._contacts: hooks.append(self._contacts[0])
@@ -174,30 +127,30 @@ class MazeGenerator:
         if self._genres: hooks.append(self._genres[0])
         if self._top_artist: hooks.append(self._top_artist)
         if self._liked_tracks: hooks.append(self._liked_tracks[0])
-        hooks = [h for h in hooks if h]
-        hook = random.choice(hooks) if hooks else "something unsaid"
-
-        tpl_list, furn_list, color_list = ROOMS[mood]
-        tpl = random.choice(tpl_list)
-        furniture = self._rand(furn_list)
-        desc = tpl.format(
-            name       = self.pro.get("google", {}).get("profile", {}).get("given_name", "You"),
-            hook       = hook,
-            event      = self._today or "—",
-            contact    = random.choice(self._contacts) if self._contacts else "someone",
-            furniture  = furniture,
-            wall_color = self._rand(color_list),
-        )
+        context = (given or "You", self._today or "—")
+        if snapshot:
+            hooks, context = snapshot["hooks"], snapshot["context"]
+        self._hook_pool = tuple(sys.intern(h) for h in hooks if h)
+        self._context = tuple(sys.intern(c) for c in context)
         # --- Inventory/Item logic ---
         items = []
         # Add themed items from user data
         if self._playlists: items.append("Spotify headphones")
         if self._gmail: items.append("Email letter")
         if self._tasks: items.append("Google Task note")
-        if self._calendar_events: items.append("Google Calendar")
+        if self._has_calendar: items.append("Google Calendar")
         if self._yt_channels: items.append(f"YouTube: {self._yt_channels[0]}")
         if self._genres: items.append(f"Music genre: {self._genres[0]}")
-        return desc, furniture, items
+        self._items = tuple(items)
+
+    def _make_room(self, mood: str, seed: int, rng=random) -> Room:
+        hook = rng.choice(self._hook_pool) if self._hook_pool else "something unsaid"
+        pack = self._pack
+        tpl = pack.template(mood, rng.randrange(pack.count(mood)))
+        furniture = rng.choice(pack.furniture(mood))
+        contact = sys.intern(rng.choice(self._contacts)) if self._contacts else "someone"
+        return Room(mood, tpl, furniture, self._items, seed,
+                    hook=hook, contact=contact, color=rng.choice(pack.colors(mood)), context=self._context)
 
     def get_player_emotion_profile(self):
         """Return a summary of the player's emotional state and influences."""
@@ -221,47 +174,62 @@ class MazeGenerator:
         """Choose a room mood based on player emotion profile and time of day."""
         prof = self.get_player_emotion_profile()
         # 60% chance to use player's current mood, else random
+        moods = self._pack.moods
         if random.random() < 0.6:
-            return prof["current"] if prof["current"] in EMOTIONS else random.choice(EMOTIONS)
-        return random.choice(EMOTIONS)
+            return prof["current"] if prof["current"] in moods else random.choice(moods)
+        return random.choice(moods)
 
-    def _unique_room(self) -> Room:
+    def _new_room(self, pos: Pos) -> Room:
+        """Build the room for a cell never entered before and remember how to rebuild it."""
+        base = self._grid.cell_seed(pos)
         # Dream/memory sequence every 6th room
-        if hasattr(self, '_room_counter') and self._room_counter and self._room_counter % 6 == 0:
-            return self._dream_room()
-        for _ in range(12):
-            mood = self._choose_room_mood()
-            sent, furniture, items = self._make_room_sentence(mood)
-            if sent not in self._recent_rooms:
-                self._recent_rooms.append(sent)
-                return Room(sent, mood, furniture, items)
-        mood = self._choose_room_mood()
-        sent, furniture, items = self._make_room_sentence(mood)
-        self._recent_rooms.append(sent)
-        return Room(sent, mood, furniture, items)
-
-    def _dream_room(self) -> Room:
+        if self._room_counter and self._room_counter % 6 == 0:
+            mood, seed = "dream", base
+            room = self._build_room(mood, seed)
+        else:
+            for attempt in range(12):
+                mood, seed = self._choose_room_mood(), mix(base, attempt)
+                room = self._build_room(mood, seed)
+                if room.description not in self._recent_rooms:
+                    break
+        self._recent_rooms.append(room.description)
+        self._cells[pos] = (mood, seed)
+        return room
+
+    def _build_room(self, mood: str, seed: int) -> Room:
+        rng = random.Random(seed)
+        if mood == "dream":
+            return self._dream_room(seed, rng)
+        return self._make_room(mood, seed, rng)
+
+    def _room_at(self, pos: Pos) -> Room:
+        """The room at a known cell: cached, or rebuilt from its seed."""
+        room = self._rooms.get(pos)
+        return room if room is not None else self._build_room(*self._cells[pos])
+
+    def _dream_room(self, seed: int, rng=random) -> Room:
         """Generate a special memory/dream room from user data."""
         # Use a notable event: birthday, concert, big meeting, etc.
-        events = [e for e in self._calendar_events if any(k in e["summary"].lower() for k in ["birthday","concert","meeting","party","exam"])]
-        if events:
-            ev = random.choice(events)
+        if self._dream_events:
+            ev = rng.choice(self._dream_events)
             desc = f"You find yourself reliving: {ev['summary']} ({ev['start']}). The room is warped by memory."
-            return Room(desc, "dream", "memory artifact", ["Memory fragment"])
+            return Room("dream", desc, "memory artifact", _DREAM_EVENT_ITEMS, seed)
         # Fallback: YouTube or music
         if self._yt:
-            yt = random.choice(self._yt)
+            yt = rng.choice(self._yt)
             desc = f"A dreamlike echo of '{yt}' fills the room. You sense this is a memory."
-            return Room(desc, "dream", "echoing object", ["YouTube memory"])
-        return Room("A surreal, shifting space. You feel a memory trying to surface.", "dream", "blurred object", ["Unknown memory"])
-
-    def _gen_npc(self, room_desc: str, dialogue_key=None, log=None) -> tuple[str, str]:
-        history_snippet = ""
-        if log:
-            for l in reversed(log):
-                if "[Player]" in l and len(history_snippet) < 160:
-                    history_snippet = l
-                    break
+            return Room("dream", desc, "echoing object", _DREAM_YT_ITEMS, seed)
+        return Room("dream", "A surreal, shifting space. You feel a memory trying to surface.", "blurred object",
+                    _DREAM_ITEMS, seed)
+
+    def _room_tag(self, pos: Optional[Pos] = None):
+        """Scheduler tag for inference work belonging to the room at `pos` (default: current)."""
+        return (id(self), self._pos if pos is None else pos)
+
+    def _gen_npc(self, room_desc: str, dialogue_key=None, log=None, role: str = ROLE_DIALOGUE, tag=None) -> tuple[str, str]:
+        # past events that relate to this room / question, not just the last line
+        memories = self._memory.search(f"{room_desc} {dialogue_key or ''}", MEMORY_K)
+        history_snippet = memories[0] if memories else ""
         prompt_extras = {"last_player_input": dialogue_key or ""}
         hooks = self._hooks(prompt_extras)
         # Pass contacts and player_emotions
@@ -277,70 +245,205 @@ class MazeGenerator:
         elif self._playlists:
             npc_name = random.choice(self._playlists)
         # If we have a name, use it in the NPC intro
+        history = list(memories)
         if npc_name:
             intro = f"Your old friend {npc_name} appears here, their presence shaped by your memories."
-            history_snippet = intro
-        for _ in range(NPC_RETRIES):
+            history.append(intro)
+            history_snippet = history_snippet or intro
+        t0, outcome, attempts = time.perf_counter(), "exhausted", 0
+        for attempts in range(1, NPC_RETRIES + 1):
             prompt = build_npc_prompt(
-                self.pro, room_desc, hooks, str(dialogue_key) if dialogue_key else "", history_snippet,
-                player_emotions=player_emotions, contacts=self._contacts
+                self.pro, room_desc, hooks, str(dialogue_key) if dialogue_key else "", history,
+                player_emotions=player_emotions, contacts=self._contacts,
+                budget=Config.PROMPT_TOKEN_BUDGET,
             )
-            raw  = query_npc(prompt)
+            try:
+                raw = query_npc(prompt, role, tag, owner=id(self))
+            except InferenceCancelled:
+                outcome = "cancelled"
+                break   # player moved on; don't burn retries on a stale room
             line = validate_npc_line(raw, hooks, player_emotions=player_emotions, contacts=self._contacts)
             if line and line not in self._recent_npcs:
                 self._recent_npcs.append(line)
+                METRICS.record_npc(role, attempts, "ok", time.perf_counter() - t0)
                 return line, history_snippet
+            if line:
+                METRICS.incr("npc_duplicates")
             hooks = self._hooks(prompt_extras)
+        METRICS.record_npc(role, attempts, outcome, time.perf_counter() - t0)
         alt = f"{npc_name if npc_name else (random.choice(self._contacts) if self._contacts else 'A shadow')} lingers here."
         self._recent_npcs.append(alt)
         return alt, history_snippet
 
-    def _build_pair(self) -> tuple[Room, str]:
-        r = self._unique_room()
-        n, _ = self._gen_npc(r.description)
-        return r, n
-
-    def _build_pair_blocking(self):
-        return self._build_pair()
+    def _start_npc(self, room: Room, pos: Pos) -> Optional[_PendingNpc]:
+        """Kick off background generation of the NPC line for the room at `pos`."""
+        if not self._pregenerate:
+            return None
+        pending = _PendingNpc()
+        threading.Thread(target=self._fill_npc, args=(pending, room, pos), daemon=True).start()
+        return pending
 
-    def _build_pair_bg(self):
+    def _fill_npc(self, pending: _PendingNpc, room: Room, pos: Pos):
         try:
-            self._next_room, self._next_npc = self._build_pair()
+            pending.line, _ = self._gen_npc(room.description, role=ROLE_BACKGROUND, tag=self._room_tag(pos))
         except Exception:
-            self._next_room = Room("An unremarkable grey cell.", "neutral", "bench")
-            self._next_npc  = "The figure gives no answer."
-
-    def move(self, _ch: str) -> Room:
+            pending.line = "The figure gives no answer."
+        pending.ready.set()
+
+    def current_npc_line(self, timeout: Optional[float] = 0.0) -> Optional[str]:
+        """The pre-generated line for the current room, if ready within `timeout`."""
+        p = self._curr_npc
+        if p is None or not p.ready.wait(timeout):
+            return None
+        return p.line
+
+    # ------------------------------------------------------------------  navigation
+    def _target(self, ch: str) -> Optional[tuple[Pos, int]]:
+        if self._pos is None:
+            return (ORIGIN, self._entry_heading()) if ch in TURNS else None
+        if ch == BACK and self._trail:
+            return self._trail[-1], direction(self._pos, self._trail[-1])
+        # with no steps to retrace (back at the entrance), "back" turns around
+        heading = (self._heading + (2 if ch == BACK else TURNS[ch])) % 4
+        if not self._grid.is_open(self._pos, heading):
+            return None
+        return step(self._pos, heading), heading
+
+    def _entry_heading(self) -> int:
+        """Face a passage on entering the maze (there is nothing to go back to yet)."""
+        return next(d for d in range(4) if self._grid.is_open(ORIGIN, d))
+
+    def open_moves(self) -> list[str]:
+        """Menu keys ("1" left, "2" right, "3" forward, "b" back) that lead somewhere."""
+        return [ch for ch in (*TURNS, BACK) if self._target(ch) is not None]
+
+    @property
+    def position(self) -> Optional[Pos]:
+        return self._pos
+
+    def move(self, ch: str) -> Optional[Room]:
+        """Step left/right/forward relative to the way you face, or back; None if a wall is in the way."""
+        target = self._target(ch)
+        if target is None:
+            return None
+        pos, heading = target
+        cancel_npc_jobs(self._room_tag())
+        if ch == BACK and self._trail:
+            self._trail.pop()
+        elif self._pos is not None:
+            self._trail.append(self._pos)
         self._room_counter += 1
-        if self._curr_room is None:
-            self._curr_room, self._curr_npc = self._next_room, self._next_npc
-            self._bg_thread = threading.Thread(
-                target=self._build_pair_bg, daemon=True
-            )
-            self._bg_thread.start()
-            return self._curr_room
-
-        self._curr_room, self._curr_npc = self._next_room, self._next_npc
-        if self._bg_thread and self._bg_thread.is_alive():
-            self._bg_thread.join(timeout=0.05)
-        self._bg_thread = threading.Thread(
-            target=self._build_pair_bg, daemon=True
-        )
-        self._bg_thread.start()
-        return self._curr_room
+
+        if pos == self._next_pos:
+            room, npc = self._next_room, self._next_npc
+        else:
+            if self._next_pos is not None:
+                cancel_npc_jobs(self._room_tag(self._next_pos))
+            room = self._room_at(pos) if pos in self._cells else self._new_room(pos)
+            npc = None
+        return self._enter(pos, heading, room, npc)
+
+    def _enter(self, pos: Pos, heading: int, room: Room, npc: Optional[_PendingNpc]) -> Room:
+        self._pos, self._heading = pos, heading
+        line = self._npc_lines.get(room.seed)
+        METRICS.record_cache("npc_line", line is not None)
+        if line is not None:
+            # back in a room you've met the figure in: it greets you the same way
+            npc = _PendingNpc()
+            npc.line = line
+            npc.ready.set()
+        self._rooms[pos] = room
+        self._rooms.move_to_end(pos)
+        if len(self._rooms) > ROOM_MEMORY:
+            self._rooms.popitem(last=False)
+        self._curr_room, self._curr_npc = room, npc
+
+        # template the room straight ahead; its NPC line generates while you look around
+        ahead = step(pos, heading)
+        self._next_pos, self._next_room, self._next_npc = None, None, None
+        if self._grid.is_open(pos, heading) and ahead not in self._cells:
+            self._next_pos = ahead
+            self._next_room = self._new_room(ahead)
+            self._next_npc = self._start_npc(self._next_room, ahead)
+        return room
+
+    def describe(self, pos: Pos) -> str:
+        """Description of an already-built room, regenerated from its seed if need be."""
+        return self._room_at(pos).description
+
+    def restore(self, rooms: Iterable[dict]) -> Optional[Room]:
+        """
+        Put the player back where a journaled session stopped.  `rooms` are its
+        room records, oldest first ({"x", "y", "theme", "seed"}); records from
+        older saves carry only a description and are just counted.
+        Returns the room the player is standing in, if any.
+        """
+        last = before = None
+        for r in rooms:
+            self._room_counter += 1
+            if "seed" not in r:
+                continue
+            pos = (r["x"], r["y"])
+            self._cells[pos] = (r["theme"], r["seed"])
+            if last is not None:
+                # replay the walk so "Go back" retraces it
+                if self._trail and self._trail[-1] == pos:
+                    self._trail.pop()
+                else:
+                    self._trail.append(last)
+            before, last = last, pos
+        if last is None:
+            return None
+        if self._next_pos is not None:
+            cancel_npc_jobs(self._room_tag(self._next_pos))   # the origin, pre-generated at start
+        heading = direction(before, last) if before is not None else self._entry_heading()
+        return self._enter(last, heading, self._room_at(last), None)
+
+    def close(self):
+        """Drop inference still queued for this maze (current and pre-generated room)."""
+        cancel_npc_jobs(self._room_tag())
+        if self._next_pos is not None:
+            cancel_npc_jobs(self._room_tag(self._next_pos))
+
+    def _remember_line(self, line: str) -> None:
+        seed = self._curr_room.seed
+        self._npc_lines[seed] = line
+        self._npc_lines.move_to_end(seed)
+        if len(self._npc_lines) > NPC_LINE_CACHE:
+            self._npc_lines.popitem(last=False)
 
     def talk_with_context(self, dialogue_key, curr_room, log=None):
+        if dialogue_key == "greeting" and curr_room is self._curr_room:
+            ready = self.current_npc_line(NPC_READY_WAIT)
+            if ready is None and self._curr_npc is not None:
+                # still generating: drop it rather than pay for the same line twice
+                cancel_npc_jobs(self._room_tag())
+                self._curr_npc = None
+            if ready is not None:
+                self._curr_npc = None   # use each pre-generated line once
+                self._remember_line(ready)
+                self._npc_stats.add(ready)
+                self._recent_dialogues.append(ready)
+                self._last_dialogue = ready
+                self._memory.add(f"The figure said: {ready}")
+                return ready, ""
         npc_line, npc_mem = self._gen_npc(
             curr_room.description if curr_room else "A blank room.",
             dialogue_key,
             log,
+            tag=self._room_tag(),
         )
+        if dialogue_key == "greeting" and curr_room is self._curr_room:
+            self._remember_line(npc_line)
+        self._npc_stats.add(npc_line)
         self._recent_dialogues.append(npc_line)
         self._last_dialogue = npc_line
+        self._memory.add(f"The figure said: {npc_line}")
         return npc_line, npc_mem
 
     def record_feedback(self, feedback):
         self._emotion_feedback.append(feedback)
+        self._memory.add(f"You felt {feedback} after: {self._last_dialogue or 'silence'}")
 
     def get_room_furniture(self):
         if self._curr_room: return self._curr_room.furniture
@@ -352,18 +455,23 @@ class MazeGenerator:
             f"You look closely at the {furniture}.",
             prompt_key,
             list(self._recent_dialogues),
+            role=ROLE_INSPECT,
+            tag=self._room_tag(),
         )
+        self._npc_stats.add(npc_line)
+        self._memory.add(f"Inspected the {furniture}: {npc_line}")
         return npc_line
 
     def get_room_items(self):
-        if self._curr_room: return self._curr_room.items
+        # rooms share one item tuple; what you picked up is tracked per position
+        if self._curr_room: return [it for it in self._curr_room.items if (self._pos, it) not in self._taken]
         return []
     def collect_item(self, item):
         if not hasattr(self, '_inventory'):
             self._inventory = []
-        if self._curr_room and item in self._curr_room.items:
+        if item in self.get_room_items():
             self._inventory.append(item)
-            self._curr_room.items.remove(item)
+            self._taken.add((self._pos, item))
             return True
         return False
     def get_inventory(self):
@@ -371,33 +479,7 @@ class MazeGenerator:
 
     def get_npc_stats(self):
         """Return stats on NPCs and contact mentions for analytics display."""
-        from collections import Counter
-        # Count all NPC lines (excluding fallback/empty)
-        npc_lines = list(self._recent_npcs)
-        total_npcs = len(npc_lines)
-        # Most frequent NPC (by name in line, if present)
-        name_counts = Counter()
-        contact_counts = Counter()
-        for line in npc_lines:
-            # Try to extract a name/contact from the line
-            for contact in self._contacts:
-                if contact and contact in line:
-                    contact_counts[contact] += 1
-                    name_counts[contact] += 1
-            for yt in getattr(self, '_yt_channels', []):
-                if yt and yt in line:
-                    name_counts[yt] += 1
-            for playlist in getattr(self, '_playlists', []):
-                if playlist and playlist in line:
-                    name_counts[playlist] += 1
-        most_npc = name_counts.most_common(1)[0][0] if name_counts else None
-        most_contact = contact_counts.most_common(1)[0][0] if contact_counts else None
-        return {
-            'total_npcs': total_npcs,
-            'most_npc': most_npc,
-            'most_contact': most_contact,
-            'contact_mentions': dict(contact_counts)
-        }
+        return self._npc_stats.snapshot()
 
     def _hooks(self, prompt_extras=None):
         """Return a dictionary of hooks for LLM prompt, using user data and context."""
@@ -440,8 +522,8 @@ class MazeGenerator:
         if self._liked_tracks:
             hooks["track"] = self._liked_tracks[0]
         # YouTube video
-        if hasattr(self, '_yt') and self._yt:
-            hooks["ytvideo"] = self._yt[0]
+        if self._yt_pick:
+            hooks["ytvideo"] = self._yt_pick
         # Add any prompt extras
         if prompt_extras:
             hooks.update(prompt_extras)
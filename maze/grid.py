@@ -0,0 +1,123 @@
+# File: maze/grid.py
+"""
+The maze floor plan: an endless grid of cells carved lazily in chunks.
+
+Each CHUNK×CHUNK chunk is a seeded spanning-tree maze with a few extra
+openings (so not every corridor dead-ends).  The door between two
+neighbouring chunks is seeded by their shared edge, so both sides agree
+whichever is carved first.  Only chunks the player reaches are carved, a
+small LRU keeps the recent ones, and an evicted chunk is carved
+identically the next time it is needed.
+"""
+from __future__ import annotations
+import random
+from collections import OrderedDict
+
+N, E, S, W = 0, 1, 2, 3
+STEP = ((0, -1), (1, 0), (0, 1), (-1, 0))   # y grows southwards
+ORIGIN = (0, 0)
+
+CHUNK      = 8
+MAX_CHUNKS = 16
+BRAID      = 0.15   # chance to knock out an extra interior wall
+
+Pos = tuple[int, int]
+
+_M64 = (1 << 64) - 1
+
+def mix(*vals: int) -> int:
+    """Stable 64-bit hash of ints (splitmix64 rounds); unlike hash() it never changes between runs."""
+    h = 0x9E3779B97F4A7C15
+    for v in vals:
+        h = ((h ^ (v & _M64)) * 0xBF58476D1CE4E5B9) & _M64
+        h ^= h >> 31
+        h = (h * 0x94D049BB133111EB) & _M64
+        h ^= h >> 29
+    return h
+
+def step(pos: Pos, d: int) -> Pos:
+    dx, dy = STEP[d]
+    return pos[0] + dx, pos[1] + dy
+
+def direction(a: Pos, b: Pos) -> int:
+    """Direction of the step from `a` to neighbouring cell `b`."""
+    return STEP.index((b[0] - a[0], b[1] - a[1]))
+
+class MazeGrid:
+    def __init__(self, seed: int, chunk: int = CHUNK, max_chunks: int = MAX_CHUNKS):
+        self.seed = seed & _M64
+        self.size = chunk
+        self.max_chunks = max_chunks
+        self._chunks: "OrderedDict[Pos, bytearray]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def cell_seed(self, pos: Pos) -> int:
+        return mix(self.seed, 3, *pos)
+
+    def exits(self, pos: Pos) -> int:
+        """Bitmask of open directions (1 << N | 1 << E …) out of `pos`."""
+        (cx, lx), (cy, ly) = divmod(pos[0], self.size), divmod(pos[1], self.size)
+        return self._chunk(cx, cy)[ly * self.size + lx]
+
+    def is_open(self, pos: Pos, d: int) -> bool:
+        return bool(self.exits(pos) >> d & 1)
+
+    # ------------------------------------------------------------------  carving
+    def _chunk(self, cx: int, cy: int) -> bytearray:
+        key = (cx, cy)
+        cells = self._chunks.get(key)
+        if cells is not None:
+            self._chunks.move_to_end(key)
+            return cells
+        cells = self._chunks[key] = self._carve(cx, cy)
+        if len(self._chunks) > self.max_chunks:
+            self._chunks.popitem(last=False)
+        return cells
+
+    def _door(self, axis: int, cx: int, cy: int) -> int:
+        """Row (axis 1: east edge) or column (axis 2: south edge) of chunk (cx, cy)'s door."""
+        return mix(self.seed, axis, cx, cy) % self.size
+
+    def _carve(self, cx: int, cy: int) -> bytearray:
+        n = self.size
+        cells = bytearray(n * n)
+        rng = random.Random(mix(self.seed, 0, cx, cy))
+
+        def connect(x: int, y: int, d: int) -> None:
+            nx, ny = x + STEP[d][0], y + STEP[d][1]
+            cells[y * n + x] |= 1 << d
+            cells[ny * n + nx] |= 1 << ((d + 2) % 4)
+
+        # iterative randomised depth-first search: every cell reachable, one path between any two
+        seen = bytearray(n * n)
+        start = rng.randrange(n * n)
+        seen[start] = 1
+        stack = [divmod(start, n)[::-1]]
+        while stack:
+            x, y = stack[-1]
+            options = [d for d, (dx, dy) in enumerate(STEP)
+                       if 0 <= x + dx < n and 0 <= y + dy < n and not seen[(y + dy) * n + x + dx]]
+            if not options:
+                stack.pop()
+                continue
+            d = rng.choice(options)
+            connect(x, y, d)
+            x, y = x + STEP[d][0], y + STEP[d][1]
+            seen[y * n + x] = 1
+            stack.append((x, y))
+
+        for y in range(n):
+            for x in range(n):
+                if x + 1 < n and rng.random() < BRAID:
+                    connect(x, y, E)
+                if y + 1 < n and rng.random() < BRAID:
+                    connect(x, y, S)
+
+        # doors to the four neighbouring chunks
+        cells[self._door(1, cx, cy) * n + n - 1]         |= 1 << E
+        cells[self._door(1, cx - 1, cy) * n]             |= 1 << W
+        cells[(n - 1) * n + self._door(2, cx, cy)]       |= 1 << S
+        cells[self._door(2, cx, cy - 1)]                 |= 1 << N
+        return cells
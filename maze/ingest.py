@@ -0,0 +1,114 @@
+# File: maze/ingest.py
+"""
+One-pass extraction of the profile fields MazeGenerator needs.
+
+Calendar events are scanned once with a single precompiled keyword regex
+and `date.fromisoformat`; nothing else in the profile is copied.  The
+result is cached next to the profile file, keyed by the file's mtime/size
+and today's date (upcoming-event counters depend on it), so large
+profiles are only walked once per day.  The cached result also carries
+`profile_key`, which seeds the maze layout, so it is not re-hashed on
+every start either.  It covers only data that stays put from day to day
+(no "in N days" hooks), so a session resumed tomorrow keeps its walls.
+"""
+from __future__ import annotations
+import datetime as _dt
+import hashlib
+import re
+from pathlib import Path
+from typing import Optional
+
+from utils.json_io import load_json, save_json
+
+INGEST_VERSION   = 3
+UPCOMING_DAYS    = 14
+SPECIAL_KEYWORDS = ("interview", "birthday", "meeting", "exam")
+DREAM_KEYWORDS   = frozenset(("birthday", "concert", "meeting", "party", "exam"))
+_KEYWORD_RE = re.compile(r"interview|birthday|meeting|exam|concert|party", re.I)
+
+def ingest_profile(pro: dict, today: Optional[_dt.date] = None) -> dict:
+    today = today or _dt.date.today()
+    today_iso = today.isoformat()
+    google = pro.get("google", {})
+
+    try:
+        contacts = [c.get("name", "") for c in google.get("contacts", []) if c.get("name")]
+    except Exception:
+        contacts = []
+
+    today_summary, upcoming, special, dream = "", [], [], []
+    has_calendar = False
+    for ev in google.get("calendar_events", []):
+        has_calendar = True
+        summary = ev.get("summary", "")
+        start = ev.get("start", "")[:10]   # YYYY-MM-DD
+        kws = {k.lower() for k in _KEYWORD_RE.findall(summary)} if summary else ()
+        if kws and DREAM_KEYWORDS.intersection(kws):
+            dream.append({"summary": summary, "start": start})
+        if not today_summary and start == today_iso:
+            today_summary = summary
+        try:
+            delta = (_dt.date.fromisoformat(start) - today).days
+        except ValueError:
+            continue
+        if 0 < delta <= UPCOMING_DAYS:
+            upcoming.append({"summary": summary, "days": delta})
+            for k in SPECIAL_KEYWORDS:
+                if k in kws:
+                    special.append(f"{k.title()}: {summary} in {delta} days")
+
+    birthday_hook = ""
+    try:
+        dob = google.get("profile", {}).get("birthdate", "")
+        if dob:
+            next_birthday = _dt.date.fromisoformat(dob).replace(year=today.year)
+            if next_birthday < today:
+                next_birthday = next_birthday.replace(year=today.year + 1)
+            days_until = (next_birthday - today).days
+            if days_until <= UPCOMING_DAYS:
+                birthday_hook = f"Your birthday in {days_until} days"
+    except Exception:
+        pass
+
+    yt = [v["title"] for v in google.get("youtube_history", [])]
+    spotify = pro.get("spotify", {})
+    blob = repr((google.get("profile", {}).get("given_name", ""), yt, has_calendar, dream, contacts,
+                 google.get("youtube_channels", []),
+                 google.get("gmail_subjects", []), google.get("tasks", []), spotify.get("playlists", []),
+                 spotify.get("genres", []), spotify.get("top_artist", ""), spotify.get("liked_tracks", [])))
+    return {
+        "contacts":      contacts,
+        "yt":            yt,
+        "has_calendar":  has_calendar,
+        "today":         today_summary,
+        "upcoming":      upcoming,
+        "special":       special,
+        "dream":         dream,
+        "birthday_hook": birthday_hook,
+        "profile_key":   int.from_bytes(hashlib.sha1(blob.encode("utf-8")).digest()[:8], "little"),
+    }
+
+def cache_path_for(profile_path: Path) -> Path:
+    return Path(profile_path).with_suffix(".ingest.json")
+
+def load_ingested(pro: dict, profile_path: Optional[Path] = None) -> dict:
+    """ingest_profile(), reusing the sidecar cache when `profile_path` is unchanged."""
+    today = _dt.date.today()
+    if profile_path is None:
+        return ingest_profile(pro, today)
+    try:
+        st = Path(profile_path).stat()
+    except OSError:
+        return ingest_profile(pro, today)
+    key = {"version": INGEST_VERSION, "mtime_ns": st.st_mtime_ns, "size": st.st_size,
+           "today": today.isoformat()}
+    cache_fp = cache_path_for(profile_path)
+    cached = load_json(cache_fp)
+    if isinstance(cached, dict) and cached.get("key") == key:
+        return cached["data"]
+    data = ingest_profile(pro, today)
+    try:
+        save_json(cache_fp, {"key": key, "data": data}, compact=True)
+    except OSError as e:
+        print(f"[WARN] Could not write profile cache: {e}")
+    return data
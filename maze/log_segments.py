@@ -0,0 +1,69 @@
+# File: maze/log_segments.py
+"""
+Compressed on-disk segments for events that fell out of the in-memory log.
+
+EventLog hands over batches of old events; each batch becomes one gzip'd
+JSON-lines file, and `index.json` lists every segment with the range of
+event sequence numbers it holds.  Reading "the k events before #n" opens
+only the newest segments that cover it, so paging back through a long
+session never loads the whole history.
+"""
+from __future__ import annotations
+import gzip
+import json
+import shutil
+from pathlib import Path
+
+from utils.json_io import load_json, save_json
+
+SEGMENTS_VERSION = 1
+
+class SegmentStore:
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+        self._index_path = self.root / "index.json"
+        index = load_json(self._index_path, cache=False) or {}
+        if index.get("version") != SEGMENTS_VERSION:
+            index = {"version": SEGMENTS_VERSION, "segments": []}
+        self._segments: list[dict] = index["segments"]
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the newest spilled event (-1 if none)."""
+        return self._segments[-1]["last"] if self._segments else -1
+
+    def __len__(self) -> int:
+        return sum(s["n"] for s in self._segments)
+
+    def append(self, records: list[dict]) -> None:
+        """Write `records` (each with a "seq", ascending) as a new segment."""
+        if not records:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        name = f"seg-{len(self._segments):05d}.jsonl.gz"
+        with gzip.open(self.root / name, "wt", encoding="utf-8", compresslevel=6) as f:
+            for rec in records:
+                f.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        self._segments.append({"file": name, "first": records[0]["seq"], "last": records[-1]["seq"],
+                               "n": len(records)})
+        save_json(self._index_path, {"version": SEGMENTS_VERSION, "segments": self._segments}, compact=True)
+
+    def _read(self, seg: dict) -> list[dict]:
+        with gzip.open(self.root / seg["file"], "rt", encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def before(self, seq: int, k: int) -> list[dict]:
+        """Up to `k` spilled records older than `seq`, oldest first."""
+        out: list[dict] = []
+        for seg in reversed(self._segments):
+            if len(out) >= k:
+                break
+            if seg["first"] >= seq:
+                continue
+            recs = [r for r in self._read(seg) if r["seq"] < seq]
+            out[:0] = recs[-(k - len(out)):]
+        return out
+
+    def clear(self) -> None:
+        shutil.rmtree(self.root, ignore_errors=True)
+        self._segments = []
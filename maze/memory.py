@@ -0,0 +1,94 @@
+# File: maze/memory.py
+"""
+Session memory the NPCs recall from.
+
+Every NPC line, inspection and feedback is indexed as it happens (rooms
+are not: their text is the prompt's own room description, so recalling a
+past room would only echo it).  Only the newest MEMORY_SIZE events are
+kept; the oldest one's postings are pruned when it falls out.  Features are lower-cased words and adjacent word pairs, hashed to ints,
+in an inverted index; a query scores only the events that share a feature
+with it (idf-weighted, length-normalised, newer first on ties) and skips
+features present in most events, so a lookup touches a few short
+postings lists instead of the whole log.
+"""
+from __future__ import annotations
+import heapq
+import math
+import re
+import threading
+from collections import defaultdict, deque
+from typing import Iterable
+
+MEMORY_SIZE = 512
+
+_WORD_RE = re.compile(r"[^\W\d_]{3,}")
+_STOP = frozenset("""
+    the and you your are was were with that this from into have has its their they them
+    for not but all any can out who what when where which will would there here
+""".split())
+
+def _features(text: str) -> set[int]:
+    words = [w for w in _WORD_RE.findall(text.lower()) if w not in _STOP]
+    feats = {hash(w) for w in words}
+    feats.update(hash((a, b)) for a, b in zip(words, words[1:]))
+    return feats
+
+class MemoryIndex:
+    def __init__(self, size: int = MEMORY_SIZE):
+        self._lock = threading.Lock()
+        self._size = size
+        self._first = 0                     # event id of _texts[0]
+        self._texts: deque[str] = deque()
+        self._norm: deque[float] = deque()
+        self._postings: dict[int, deque[int]] = defaultdict(deque)   # ascending event ids
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def add(self, text: str) -> int:
+        """Index `text`; returns its event id."""
+        feats = _features(text)
+        with self._lock:
+            eid = self._first + len(self._texts)
+            self._texts.append(text)
+            self._norm.append(math.sqrt(len(feats)) or 1.0)
+            for f in feats:
+                self._postings[f].append(eid)
+            if len(self._texts) > self._size:
+                self._drop_oldest()
+        return eid
+
+    def _drop_oldest(self) -> None:
+        # the oldest id heads every postings list it is in
+        for f in _features(self._texts.popleft()):
+            ids = self._postings[f]
+            ids.popleft()
+            if not ids:
+                del self._postings[f]
+        self._norm.popleft()
+        self._first += 1
+
+    def add_many(self, texts: Iterable[str]) -> None:
+        for t in texts:
+            self.add(t)
+
+    def search(self, query: str, k: int = 3, exclude: Iterable[int] = ()) -> list[str]:
+        """Up to `k` past events most relevant to `query`, best first."""
+        feats = _features(query)
+        skip = set(exclude)
+        with self._lock:
+            n = len(self._texts)
+            scores: dict[int, float] = defaultdict(float)
+            for f in feats:
+                ids = self._postings.get(f)
+                # words in most events ("walls", "room") say little and cost a full scan
+                if not ids or (n > 64 and len(ids) > n // 2):
+                    continue
+                idf = math.log(1.0 + n / len(ids))
+                for eid in ids:
+                    scores[eid] += idf
+            for eid in skip:
+                scores.pop(eid, None)
+            first, norm = self._first, self._norm
+            best = heapq.nlargest(k, scores.items(), key=lambda kv: (kv[1] / norm[kv[0] - first], kv[0]))
+            return [self._texts[eid - first] for eid, _ in best]
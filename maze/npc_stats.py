@@ -0,0 +1,59 @@
+# File: maze/npc_stats.py
+"""
+Session-wide NPC analytics, updated once per line instead of rescanned.
+
+All contact / YouTube channel / playlist names are folded into one
+compiled lookahead alternation (longest first) that reports the longest
+name starting at each position; every name contained in a hit counts
+too, so a name is counted whenever it occurs in the line ("Ana Lima"
+also counts "Ana"), as before.  Each new line costs a single regex
+pass and reading the stats is constant time.
+"""
+from __future__ import annotations
+import re
+import threading
+from collections import Counter
+from typing import Iterable, Optional
+
+class NpcStats:
+    def __init__(self, contacts: Iterable[str], yt_channels: Iterable[str] = (), playlists: Iterable[str] = ()):
+        self._lock = threading.Lock()
+        self.total = 0
+        self.name_counts: Counter = Counter()
+        self.contact_counts: Counter = Counter()
+        self._most_npc: Optional[str] = None
+        self._most_contact: Optional[str] = None
+        # name -> (is_contact, how many source lists it appears in)
+        self._names: dict[str, list] = {}
+        for src, is_contact in ((contacts, True), (yt_channels, False), (playlists, False)):
+            for name in dict.fromkeys(n for n in src if n):
+                entry = self._names.setdefault(name, [False, 0])
+                entry[0] = entry[0] or is_contact
+                entry[1] += 1
+        alts = sorted(self._names, key=len, reverse=True)
+        self._re = re.compile("(?=(%s))" % "|".join(map(re.escape, alts))) if alts else None
+        # hit -> every name occurring inside it (itself included)
+        self._within = {name: [n for n in alts if n in name] for name in alts}
+
+    def add(self, line: str) -> None:
+        found = {n for hit in set(self._re.findall(line)) for n in self._within[hit]} if self._re and line else ()
+        with self._lock:
+            self.total += 1
+            for name in found:
+                is_contact, weight = self._names[name]
+                self.name_counts[name] += weight
+                if self._most_npc is None or self.name_counts[name] > self.name_counts[self._most_npc]:
+                    self._most_npc = name
+                if is_contact:
+                    self.contact_counts[name] += 1
+                    if self._most_contact is None or self.contact_counts[name] > self.contact_counts[self._most_contact]:
+                        self._most_contact = name
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                'total_npcs': self.total,
+                'most_npc': self._most_npc,
+                'most_contact': self._most_contact,
+                'contact_mentions': dict(self.contact_counts),
+            }
@@ -1,4 +1,46 @@
+# File: maze/room.py
+"""
+Compact room record.
+
+A room keeps references rather than text: its pack template (shared with
+every room drawn from it), the interned hook/contact/furniture/colour
+strings it was filled with, the maze-wide context (player name, today's
+event) and the maze's shared item tuple.  The description is rendered
+when it is read, so a long walk holds a few pointers per room instead of
+a formatted paragraph and its own item list.
+"""
+from __future__ import annotations
+import sys
+from typing import Union
+
+from maze.content import Template
+
 class Room:
-    def __init__(self, desc: str, theme: str):
-        self.description = desc
-        self.theme       = theme
+    __slots__ = ("theme", "seed", "furniture", "items", "template", "hook", "contact", "color", "context")
+
+    def __init__(self, theme: str, template: Union[Template, str], furniture: str, items: tuple = (),
+                 seed: int = 0, hook: str = "", contact: str = "", color: str = "", context: tuple = ("", "")):
+        """`template` is a pack Template, or the finished text for rooms not drawn from a pack."""
+        self.theme     = sys.intern(theme)
+        self.template  = template
+        self.furniture = sys.intern(furniture)
+        self.items     = items
+        self.seed      = seed
+        self.hook      = hook
+        self.contact   = contact
+        self.color     = color
+        self.context   = context   # (name, event), one tuple per maze
+
+    @property
+    def template_id(self) -> int:
+        return self.template.id if isinstance(self.template, Template) else -1
+
+    @property
+    def description(self) -> str:
+        if not isinstance(self.template, Template):
+            return self.template
+        name, event = self.context
+        return self.template.render({
+            "name": name, "hook": self.hook, "event": event, "contact": self.contact,
+            "furniture": self.furniture, "wall_color": self.color,
+        })
@@ -1,5 +1,6 @@
 # File: oauth/google.py
 
+from __future__ import annotations
 import json
 import threading
 import webbrowser
@@ -14,7 +15,7 @@ from googleapiclient.discovery    import build
 from googleapiclient.errors       import HttpError
 
 from config                import Config
-from utils.json_io         import load_json, save_json
+from utils.profile_store   import ProfileStore
 
 # The port on which the local server will listen
 REDIRECT_HOST = "127.0.0.1"
@@ -90,13 +91,15 @@ class GoogleCollector:
 
         print("✅ Google authentication successful.\n")
 
-    def fetch_and_save(self):
-        """Fetch profile, calendar events, YouTube history, and contacts. Save all."""
+    def fetch_and_save(self, store: ProfileStore | None = None):
+        """
+        Fetch profile, calendar events, YouTube history, and contacts into the
+        "google" section of `store`. Without a store the profile file is
+        updated right away; with one, the caller flushes once at the end.
+        """
         if not self.creds:
             raise RuntimeError("Google credentials not found. Call authenticate() first.")
 
-        data = load_json(Path(Config.PROFILE_PATH)) or {}
-
         # 1) Basic profile
         try:
             oauth2 = build("oauth2", "v2", credentials=self.creds, cache_discovery=False)
@@ -225,7 +228,9 @@ class GoogleCollector:
         yt_channels = list(dict.fromkeys(yt_channels))[:5]
 
         # Merge and save
-        data["google"] = {
+        own_store = store is None
+        store = store or ProfileStore(Config.PROFILE_PATH)
+        store.set_section("google", {
             "profile": profile,
             "calendar_events": [
                 {
@@ -240,7 +245,8 @@ class GoogleCollector:
             "gmail_subjects": subjects,
             "tasks": all_tasks,
             "youtube_channels": yt_channels,
-        }
+        })
 
-        save_json(Path(Config.PROFILE_PATH), data)
+        if own_store:
+            store.flush()
         print("✅ Google data saved.\n")
@@ -12,7 +12,7 @@ import requests
 from requests_oauthlib import OAuth2Session
 
 from config        import Config
-from utils.json_io import load_json, save_json
+from utils.profile_store import ProfileStore
 
 
 _REDIRECT_URI: Final[str] = "http://127.0.0.1:8888/spotify_callback"
@@ -111,7 +111,8 @@ class SpotifyCollector:
         return resp.json()
 
     # ..........................................................
-    def fetch_and_save(self) -> None:
+    def fetch_and_save(self, store: ProfileStore | None = None) -> None:
+        """Fill the "spotify" section of `store` (or the profile file if None)."""
         if not self.session:
             raise RuntimeError("authenticate() first.")
 
@@ -163,14 +164,16 @@ class SpotifyCollector:
         except Exception:
             liked_tracks = []
 
-        # merge into profile JSON    
-        prof = load_json(Path(Config.PROFILE_PATH))
-        prof["spotify"] = {
+        # merge into profile JSON
+        own_store = store is None
+        store = store or ProfileStore(Config.PROFILE_PATH)
+        store.set_section("spotify", {
             "top_tracks": tracks,
             "audio_features": feats,
             "playlists": playlist_names,
             "genres": genres,
             "top_artist": top_artist,
             "liked_tracks": liked_tracks
-        }
-        save_json(Path(Config.PROFILE_PATH), prof)
+        })
+        if own_store:
+            store.flush()
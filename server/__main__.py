@@ -0,0 +1,50 @@
+# server/__main__.py
+"""
+Run the multi-player game server:
+
+    python -m server --port 8765
+    python -m server --stub-llm --latency-ms 40     # no model needed
+"""
+from __future__ import annotations
+import argparse
+
+from config import Config
+from llm import model_interface
+from llm.metrics import METRICS
+from server.app import GameServer
+from server.sessions import SessionManager
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Maze of Me game server")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--sessions-dir", default=str(Config.SESSIONS_DIR))
+    ap.add_argument("--idle-s", type=float, default=Config.SESSION_IDLE_S, help="evict sessions idle this long")
+    ap.add_argument("--max-live", type=int, default=Config.MAX_LIVE_SESSIONS, help="sessions kept in memory")
+    ap.add_argument("--stub-llm", action="store_true", help="use the benchmark stub instead of the GGUF model")
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="stub LLM latency per call")
+    ap.add_argument("--verbose", action="store_true", help="log every request")
+    args = ap.parse_args(argv)
+
+    if args.stub_llm:
+        from benchmarks.stub_llm import StubLLM
+        model_interface.set_backend(StubLLM(args.latency_ms))
+    else:
+        model_interface.preload()
+
+    sessions = SessionManager(args.sessions_dir, Config.PROFILE_PATH, args.idle_s, args.max_live)
+    sessions.start_sweeper(min(30.0, args.idle_s))
+    httpd = GameServer((args.host, args.port), sessions, args.verbose)
+    print(f"[INFO] Serving on http://{args.host}:{args.port} (sessions in {args.sessions_dir})")
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+        sessions.shutdown()
+        if Config.METRICS_PATH:
+            METRICS.export_jsonl(Config.METRICS_PATH)
+
+if __name__ == "__main__":
+    main()
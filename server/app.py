@@ -0,0 +1,127 @@
+# server/app.py
+"""
+JSON-over-HTTP front end for SessionManager (stdlib only).
+
+    POST   /sessions                     {"profile": {...}}?  → new session
+    GET    /sessions/<id>                                     → state + log tail
+    POST   /sessions/<id>/move           {"direction": "1".."3" | "b"}
+    POST   /sessions/<id>/talk           {"option": "greeting" | "a".."d"}
+    POST   /sessions/<id>/inspect
+    POST   /sessions/<id>/feedback       {"feedback": "1".."4"}
+    DELETE /sessions/<id>
+    GET    /health                                            → sessions + LLM metrics
+
+Each request runs on its own thread; NPC calls from every session share
+the model through its InferenceScheduler, which serves sessions round-robin.
+"""
+from __future__ import annotations
+import json
+import re
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+
+from llm.metrics import METRICS
+from server.sessions import SessionError, SessionManager, UnknownSession
+
+MAX_BODY = 1 << 20   # inline profiles can be large-ish; nothing else is
+
+_ROUTE_RE = re.compile(r"^/sessions/([^/]+)(?:/(move|talk|inspect|feedback))?/?$")
+
+# action -> (body field, default)
+_ACTIONS = {
+    "move":     ("direction", "1"),
+    "talk":     ("option", "greeting"),
+    "inspect":  (None, None),
+    "feedback": ("feedback", None),
+}
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "GameServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, fmt: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(fmt, *args)
+
+    # ------------------------------------------------------------------  io
+    def _send(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _body(self) -> Optional[dict]:
+        try:
+            n = int(self.headers.get("Content-Length") or 0)
+        except ValueError:
+            return None
+        if not 0 <= n <= MAX_BODY:
+            return None
+        if n == 0:
+            return {}
+        try:
+            data = json.loads(self.rfile.read(n))
+        except ValueError:
+            return None
+        return data if isinstance(data, dict) else None
+
+    # ------------------------------------------------------------------  routes
+    def do_GET(self) -> None:
+        mgr = self.server.sessions
+        if self.path.rstrip("/") == "/health":
+            return self._send(200, {"sessions": mgr.stats(), "llm": METRICS.summary()})
+        m = _ROUTE_RE.match(self.path)
+        if not m or m.group(2):
+            return self._send(404, {"error": "not found"})
+        try:
+            session = mgr.get(m.group(1))
+        except UnknownSession:
+            return self._send(404, {"error": "unknown session"})
+        with session.lock:
+            return self._send(200, session.state())
+
+    def do_POST(self) -> None:
+        mgr = self.server.sessions
+        body = self._body()
+        if body is None:
+            return self._send(400, {"error": "body must be a JSON object"})
+        try:
+            if self.path.rstrip("/") == "/sessions":
+                profile = body.get("profile")
+                if profile is not None and not isinstance(profile, dict):
+                    return self._send(400, {"error": "profile must be an object"})
+                session = mgr.create(profile)
+                return self._send(201, {"session": session.sid})
+            m = _ROUTE_RE.match(self.path)
+            if not m or not m.group(2):
+                return self._send(404, {"error": "not found"})
+            field, default = _ACTIONS[m.group(2)]
+            args = () if field is None else (str(body.get(field, default)),)
+            return self._send(200, mgr.call(m.group(1), m.group(2), *args))
+        except UnknownSession:
+            return self._send(404, {"error": "unknown session"})
+        except SessionError as e:
+            return self._send(400, {"error": str(e)})
+        except Exception:
+            # a bug, not a bad request: keep the traceback, answer 500
+            traceback.print_exc()
+            return self._send(500, {"error": "internal error"})
+
+    def do_DELETE(self) -> None:
+        m = _ROUTE_RE.match(self.path)
+        if not m or m.group(2):
+            return self._send(404, {"error": "not found"})
+        if not self.server.sessions.delete(m.group(1)):
+            return self._send(404, {"error": "unknown session"})
+        return self._send(200, {"deleted": m.group(1)})
+
+class GameServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, addr: tuple[str, int], sessions: SessionManager, verbose: bool = False):
+        super().__init__(addr, _Handler)
+        self.sessions = sessions
+        self.verbose = verbose
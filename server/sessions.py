@@ -0,0 +1,308 @@
+# server/sessions.py
+"""
+Game sessions for the multi-player server.
+
+GameSession is the per-player state cli.py keeps in locals (room counter,
+event log, place in the maze, greeting flag) around one MazeGenerator, journaled with
+SessionJournal exactly like a CLI game.  Because the journal is already on
+disk, evicting an idle session is just closing it; the next request for
+that ID replays the journal into a fresh MazeGenerator.  Log events that
+leave memory are spilled to `<sid>.log/` next to the journal.
+"""
+from __future__ import annotations
+import re
+import secrets
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Optional
+
+from maze.event_log import EventLog, EV_DIALOGUE, EV_FEEDBACK, EV_INSPECT, EV_ROOM
+from maze.generator import MazeGenerator
+from maze.log_segments import SegmentStore
+from utils.json_io import save_json
+from utils.profile_snapshot import load_profile
+from utils.session_journal import SessionJournal
+
+DIALOGUE_OPTIONS = {
+    "a": "Who are you?",
+    "b": "Explain this room.",
+    "c": "You’re lying.",
+    "d": "Stay silent.",
+}
+FEEDBACK_OPTIONS = {"1": "😊 Happy", "2": "😢 Sad", "3": "😡 Angry", "4": "😐 Neutral"}
+LOG_TAIL = 20
+
+_SID_RE = re.compile(r"^[A-Za-z0-9_-]{8,64}$")
+
+class SessionError(Exception):
+    """The request does not make sense for this session (bad option, no room yet…)."""
+
+class UnknownSession(KeyError):
+    """No live or journaled session has this ID."""
+
+class GameSession:
+    def __init__(self, sid: str, maze: MazeGenerator, journal: SessionJournal, state: Optional[dict] = None,
+                 spill: Optional[SegmentStore] = None):
+        state = state or {}
+        self.sid         = sid
+        self.maze        = maze
+        self.journal     = journal
+        self.room_idx    = state.get("room_idx", 0)
+        self.npc_greeted = state.get("npc_greeted", False)
+        self.curr_room   = maze.restore(state.get("rooms", ()))
+        self.events      = EventLog.from_records(state.get("events", ()), describe=maze.describe, spill=spill)
+        self.last_active = time.monotonic()
+        self.lock        = threading.Lock()
+        self.closed      = False
+
+    # ------------------------------------------------------------------  lifecycle
+    @classmethod
+    def create(cls, sid: str, journal_path: Path, profile_path: Path) -> "GameSession":
+        prof = load_profile(profile_path)
+        if prof is None:
+            raise SessionError(f"profile not found: {profile_path}")
+        maze = MazeGenerator(prof, profile_path)
+        spill = SegmentStore(journal_path.with_suffix(".log"))
+        spill.clear()
+        return cls(sid, maze, SessionJournal.start(journal_path, profile_path, maze.seed, maze.room_parts), spill=spill)
+
+    @classmethod
+    def restore(cls, sid: str, journal_path: Path) -> Optional["GameSession"]:
+        state = SessionJournal.replay(journal_path)
+        if state is None:
+            return None
+        prof = load_profile(state["profile_path"])
+        if prof is None:
+            return None
+        maze = MazeGenerator(prof, Path(state["profile_path"]), seed=state["maze_seed"],
+                             room_parts=state["room_parts"])
+        return cls(sid, maze, SessionJournal.resume(journal_path), state,
+                   SegmentStore(journal_path.with_suffix(".log")))
+
+    def close(self) -> None:
+        self.closed = True
+        self.maze.close()
+        self.journal.close()
+        self.events.flush()
+
+    # ------------------------------------------------------------------  actions
+    def _record(self, kind: str, **data: Any) -> None:
+        ev = self.events.add(kind, **data)
+        if kind != EV_ROOM:   # rooms are journaled as "room" records
+            self.journal.append("event", **ev.to_record())
+
+    def _need_room(self) -> None:
+        if self.curr_room is None:
+            raise SessionError("You haven't entered a room yet.")
+
+    def move(self, direction: str = "1") -> dict:
+        if direction not in ("1", "2", "3", "b"):
+            raise SessionError("direction must be 1, 2, 3 or b")
+        room = self.maze.move(direction)
+        if room is None:
+            raise SessionError("There is nowhere to go back to." if direction == "b" else "A wall blocks that way.")
+        self.room_idx += 1
+        self.curr_room = room
+        self.npc_greeted = False
+        x, y = self.maze.position
+        self.journal.append("room", idx=self.room_idx, theme=room.theme, x=x, y=y, seed=room.seed)
+        self._record(EV_ROOM, idx=self.room_idx, theme=room.theme, x=x, y=y, seed=room.seed,
+                     description=room.description)
+        return {"room": self.room_idx, "theme": room.theme, "description": room.description,
+                "furniture": room.furniture, "items": self.maze.get_room_items(), "exits": self.maze.open_moves()}
+
+    def talk(self, option: str = "greeting") -> dict:
+        self._need_room()
+        if option != "greeting" and option not in DIALOGUE_OPTIONS:
+            raise SessionError("option must be greeting or one of " + ", ".join(DIALOGUE_OPTIONS))
+        if not self.npc_greeted or option == "greeting":
+            reply, mem = self.maze.talk_with_context("greeting", self.curr_room)
+            self._record(EV_DIALOGUE, question=None, reply=reply, memory=mem)
+            if not self.npc_greeted:
+                self.npc_greeted = True
+                self.journal.append("greeted")
+            return {"reply": reply, "memory": mem, "greeting": True}
+        reply, mem = self.maze.talk_with_context(option, self.curr_room)
+        self._record(EV_DIALOGUE, question=DIALOGUE_OPTIONS[option], reply=reply, memory=mem)
+        return {"reply": reply, "memory": mem, "greeting": False}
+
+    def inspect(self) -> dict:
+        self._need_room()
+        furniture = self.maze.get_room_furniture()
+        comment = self.maze.inspect_furniture(furniture)
+        self._record(EV_INSPECT, furniture=furniture, comment=comment)
+        return {"furniture": furniture, "comment": comment, "items": list(self.maze.get_room_items())}
+
+    def feedback(self, key: str) -> dict:
+        label = FEEDBACK_OPTIONS.get(key)
+        if label is None:
+            raise SessionError("feedback must be one of " + ", ".join(FEEDBACK_OPTIONS))
+        self._record(EV_FEEDBACK, label=label)
+        self.maze.record_feedback(label)
+        return {"feedback": label}
+
+    def state(self) -> dict:
+        return {
+            "session": self.sid,
+            "room": self.room_idx,
+            "rooms_visited": self.events.counts[EV_ROOM],
+            "moods": dict(self.events.moods),
+            "npc_greeted": self.npc_greeted,
+            "exits": self.maze.open_moves(),
+            "log": [ev.text for ev in self.events.recent(LOG_TAIL)],
+            "npc_stats": self.maze.get_npc_stats(),
+        }
+
+class SessionManager:
+    """
+    Live sessions by ID, least recently used first.  Sessions idle for
+    `idle_s`, or beyond `max_live`, are closed; their journals stay on disk
+    under `root` and are replayed on the next request.
+    """
+
+    def __init__(self, root: Path, default_profile: Path, idle_s: float = 600.0, max_live: int = 32):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.default_profile = Path(default_profile)
+        self.idle_s = idle_s
+        self.max_live = max_live
+        self._live: "OrderedDict[str, GameSession]" = OrderedDict()
+        self._restoring: dict[str, Future] = {}   # sid -> restore running outside the lock
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+
+    def _journal_path(self, sid: str) -> Path:
+        return self.root / f"{sid}.jsonl"
+
+    # ------------------------------------------------------------------  lookup
+    def create(self, profile: Optional[dict] = None) -> GameSession:
+        """New session on the server's profile, or on `profile` sent by the client."""
+        sid = secrets.token_urlsafe(12)
+        profile_path = self.default_profile
+        if profile is not None:
+            profile_path = self.root / f"{sid}.profile.json"
+            save_json(profile_path, profile)
+        session = GameSession.create(sid, self._journal_path(sid), profile_path)
+        with self._lock:
+            self._live[sid] = session
+        self._enforce_limit()
+        return session
+
+    def get(self, sid: str) -> GameSession:
+        """Live session `sid`, restoring it from disk if it was evicted. UnknownSession if unknown."""
+        if not _SID_RE.match(sid):
+            raise UnknownSession(sid)
+        with self._lock:
+            session = self._live.get(sid)
+            if session is not None:
+                self._live.move_to_end(sid)
+                return session
+            pending = self._restoring.get(sid)
+            if pending is None:
+                pending = self._restoring[sid] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return pending.result()   # another request is already replaying it
+        # replaying the journal is slow; other players' requests must not wait on it
+        try:
+            session = GameSession.restore(sid, self._journal_path(sid))
+            if session is None:
+                raise UnknownSession(sid)
+        except BaseException as e:
+            with self._lock:
+                del self._restoring[sid]
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            del self._restoring[sid]
+            self._live[sid] = session
+        pending.set_result(session)
+        self._enforce_limit()
+        return session
+
+    def call(self, sid: str, action: str, *args: Any) -> dict:
+        """Run one action on `sid` under its lock (one request per player at a time)."""
+        while True:
+            session = self.get(sid)
+            with session.lock:
+                if session.closed:
+                    continue   # evicted while we waited; restore and retry
+                try:
+                    return getattr(session, action)(*args)
+                finally:
+                    session.last_active = time.monotonic()
+
+    def delete(self, sid: str) -> bool:
+        if not _SID_RE.match(sid):
+            return False
+        with self._lock:
+            pending = self._restoring.get(sid)
+        if pending is not None:
+            pending.exception()   # let a running restore publish first, then close it below
+        with self._lock:
+            session = self._live.pop(sid, None)
+        if session is not None:
+            with session.lock:
+                session.close()
+        files = list(self.root.glob(f"{sid}.*"))
+        for fp in files:
+            if fp.is_dir():
+                shutil.rmtree(fp, ignore_errors=True)
+            else:
+                fp.unlink(missing_ok=True)
+        return session is not None or bool(files)
+
+    # ------------------------------------------------------------------  eviction
+    def _evict(self, sid: str, session: GameSession) -> bool:
+        if not session.lock.acquire(blocking=False):
+            return False   # busy: a request is running
+        try:
+            with self._lock:
+                if self._live.get(sid) is session:
+                    del self._live[sid]
+            session.close()
+        finally:
+            session.lock.release()
+        return True
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            idle = [(sid, s) for sid, s in self._live.items() if now - s.last_active >= self.idle_s]
+        return sum(self._evict(sid, s) for sid, s in idle)
+
+    def _enforce_limit(self) -> None:
+        with self._lock:
+            over = list(self._live.items())[:max(0, len(self._live) - self.max_live)]
+        for sid, s in over:
+            self._evict(sid, s)
+
+    def start_sweeper(self, interval: float = 30.0) -> None:
+        def sweep():
+            while not self._stop.wait(interval):
+                n = self.evict_idle()
+                if n:
+                    print(f"[INFO] Evicted {n} idle session(s) to disk")
+        self._sweeper = threading.Thread(target=sweep, name="session-sweeper", daemon=True)
+        self._sweeper.start()
+
+    def shutdown(self) -> None:
+        """Stop sweeping and close every live session (journals stay resumable)."""
+        self._stop.set()
+        with self._lock:
+            live, self._live = list(self._live.values()), OrderedDict()
+        for s in live:
+            with s.lock:
+                s.close()
+
+    def stats(self) -> dict:
+        with self._lock:
+            live = len(self._live)
+        return {"live": live, "on_disk": sum(1 for _ in self.root.glob("*.jsonl"))}
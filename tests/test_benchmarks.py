@@ -0,0 +1,15 @@
+import json
+
+import pytest
+
+pytest.importorskip("dotenv")   # config.py needs it
+pytest.importorskip("pygame")   # pick_track benchmark imports audio.player
+
+from benchmarks import run   # noqa: E402
+
+
+def test_benchmarks_run_once(tmp_path):
+    out = tmp_path / "bench.json"
+    run.main(["--sizes", "small", "--repeat", "1", "--out", str(out)])
+    res = json.loads(out.read_text(encoding="utf-8"))["results"]["small"]
+    assert {"construct", "unique_room", "gen_npc", "npc_stats", "pick_track"} <= set(res)
@@ -0,0 +1,52 @@
+import json
+
+import pytest
+
+from maze.content import ContentPack, PackError, compile_template, index_path_for
+
+
+def _write_pack(path, templates, moods=("sad",)):
+    header = {"pack": "t", "version": 1,
+              "moods": {m: {"furniture": ["piano"], "colors": ["grey"]} for m in moods}}
+    lines = [json.dumps(header)] + [json.dumps({"mood": m, "text": t}) for m, t in templates]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_compile_rejects_unknown_placeholders():
+    assert compile_template("A {furniture}.") == (("A ", "furniture"), (".", None))
+    for bad in ("{password}", "{hook!r}", "{name:>9}", "{"):
+        with pytest.raises(ValueError):
+            compile_template(bad)
+
+
+def test_pack_indexes_valid_templates_and_renders_lazily(tmp_path, capsys):
+    fp = tmp_path / "pack.jsonl"
+    _write_pack(fp, [("sad", "Rain on the {furniture}, {hook}."), ("sad", "Bad {secret}"),
+                     ("sad", "{{braces}} and {wall_color} walls")])
+    pack = ContentPack(fp)
+    assert "template skipped" in capsys.readouterr().out
+    assert pack.moods == ("sad",) and pack.count("sad") == 2
+    assert pack.furniture("sad") == ("piano",)
+    fields = {"furniture": "piano", "hook": "Mia", "wall_color": "grey"}
+    assert pack.template("sad", 0).render(fields) == "Rain on the piano, Mia."
+    assert pack.template("sad", 1).render(fields) == "{braces} and grey walls"
+    assert pack.template("sad", 1) is pack.template("sad", 1)
+    with pytest.raises(IndexError):
+        pack.template("sad", 2)
+    pack.close()
+
+    # the saved index is reused, and rebuilt once the pack changes
+    assert index_path_for(fp).exists()
+    ContentPack(fp).close()
+    assert capsys.readouterr().out == ""
+    _write_pack(fp, [("sad", "Only {hook}.")])
+    pack = ContentPack(fp)
+    assert pack.count("sad") == 1 and pack.template("sad", 0).render({"hook": "x"}) == "Only x."
+    pack.close()
+
+
+def test_mood_without_templates_is_an_error(tmp_path):
+    fp = tmp_path / "pack.jsonl"
+    _write_pack(fp, [("sad", "ok")], moods=("sad", "happy"))
+    with pytest.raises(PackError):
+        ContentPack(fp)
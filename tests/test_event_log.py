@@ -0,0 +1,51 @@
+from maze.event_log import EventLog
+
+def test_lookups_and_text():
+    log = EventLog()
+    log.add("room", idx=1, theme="sad", description="Rain.")
+    log.add("dialogue", question=None, reply="Hello.", memory="")
+    log.add("dialogue", question="Who are you?", reply="Nobody.", memory="the piano")
+    log.add("minigame", game="Sphinx riddle", result="incorrect", answer="dog")
+    assert log.last("dialogue").text == (
+        "[Player] asked: 'Who are you?' – [NPC] replied: Nobody.\n  (NPC remembered: the piano)")
+    assert [e.text for e in log.of("dialogue")] == [
+        "[NPC] (greeting): Hello.", log.last("dialogue").text]
+    assert log.recent(1)[0].text == "Mini-game: incorrect answer 'dog'"
+    assert log.recent(4)[0].text == "Room #1: sad – Rain."
+    assert log.last("inspect") is None
+
+def test_bounded_with_running_totals():
+    log = EventLog(recent=10, per_kind=3)
+    for i in range(1000):
+        log.add("room", idx=i, theme="happy" if i % 4 else "sad", description="x")
+        log.add("feedback", label="😐 Neutral")
+    assert len(log.recent()) == 10
+    assert [e["idx"] for e in log.of("room")] == [997, 998, 999]
+    assert log.counts["room"] == len(log) // 2 == 1000
+    assert log.moods == {"happy": 750, "sad": 250}
+
+def test_records_round_trip():
+    log = EventLog()
+    log.add("inspect", furniture="chair", comment="Creaks.")
+    log.add("feedback", label="😊 Happy")
+    again = EventLog.from_records(e.to_record() for e in log.recent())
+    assert [e.text for e in again.recent()] == [e.text for e in log.recent()]
+    assert again.recent()[0].ts == log.recent()[0].ts
+
+def test_spills_and_pages_back(tmp_path):
+    from maze.log_segments import SegmentStore
+    records = [{"kind": "room", "idx": i, "theme": "sad", "x": i, "y": 0, "seed": i} for i in range(100)]
+    log = EventLog.from_records(records, describe=lambda pos: f"cell {pos[0]}",
+                                recent=10, spill=SegmentStore(tmp_path), segment_size=20)
+    assert len(SegmentStore(tmp_path)) == 80      # four full segments, nothing pending
+    page = log.before(log.recent(1)[0].seq - 5, 12)
+    assert [e["idx"] for e in page] == list(range(82, 94))
+    assert page[0].text == "Room #82: sad – cell 82"
+    assert [e["idx"] for e in log.before(3, 10)] == [0, 1, 2]
+    # a resumed session replays the same events without writing them twice
+    log = EventLog.from_records(records + records[:25], recent=10, spill=SegmentStore(tmp_path),
+                                segment_size=20)
+    log.flush()
+    store = SegmentStore(tmp_path)
+    assert len(store) == 115 and store.last_seq == 114
+    assert [e.seq for e in log.before(10**6, 200)] == list(range(125))
@@ -0,0 +1,34 @@
+from collections import deque
+
+from maze.grid import CHUNK, MazeGrid, ORIGIN, STEP, step
+
+
+def _reachable(grid, limit):
+    seen, todo = {ORIGIN}, deque([ORIGIN])
+    while todo:
+        pos = todo.popleft()
+        for d in range(4):
+            nxt = step(pos, d)
+            if grid.is_open(pos, d) and nxt not in seen and all(-limit <= v < limit for v in nxt):
+                seen.add(nxt)
+                todo.append(nxt)
+    return seen
+
+
+def test_passages_are_two_way_and_connected():
+    grid = MazeGrid(seed=7)
+    span = 2 * CHUNK
+    for x in range(-span, span):
+        for y in range(-span, span):
+            for d, (dx, dy) in enumerate(STEP):
+                assert grid.is_open((x, y), d) == grid.is_open((x + dx, y + dy), (d + 2) % 4)
+    # chunks connect through their doors, so every cell of these 4×4 chunks is reachable
+    assert len(_reachable(grid, span)) == (2 * span) ** 2
+
+
+def test_evicted_chunks_are_carved_identically():
+    small, big = MazeGrid(seed=3, max_chunks=1), MazeGrid(seed=3)
+    cells = [(x, y) for x in range(-20, 20, 3) for y in range(-20, 20, 5)]
+    assert [small.exits(c) for c in cells] == [big.exits(c) for c in cells]
+    assert len(small) == 1
+    assert small.cell_seed((2, 5)) == big.cell_seed((2, 5)) != MazeGrid(seed=4).cell_seed((2, 5))
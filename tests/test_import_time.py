@@ -0,0 +1,28 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("dotenv")     # config.py needs it
+pytest.importorskip("colorama")
+
+ROOT = Path(__file__).resolve().parent.parent
+HEAVY = ("oauth.google", "oauth.spotify", "audio.player", "maze.generator", "googleapiclient",
+         "google_auth_oauthlib", "requests_oauthlib", "pygame", "yt_dlp", "llama_cpp")
+BUDGET_S = 1.0   # cumulative `import cli`, generous for slow CI machines
+
+def _import_cli(*flags):
+    return subprocess.run([sys.executable, *flags, "-c", "import sys, cli; print(' '.join(sys.modules))"],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+
+def test_cli_defers_heavy_imports():
+    loaded = set(_import_cli().stdout.split())
+    assert not loaded & set(HEAVY)
+
+def test_cli_import_time_budget():
+    # -X importtime rows: "import time: self [us] | cumulative | imported package"
+    rows = [line.split("|") for line in _import_cli("-X", "importtime").stderr.splitlines()
+            if line.startswith("import time:") and "|" in line]
+    cumulative = {name.strip(): int(cum) for _, cum, name in rows[1:]}
+    assert cumulative["cli"] / 1e6 < BUDGET_S
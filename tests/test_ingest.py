@@ -0,0 +1,45 @@
+from datetime import date
+from maze.ingest import ingest_profile, load_ingested, cache_path_for
+
+TODAY = date(2025, 5, 21)
+
+PROFILE = {
+    "google": {
+        "profile": {"birthdate": "1990-05-30"},
+        "contacts": [{"name": "Ana"}, {"name": ""}, {"email": "x@y"}],
+        "youtube_history": [{"title": "Song A"}, {"title": "Song B"}],
+        "calendar_events": [
+            {"summary": "Team meeting", "start": "2025-05-21T09:00:00Z"},
+            {"summary": "Job Interview + exam prep", "start": "2025-05-25"},
+            {"summary": "Concert", "start": "2025-07-01"},
+            {"summary": "Broken", "start": "soon"},
+        ],
+    }
+}
+
+def test_ingest_single_pass_fields():
+    d = ingest_profile(PROFILE, TODAY)
+    assert d["contacts"] == ["Ana"]
+    assert d["yt"] == ["Song A", "Song B"]
+    assert d["today"] == "Team meeting"
+    assert d["upcoming"] == [{"summary": "Job Interview + exam prep", "days": 4}]
+    assert d["special"] == [
+        "Interview: Job Interview + exam prep in 4 days",
+        "Exam: Job Interview + exam prep in 4 days",
+    ]
+    assert [e["summary"] for e in d["dream"]] == ["Team meeting", "Job Interview + exam prep", "Concert"]
+    assert d["birthday_hook"] == "Your birthday in 9 days"
+
+def test_load_ingested_uses_sidecar_cache(tmp_path):
+    fp = tmp_path / "user_profile.json"
+    fp.write_text("{}", encoding="utf-8")
+    first = load_ingested(PROFILE, fp)
+    assert cache_path_for(fp).exists()
+    # Same file → cached result even if the blob passed in differs.
+    assert load_ingested({}, fp) == first
+
+def test_profile_key_follows_room_fields():
+    key = ingest_profile(PROFILE, TODAY)["profile_key"]
+    assert ingest_profile(PROFILE, TODAY)["profile_key"] == key
+    assert ingest_profile({**PROFILE, "spotify": {"genres": ["jazz"]}}, TODAY)["profile_key"] != key
+    assert ingest_profile({**PROFILE, "spotify": {"unused": 1}}, TODAY)["profile_key"] == key
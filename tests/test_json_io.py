@@ -0,0 +1,49 @@
+import os
+import pytest
+from utils import json_io
+from utils.json_io import load_json, save_json
+
+@pytest.mark.parametrize("compact", [False, True])
+def test_roundtrip(tmp_path, compact):
+    fp = tmp_path / "p.json"
+    obj = {"name": "Zoë", "tracks": [1, 2.5, None], "feats": {"id": {"valence": 0.3}}}
+    save_json(fp, obj, compact=compact)
+    assert load_json(fp, cache=False) == obj
+    text = fp.read_text(encoding="utf-8")
+    assert "Zoë" in text
+    assert ("\n" in text) is not compact
+
+def test_save_is_atomic_on_failure(tmp_path):
+    fp = tmp_path / "p.json"
+    save_json(fp, {"ok": True})
+    with pytest.raises(TypeError):
+        save_json(fp, {"bad": object()})
+    assert load_json(fp, cache=False) == {"ok": True}
+    assert os.listdir(tmp_path) == ["p.json"]
+
+def test_cache_invalidated_by_mtime(tmp_path, monkeypatch):
+    fp = tmp_path / "p.json"
+    save_json(fp, {"v": 1})
+    parses = []
+    monkeypatch.setattr(json_io, "_loads", lambda data: parses.append(data) or {"v": 1})
+    assert load_json(fp) == {"v": 1}
+    assert parses == []
+    monkeypatch.undo()
+    fp.write_text('{"v": 22}', encoding="utf-8")
+    assert load_json(fp) == {"v": 22}
+
+def test_missing_and_corrupt(tmp_path):
+    assert load_json(tmp_path / "none.json", default={}) == {}
+    bad = tmp_path / "bad.json"
+    bad.write_text("{nope", encoding="utf-8")
+    assert load_json(bad) is None
+
+def test_cache_is_not_aliased(tmp_path):
+    fp = tmp_path / "p.json"
+    obj = {"tracks": [1]}
+    save_json(fp, obj)
+    obj["tracks"].append(2)
+    loaded = load_json(fp)
+    assert loaded == {"tracks": [1]}
+    loaded["tracks"].append(3)
+    assert load_json(fp) == {"tracks": [1]}
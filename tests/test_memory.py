@@ -0,0 +1,47 @@
+import random
+
+from maze.memory import MemoryIndex, _features
+
+
+def test_recalls_related_events_best_first():
+    mem = MemoryIndex()
+    mem.add("Room (sad): Rain taps the rocking chair. Something left unsaid: Exam in 3 days.")
+    mem.add("The figure said: Rui is still waiting for an answer.")
+    mem.add("Inspected the vintage jukebox: it hums Bohemian Rhapsody.")
+    hits = mem.search("A lone rocking chair creaks. Drips echo the countdown to Exam.", k=2)
+    assert hits[0].startswith("Room (sad)")
+    assert mem.search("Rui waiting", k=1) == ["The figure said: Rui is still waiting for an answer."]
+    assert mem.search("nothing shared at all", k=3) == []
+
+
+def test_exclude_and_empty_index():
+    mem = MemoryIndex()
+    assert mem.search("anything") == []
+    eid = mem.add("Room (happy): peach walls and a plush sofa")
+    assert mem.search("plush sofa", exclude=(eid,)) == []
+
+
+def test_lookup_stays_small_on_long_sessions():
+    rng = random.Random(0)
+    vocab = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=6)) for _ in range(3000)]
+    mem = MemoryIndex(size=256)
+    texts = ["Room: walls " + " ".join(rng.choices(vocab, k=12)) for _ in range(5000)]
+    mem.add_many(texts)
+    # postings only cover the kept events, not the whole session
+    assert len(mem) == 256
+    assert sum(map(len, mem._postings.values())) == sum(len(_features(t)) for t in texts[-256:])
+    # a word in every event is skipped rather than scanned
+    assert mem.search("walls", k=3) == []
+    assert mem.search(texts[-10], k=1) == [texts[-10]]
+
+
+def test_keeps_only_the_newest_events():
+    mem = MemoryIndex(size=3)
+    ids = [mem.add(f"Inspected the lamp number{w}") for w in ("one", "two", "three", "four", "five")]
+    assert ids == [0, 1, 2, 3, 4] and len(mem) == 3
+    assert mem.search("numberone numbertwo", k=3) == []
+    assert mem.search("lamp", k=3) == ["Inspected the lamp numberfive", "Inspected the lamp numberfour",
+                                       "Inspected the lamp numberthree"]
+    assert mem.search("lamp", exclude=(4,), k=1) == ["Inspected the lamp numberfour"]
+    # dropped events leave no postings behind
+    assert set(mem._postings) == set().union(*map(_features, mem._texts))
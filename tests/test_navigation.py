@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+pytest.importorskip("dotenv")   # config.py needs it
+
+from benchmarks.profiles import synthetic_profile   # noqa: E402
+from benchmarks.stub_llm import StubLLM             # noqa: E402
+from llm import model_interface                     # noqa: E402
+from llm.metrics import METRICS                     # noqa: E402
+from maze.generator import MazeGenerator            # noqa: E402
+
+
+def test_walls_block_and_back_returns_to_the_same_room():
+    model_interface.set_backend(StubLLM(seed=2))
+    try:
+        maze = MazeGenerator(synthetic_profile(10, 2), pregenerate=False)
+        assert maze.move("b") is None
+        first = maze.move("1")
+        assert maze.position == (0, 0)
+        greeting, _ = maze.talk_with_context("greeting", first)
+        blocked = [ch for ch in "123" if ch not in maze.open_moves()]
+        for ch in blocked:
+            assert maze.move(ch) is None
+        second = maze.move(next(ch for ch in "123" if ch in maze.open_moves()))
+        assert second is not None and maze.position != (0, 0)
+        assert maze.move("b") is first
+        calls = METRICS.summary()["inferences"]
+        assert maze.talk_with_context("greeting", first)[0] == greeting
+        assert METRICS.summary()["inferences"] == calls
+    finally:
+        model_interface.set_backend(None)
+
+
+def test_restore_rebuilds_rooms_from_seeds():
+    profile = synthetic_profile(10, 2)
+    maze = MazeGenerator(profile, pregenerate=False)
+    walk = []
+    for _ in range(12):
+        room = maze.move(maze.open_moves()[0])
+        walk.append({"theme": room.theme, "x": maze.position[0], "y": maze.position[1],
+                     "seed": room.seed, "description": room.description})
+    records = [{k: v for k, v in r.items() if k != "description"} for r in walk]
+
+    again = MazeGenerator(profile, pregenerate=False, seed=maze.seed)
+    here = again.restore(records)
+    assert here.description == walk[-1]["description"]
+    assert again.position == maze.position and again.open_moves() == maze.open_moves()
+    assert [again.describe((r["x"], r["y"])) for r in walk] == [r["description"] for r in walk]
+    # the same seed on different profile data builds a different maze
+    other = MazeGenerator(synthetic_profile(10, 3), pregenerate=False, seed=maze.seed)
+    assert other._grid.seed != again._grid.seed
+
+
+def test_greeting_does_not_generate_the_same_line_twice():
+    stub = StubLLM(latency_ms=400, valid_rate=1.0, seed=2)
+    model_interface.set_backend(stub)
+    try:
+        METRICS.reset()
+        maze = MazeGenerator(synthetic_profile(10, 2))   # origin line starts in the background
+        room = maze.move("1")
+        origin, ahead = maze._curr_npc, maze._next_npc
+        assert maze.talk_with_context("greeting", room)[0]   # not ready yet: generated here instead
+        assert origin.ready.wait(10) and ahead.ready.wait(10)   # let both background jobs settle
+        maze.close()
+        # origin (cancelled), room ahead, greeting: the origin job is not re-run afterwards
+        assert METRICS.summary()["npc_cancelled"] == 1 and stub.calls == 3
+    finally:
+        model_interface.set_backend(None)
+
+
+def test_resume_on_another_day_keeps_walls_and_rooms(monkeypatch):
+    import datetime as dt
+    import maze.generator as gen
+    from maze.ingest import ingest_profile
+    profile = synthetic_profile(10, 2)
+    day = dt.date(2026, 10, 19)
+    profile["google"]["calendar_events"] = [{"summary": "Dentist", "start": "2026-10-22"}]
+    monkeypatch.setattr(gen, "load_ingested", lambda pro, path=None: ingest_profile(pro, day))
+    maze = MazeGenerator(profile, pregenerate=False, seed=2)
+    rng = random.Random(2)
+    walk = []
+    for _ in range(200):
+        room = maze.move(rng.choice(maze.open_moves()))
+        walk.append({"theme": room.theme, "x": maze.position[0], "y": maze.position[1],
+                     "seed": room.seed, "description": room.description})
+        if "Dentist in 3 days" in room.description:
+            break
+    else:
+        pytest.fail("no room mentioned the calendar event")
+
+    day += dt.timedelta(days=1)   # "Dentist in 3 days" is now "in 2 days"
+    again = MazeGenerator(profile, pregenerate=False, seed=maze.seed, room_parts=maze.room_parts)
+    again.restore([{k: v for k, v in r.items() if k != "description"} for r in walk])
+    assert again._grid.seed == maze._grid.seed and again.open_moves() == maze.open_moves()
+    assert [again.describe((r["x"], r["y"])) for r in walk] == [r["description"] for r in walk]
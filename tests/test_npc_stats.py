@@ -0,0 +1,24 @@
+from maze.npc_stats import NpcStats
+
+def test_counts_accumulate_per_line():
+    st = NpcStats(["Ana", "Ana Lima", "Rui"], yt_channels=["Lofi Girl"], playlists=["Rui"])
+    st.add("Ana Lima waits beside Rui.")
+    st.add("Rui hums a Lofi Girl loop.")
+    st.add("Nothing familiar here.")
+    snap = st.snapshot()
+    assert snap["total_npcs"] == 3
+    # a name counts wherever it occurs, even inside a longer one
+    assert snap["contact_mentions"] == {"Ana": 1, "Ana Lima": 1, "Rui": 2}
+    # Rui is both a contact and a playlist, so each mention weighs 2.
+    assert snap["most_npc"] == "Rui"
+    assert snap["most_contact"] == "Rui"
+
+def test_overlapping_names_are_all_counted():
+    st = NpcStats(["Ana Li", "Lima", "Ana"])
+    st.add("Ana Lima")
+    assert st.snapshot()["contact_mentions"] == {"Ana Li": 1, "Lima": 1, "Ana": 1}
+
+def test_no_names():
+    st = NpcStats([])
+    st.add("A shadow lingers here.")
+    assert st.snapshot() == {"total_npcs": 1, "most_npc": None, "most_contact": None, "contact_mentions": {}}
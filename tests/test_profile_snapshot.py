@@ -0,0 +1,52 @@
+import os
+
+from maze.ingest import ingest_profile
+from utils.json_io import save_json
+from utils.profile_snapshot import (
+    dump_snapshot, load_profile, parse_snapshot, snapshot_path_for, trim_profile,
+)
+
+PROFILE = {
+    "full_name": "Ana Silva",
+    "google": {
+        "profile": {"name": "Ana Silva", "given_name": "Ana", "email": "a@x", "birthdate": "1990-05-01",
+                    "locale": "pt"},
+        "contacts": [{"name": "Rui", "email": "r@x", "birthday": "01-02"}],
+        "calendar_events": [{"summary": "Exam", "start": "2030-01-02", "end": "2030-01-02"}],
+        "youtube_history": [{"title": "Song", "url": "https://y"}],
+        "youtube_channels": ["Chan"], "gmail_subjects": ["Hi"], "tasks": ["Do"],
+    },
+    "spotify": {
+        "top_tracks": [{"id": "t1", "name": "N", "artists": ["A"], "uri": "spotify:track:t1"}],
+        "audio_features": {"t1": {"valence": 0.9, "energy": 0.2, "tempo": 120.0}, "t9": {"valence": 0.1}},
+        "playlists": ["P"], "genres": ["rock"], "top_artist": "A", "liked_tracks": ["L"],
+    },
+}
+
+
+def test_trim_keeps_only_used_fields():
+    t = trim_profile(PROFILE)
+    assert t["google"]["contacts"] == [{"name": "Rui"}]
+    assert "locale" not in t["google"]["profile"]
+    assert t["spotify"]["audio_features"] == {"t1": {"valence": 0.9, "energy": 0.2}}
+    assert ingest_profile(t) == ingest_profile(PROFILE)
+
+
+def test_roundtrip():
+    data = {"a": [1, -2, 3.5, None, True, False, "x", "x"], "b": {"c": "ü"}}
+    assert parse_snapshot(dump_snapshot(data, 7, 9)) == (7, 9, data)
+    assert parse_snapshot(b"garbage") is None
+
+
+def test_load_profile_rebuilds_when_source_changes(tmp_path):
+    fp = tmp_path / "user_profile.json"
+    save_json(fp, PROFILE)
+    first = load_profile(fp)
+    assert snapshot_path_for(fp).exists()
+    assert load_profile(fp) == first
+
+    save_json(fp, {**PROFILE, "full_name": "Bea Costa"})
+    st = fp.stat()
+    os.utime(fp, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+    assert load_profile(fp)["full_name"] == "Bea Costa"
+    assert load_profile(tmp_path / "missing.json") is None
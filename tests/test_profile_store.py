@@ -0,0 +1,28 @@
+from utils.json_io import load_json, save_json
+from utils.profile_store import ProfileStore
+
+
+def test_sections_are_written_once_on_flush(tmp_path):
+    fp = tmp_path / "user_profile.json"
+    save_json(fp, {"google": {"contacts": []}})
+    store = ProfileStore(fp)
+    store.set_section("spotify", {"top_tracks": []})
+    store.set_section("google", {"contacts": [{"name": "Ana"}]})
+    assert store.dirty == {"google", "spotify"}
+    assert "spotify" not in load_json(fp)
+    assert store.flush() is True
+    assert load_json(fp, cache=False) == store.data
+    assert store.flush() is False
+
+
+def test_unchanged_section_is_not_dirty(tmp_path):
+    fp = tmp_path / "user_profile.json"
+    save_json(fp, {"google": {"contacts": []}})
+    store = ProfileStore(fp)
+    store.set_section("google", {"contacts": []})
+    assert not store.dirty
+
+
+def test_missing_file_starts_empty(tmp_path):
+    store = ProfileStore(tmp_path / "none.json")
+    assert store.data == {} and store.flush() is False
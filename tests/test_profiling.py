@@ -0,0 +1,24 @@
+import json
+
+from utils.profiling import OpProfiler
+
+def _work(n):
+    return sum(i * i for i in range(n))
+
+def test_disabled_is_pass_through():
+    prof = OpProfiler()
+    assert prof.wrap("move", _work) is _work
+    assert prof.call("move", _work, 10) == 285
+
+def test_profiles_and_summary(tmp_path, capsys):
+    prof = OpProfiler(tmp_path)
+    for _ in range(3):
+        assert prof.call("move", _work, 20000) == _work(20000)
+    prof.wrap("talk", _work)(5)
+    assert any("_work" in where for _, _, where in prof.hot_spots())
+    prof.close()
+    files = {p.name.split("-")[0] for p in tmp_path.iterdir()}
+    assert files == {"move", "talk", "summary"}
+    summary = json.loads(next(tmp_path.glob("summary-*.json")).read_text())
+    assert summary["move"]["calls"] == 3 and summary["talk"]["profiled"] == 1
+    assert "Hot spots" in capsys.readouterr().out
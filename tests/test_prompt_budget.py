@@ -0,0 +1,64 @@
+import pytest
+
+pytest.importorskip("dotenv")   # llm.metrics reads config.py
+
+from llm import tokens                                               # noqa: E402
+from llm.metrics import METRICS                                      # noqa: E402
+from llm.prompt_builder import build_npc_prompt, rank_by_relevance   # noqa: E402
+from llm.tokens import count_tokens                                  # noqa: E402
+
+PROFILE = {"google": {"profile": {"name": "Ana Silva", "email": "a@x"}}}
+ROOM = "Sunbeams dance across peach walls and a plush sofa. Hope swells as memories of Rui resurface."
+
+
+@pytest.fixture(autouse=True)
+def _estimate_tokens():
+    tokens.set_tokenizer(None)
+    yield
+    tokens.set_tokenizer(None)
+
+
+@pytest.mark.parametrize("budget", [250, 400, 600])
+def test_large_profile_stays_within_budget(budget):
+    hooks = {f"hook{i}": f"Some long personal detail number {i} " * 3 for i in range(200)}
+    contacts = [f"Contact Person {i}" for i in range(5000)] + ["Rui"]
+    prompt = build_npc_prompt(PROFILE, ROOM, hooks, "a", "", contacts=contacts, budget=budget)
+    assert count_tokens(prompt) <= budget + 5
+    assert "<<hook" in prompt
+
+
+def test_relevant_items_come_first():
+    prompt = build_npc_prompt(PROFILE, ROOM, {"genre": "rock", "contact": "Rui"}, "b", "",
+                              contacts=[f"C{i}" for i in range(300)] + ["Rui"], budget=240)
+    assert "List of player contacts: Rui" in prompt
+    assert prompt.index("<<contact>> = Rui") < prompt.find("<<genre>> = rock") or "<<genre>>" not in prompt
+    ranked = rank_by_relevance([("genre", "rock"), ("name", "Ana")], "nothing", preferred=("name",))
+    assert ranked[0][0] == "name"
+
+
+def test_long_room_description_is_truncated():
+    room = " ".join(["corridor"] * 2000)
+    prompt = build_npc_prompt(PROFILE, room, {"name": "Ana"}, "a", "", budget=300)
+    assert count_tokens(prompt) <= 300 and "<<name>> = Ana" in prompt
+
+
+def test_token_counts_are_cached():
+    METRICS.reset()
+    calls = []
+    tokens.set_tokenizer(lambda t: calls.append(t) or len(t.split()))
+    assert count_tokens("one two three") == 3
+    assert count_tokens("one two three") == 3
+    assert calls == ["one two three"]
+    assert METRICS.summary()["cache_hit_rates"]["tokens"] == 0.5
+
+
+def test_contact_scan_is_bounded_near_a_full_budget():
+    calls = []
+    tokens.set_tokenizer(lambda t: calls.append(t) or len(t.split()))
+    contacts = [f"Contact Person {i}" for i in range(20000)]
+    build_npc_prompt(PROFILE, ROOM + " Ana Lima waves.", {"name": "Ana"}, "a", "",
+                     contacts=contacts + ["Ana Lima"], budget=400)
+    assert len(calls) < 500
+    prompt = build_npc_prompt(PROFILE, ROOM + " Ana Lima waves.", {"name": "Ana"}, "a", "",
+                              contacts=contacts + ["Ana Lima"], budget=400)
+    assert "List of player contacts: Ana Lima, Contact Person 0" in prompt
@@ -0,0 +1,17 @@
+from maze.content import Template, compile_template
+from maze.room import Room
+
+
+def test_room_renders_on_read_and_has_no_dict():
+    tpl = Template(3, compile_template("{name}: {wall_color} walls, a {furniture}, {hook}, {contact} on {event}."))
+    items = ("Email letter",)
+    room = Room("sad", tpl, "piano", items, seed=9, hook="Exam", contact="Rui", color="grey",
+                context=("Mia", "Gig"))
+    assert room.description == "Mia: grey walls, a piano, Exam, Rui on Gig."
+    assert room.template_id == 3 and room.items is items
+    assert not hasattr(room, "__dict__")
+
+
+def test_room_with_fixed_text():
+    room = Room("dream", "A surreal, shifting space.", "blurred object")
+    assert room.description == "A surreal, shifting space." and room.template_id == -1
@@ -0,0 +1,100 @@
+import threading
+import pytest
+from llm.scheduler import (
+    InferenceScheduler, InferenceCancelled, PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND,
+)
+
+def _blocker(started, release):
+    def fn(should_stop):
+        started.set()
+        release.wait(2)
+        return "blocker"
+    return fn
+
+def test_interactive_runs_before_queued_background():
+    sched = InferenceScheduler("test")
+    started, release = threading.Event(), threading.Event()
+    order = []
+    first = sched.submit(_blocker(started, release), PRIORITY_BACKGROUND)
+    started.wait(2)
+    bg = sched.submit(lambda _s: order.append("bg"), PRIORITY_BACKGROUND)
+    fg = sched.submit(lambda _s: order.append("fg"), PRIORITY_INTERACTIVE)
+    release.set()
+    for f in (first, bg, fg):
+        f.result(2)
+    assert order == ["fg", "bg"]
+
+def test_cancel_by_tag():
+    sched = InferenceScheduler("test")
+    started, release = threading.Event(), threading.Event()
+    sched.submit(_blocker(started, release))
+    started.wait(2)
+    stale = sched.submit(lambda _s: "stale", tag=("room", 1))
+    fresh = sched.submit(lambda _s: "fresh", tag=("room", 2))
+    assert sched.cancel(("room", 1)) == 1
+    release.set()
+    with pytest.raises(InferenceCancelled):
+        stale.result(2)
+    assert fresh.result(2) == "fresh"
+
+def test_running_background_is_preempted_and_requeued():
+    sched = InferenceScheduler("test")
+    started = threading.Event()
+    runs = []
+
+    def background(should_stop):
+        runs.append("bg")
+        started.set()
+        for _ in range(200):
+            if should_stop():
+                return "partial"
+            threading.Event().wait(0.01)
+        return "done"
+
+    bg = sched.submit(background, PRIORITY_BACKGROUND)
+    started.wait(2)
+    assert sched.run(lambda _s: "fg") == "fg"
+    assert bg.result(5) == "done"
+    assert runs == ["bg", "bg"]
+
+def test_owners_are_served_round_robin():
+    sched = InferenceScheduler("test")
+    started, release = threading.Event(), threading.Event()
+    order = []
+    first = sched.submit(_blocker(started, release))
+    started.wait(2)
+    futs = [sched.submit(lambda _s, i=i: order.append(f"A{i}"), owner="A") for i in range(4)]
+    futs += [sched.submit(lambda _s, i=i: order.append(f"B{i}"), owner="B") for i in range(2)]
+    release.set()
+    for f in [first, *futs]:
+        f.result(2)
+    assert order == ["A0", "B0", "A1", "B1", "A2", "A3"]
+
+def test_close_runs_queued_jobs_then_stops():
+    sched = InferenceScheduler("test")
+    started, release = threading.Event(), threading.Event()
+    first = sched.submit(_blocker(started, release))
+    started.wait(2)
+    queued = sched.submit(lambda _s: "queued")
+    sched.close()
+    with pytest.raises(RuntimeError):
+        sched.submit(lambda _s: "late")
+    release.set()
+    assert first.result(2) == "blocker" and queued.result(2) == "queued"
+    sched._worker.join(2)
+    assert not sched._worker.is_alive()
+
+def test_replacing_the_backend_closes_its_scheduler():
+    pytest.importorskip("dotenv")   # config.py needs it
+    from llm import model_interface
+    first, second = (lambda *a: "a"), (lambda *a: "b")
+    model_interface.set_backend(first)
+    sched = model_interface._SCHEDULERS[id(first)]
+    try:
+        model_interface.set_backend(second)
+        assert id(first) not in model_interface._SCHEDULERS
+        sched._worker.join(2)
+        assert not sched._worker.is_alive()
+    finally:
+        model_interface.set_backend(None)
+    assert id(second) not in model_interface._SCHEDULERS
@@ -0,0 +1,105 @@
+import pytest
+
+pytest.importorskip("dotenv")   # config.py needs it
+
+from benchmarks.profiles import synthetic_profile          # noqa: E402
+from benchmarks.stub_llm import StubLLM                    # noqa: E402
+from llm import model_interface                            # noqa: E402
+from server.sessions import SessionError, SessionManager   # noqa: E402
+from utils.json_io import save_json                        # noqa: E402
+
+
+@pytest.fixture
+def manager(tmp_path):
+    model_interface.set_backend(StubLLM(seed=1))
+    profile = tmp_path / "user_profile.json"
+    save_json(profile, synthetic_profile(10, 1))
+    mgr = SessionManager(tmp_path / "sessions", profile, idle_s=60, max_live=2)
+    yield mgr
+    mgr.shutdown()
+    model_interface.set_backend(None)
+
+
+def test_actions_and_errors(manager):
+    sid = manager.create().sid
+    with pytest.raises(SessionError):
+        manager.call(sid, "talk", "a")
+    room = manager.call(sid, "move", "2")
+    assert room["room"] == 1 and room["description"]
+    assert manager.call(sid, "talk", "greeting")["greeting"] is True
+    assert manager.call(sid, "talk", "b")["greeting"] is False
+    assert manager.call(sid, "feedback", "1") == {"feedback": "😊 Happy"}
+    with pytest.raises(KeyError):
+        manager.call("no-such-session", "move", "1")
+
+
+def test_idle_sessions_are_evicted_and_restored(manager):
+    sid = manager.create().sid
+    exits = manager.call(sid, "move", "1")["exits"]
+    manager.call(sid, "move", exits[0])
+    assert manager.evict_idle(now=float("inf")) == 1
+    assert manager.stats()["live"] == 0
+    state = manager.get(sid).state()
+    assert state["room"] == 2 and state["rooms_visited"] == 2
+    assert "b" in state["exits"]   # back where we were, with the walk to retrace
+    assert manager.call(sid, "move", "b")["room"] == 3
+
+
+def test_lru_limit_and_delete(manager):
+    sids = [manager.create().sid for _ in range(3)]
+    assert manager.stats() == {"live": 2, "on_disk": 3}
+    assert manager.delete(sids[0])
+    assert manager.stats()["on_disk"] == 2
+    with pytest.raises(KeyError):
+        manager.get(sids[0])
+
+
+def test_restore_runs_outside_the_manager_lock(manager, monkeypatch):
+    import threading
+    from server.sessions import GameSession
+    slow_sid, live_sid = manager.create().sid, manager.create().sid
+    manager.evict_idle(now=float("inf"))
+    manager.get(live_sid)
+    started, release = threading.Event(), threading.Event()
+    restore = GameSession.restore
+
+    def slow_restore(sid, path):
+        started.set()
+        release.wait(5)
+        return restore(sid, path)
+
+    monkeypatch.setattr(GameSession, "restore", staticmethod(slow_restore))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(manager.get(slow_sid))) for _ in range(2)]
+    for t in threads:
+        t.start()
+    assert started.wait(5)
+    assert manager.get(live_sid).sid == live_sid   # not stuck behind the replay
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert len(results) == 2 and results[0] is results[1]
+
+
+def test_http_errors(manager, monkeypatch):
+    import http.client
+    import threading
+    from server.app import GameServer
+    from server.sessions import GameSession
+    srv = GameServer(("127.0.0.1", 0), manager)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+
+    def post(path, headers=None):
+        conn = http.client.HTTPConnection(*srv.server_address, timeout=5)
+        conn.request("POST", path, headers=headers or {"Content-Length": "0"})
+        return conn.getresponse().status
+
+    try:
+        sid = manager.create().sid
+        assert post(f"/sessions/{sid}/move", {"Content-Length": "-1"}) == 400
+        assert post("/sessions/no-such-session/move") == 404
+        monkeypatch.setattr(GameSession, "inspect", lambda self: {}["bug"])
+        assert post(f"/sessions/{sid}/inspect") == 500   # a KeyError inside an action is not a 404
+    finally:
+        srv.shutdown()
+        srv.server_close()
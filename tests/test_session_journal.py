@@ -0,0 +1,71 @@
+from utils.session_journal import SessionJournal, profile_hash
+
+def test_journal_replays_events(tmp_path):
+    prof = tmp_path / "user_profile.json"
+    prof.write_text('{"google": {}}', encoding="utf-8")
+    fp = tmp_path / "save.jsonl"
+    j = SessionJournal.start(fp, prof, maze_seed=42, room_parts={"hooks": ["Ana"], "context": ["Ana", "—"]})
+    j.append("room", idx=1, theme="sad", x=0, y=0, seed=7)
+    j.append("greeted")
+    j.append("event", kind="feedback", ts=1.0, label="😢 Sad")
+    j.close()
+    # a crash mid-write leaves a torn final line
+    with open(fp, "a", encoding="utf-8") as f:
+        f.write('{"type": "event", "ki')
+
+    state = SessionJournal.replay(fp)
+    assert state["profile_path"] == str(prof)
+    assert state["profile_hash"] == profile_hash(prof)
+    assert state["maze_seed"] == 42
+    assert state["room_parts"] == {"hooks": ["Ana"], "context": ["Ana", "—"]}
+    assert state["room_idx"] == 1
+    assert state["rooms"] == [{"idx": 1, "theme": "sad", "x": 0, "y": 0, "seed": 7}]
+    assert state["events"] == [
+        {"kind": "room", "idx": 1, "theme": "sad", "x": 0, "y": 0, "seed": 7},
+        {"kind": "feedback", "ts": 1.0, "label": "😢 Sad"},
+    ]
+    assert state["npc_greeted"] is True
+
+def test_replay_version1_log_lines(tmp_path):
+    prof = tmp_path / "user_profile.json"
+    prof.write_text("{}", encoding="utf-8")
+    fp = tmp_path / "save.jsonl"
+    j = SessionJournal.start(fp, prof)
+    j.append("room", idx=1, theme="sad", description="Rain.")
+    j.append("log", text="Room #1: sad – Rain.")
+    j.append("log", text="Player emotional feedback: 😊 Happy")
+    j.close()
+    events = SessionJournal.replay(fp)["events"]
+    assert [e["kind"] for e in events] == ["room", "text"]
+    assert events[1]["text"] == "Player emotional feedback: 😊 Happy"
+
+def test_replay_missing(tmp_path):
+    assert SessionJournal.replay(tmp_path / "nope.jsonl") is None
+
+def test_resume_after_torn_tail_keeps_new_records(tmp_path):
+    prof = tmp_path / "user_profile.json"
+    prof.write_text("{}", encoding="utf-8")
+    fp = tmp_path / "save.jsonl"
+    j = SessionJournal.start(fp, prof)
+    j.append("room", idx=1, theme="sad", x=0, y=0, seed=1)
+    j.close()
+    with open(fp, "a", encoding="utf-8") as f:
+        f.write('{"type": "room", "idx": 2, "the')
+    j = SessionJournal.resume(fp)
+    j.append("room", idx=3, theme="happy", x=1, y=0, seed=3)
+    j.append("room", idx=4, theme="happy", x=2, y=0, seed=4)
+    j.close()
+    state = SessionJournal.replay(fp)
+    assert state["room_idx"] == 4 and [r["idx"] for r in state["rooms"]] == [1, 3, 4]
+
+def test_resume_keeps_whole_last_line_without_newline(tmp_path):
+    prof = tmp_path / "user_profile.json"
+    prof.write_text("{}", encoding="utf-8")
+    fp = tmp_path / "save.jsonl"
+    SessionJournal.start(fp, prof).close()
+    with open(fp, "a", encoding="utf-8") as f:
+        f.write('{"type": "greeted"}')
+    j = SessionJournal.resume(fp)
+    j.append("room", idx=1, theme="sad", x=0, y=0, seed=1)
+    j.close()
+    assert SessionJournal.replay(fp)["room_idx"] == 1
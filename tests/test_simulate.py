@@ -0,0 +1,34 @@
+import random
+
+import pytest
+
+pytest.importorskip("dotenv")   # config.py needs it
+
+from benchmarks.simulate import parse_script, random_actions, simulate  # noqa: E402
+from benchmarks.profiles import synthetic_profile                       # noqa: E402
+from benchmarks.stub_llm import StubLLM                                 # noqa: E402
+from llm import model_interface                                         # noqa: E402
+
+
+def test_parse_script():
+    text = "move 2\n# comment\ngreet\ntalk b  # why\nfeedback 1\n"
+    assert parse_script(text) == [("move", "2"), ("greet", ""), ("talk", "b"), ("feedback", "1")]
+    with pytest.raises(ValueError):
+        parse_script("dance")
+
+
+def test_random_walk_starts_with_a_move():
+    acts = random_actions(50, random.Random(1))
+    assert len(acts) == 50 and acts[0][0] == "move"
+
+
+def test_simulate_reports_latency_per_action():
+    model_interface.set_backend(StubLLM(seed=3))
+    try:
+        res = simulate(synthetic_profile(10, 3), [parse_script("move 1\ngreet\ntalk a\ninspect\nmove 2")],
+                       pregenerate=False)
+    finally:
+        model_interface.set_backend(None)
+    assert res["rooms"] == 2
+    assert set(res["latency"]) == {"construct", "move", "greet", "talk", "inspect"}
+    assert res["latency"]["talk"]["n"] == 1
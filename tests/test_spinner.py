@@ -0,0 +1,29 @@
+import asyncio
+import sys
+
+from utils.spinner import await_with_spinner
+
+
+def test_await_with_spinner_returns_result():
+    async def work():
+        await asyncio.sleep(0.01)
+        return "done"
+
+    assert asyncio.run(await_with_spinner(work(), "Busy")) == "done"
+
+
+def test_returns_as_soon_as_result_is_ready(monkeypatch, capsys):
+    async def quick():
+        return 42
+
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: True, raising=False)
+    assert asyncio.run(await_with_spinner(quick(), msg="Busy")) == 42
+    # the result beat the first frame: only the clearing write reached the terminal
+    assert capsys.readouterr().out == "\r      \r"
+
+
+def test_tty_spinner_clears_line(monkeypatch, capsys):
+    monkeypatch.setattr(sys.stdout, "isatty", lambda: True, raising=False)
+    assert asyncio.run(await_with_spinner(asyncio.sleep(0.01), msg="Busy")) is None
+    out = capsys.readouterr().out
+    assert "Busy" in out and out.endswith("\r")
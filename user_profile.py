@@ -11,6 +11,8 @@ import json
 from pathlib import Path
 from typing import Final
 
+from utils.json_io import save_json
+
 _FILE: Final[Path] = Path(__file__).parent / "user_profile.json"
 
 class UserProfile(dict):
@@ -30,4 +32,4 @@ class UserProfile(dict):
             self["age"] = age
 
     def save(self) -> None:
-        _FILE.write_text(json.dumps(self, indent=2, ensure_ascii=False), encoding="utf-8")
+        save_json(_FILE, dict(self))
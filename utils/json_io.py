@@ -1,18 +1,88 @@
 # utils/json_io.py
+"""
+JSON helpers.
+
+* Writes go to a temp file in the same directory and are moved into place
+  with os.replace, so a crash never leaves a half-written profile.
+* orjson is used when installed (optional, not in requirements.txt).
+* compact=True skips pretty-printing for machine-read files.
+* load_json keeps a small cache keyed by (mtime_ns, size): loading an
+  unchanged file again skips the parse.  The cache keeps its own copy and
+  hands out fresh ones, so callers may mutate what they get or saved.
+"""
 from __future__ import annotations
+import copy
 import json
+import os
+import tempfile
+import threading
 from pathlib import Path
 from typing import Any
 
-def load_json(fp: str | Path, default: Any = None) -> Any:
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_CACHE: dict[str, tuple[int, int, Any]] = {}
+_CACHE_LOCK = threading.Lock()
+
+def _stamp(fp: Path) -> tuple[int, int]:
+    st = fp.stat()
+    return st.st_mtime_ns, st.st_size
+
+def _loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+def _dumps(obj: Any, compact: bool) -> bytes:
+    if orjson is not None:
+        opts = orjson.OPT_NON_STR_KEYS | (0 if compact else orjson.OPT_INDENT_2)
+        return orjson.dumps(obj, option=opts)
+    if compact:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+def load_json(fp: str | Path, default: Any = None, cache: bool = True) -> Any:
+    fp = Path(fp)
+    key = str(fp.resolve())
     try:
-        return json.loads(Path(fp).read_text(encoding="utf-8"))
+        stamp = _stamp(fp)
     except FileNotFoundError:
         return default
-    except json.JSONDecodeError:
+    if cache:
+        with _CACHE_LOCK:
+            hit = _CACHE.get(key)
+        if hit is not None and hit[:2] == stamp:
+            return copy.deepcopy(hit[2])
+    try:
+        obj = _loads(fp.read_bytes())
+    except FileNotFoundError:
         return default
+    except ValueError:   # json.JSONDecodeError / orjson.JSONDecodeError
+        return default
+    if cache:
+        with _CACHE_LOCK:
+            _CACHE[key] = (*stamp, copy.deepcopy(obj))
+    return obj
 
-def save_json(fp: str | Path, obj: Any) -> None:
-    Path(fp).write_text(
-        json.dumps(obj, indent=2, ensure_ascii=False), encoding="utf-8"
-    )
+def save_json(fp: str | Path, obj: Any, compact: bool = False) -> None:
+    fp = Path(fp)
+    data = _dumps(obj, compact)
+    fd, tmp = tempfile.mkstemp(prefix=f".{fp.name}.", suffix=".tmp", dir=fp.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, fp)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    key = str(fp.resolve())
+    with _CACHE_LOCK:
+        _CACHE[key] = (*_stamp(fp), copy.deepcopy(obj))
@@ -0,0 +1,131 @@
+# utils/profile_snapshot.py
+"""
+Compact binary snapshot of the profile fields the game actually reads.
+
+user_profile.json keeps raw API data (full audio-feature dicts, contact
+emails/birthdays, calendar end times…); the game needs a few hundred
+strings of it.  trim_profile() keeps only those, in the same nested
+shape, and the result is stored beside the profile as:
+
+    header   struct-packed magic, format version, interpreter tag,
+             source mtime_ns, source size
+    body     marshal of the trimmed dict with equal strings shared, so
+             every distinct string is stored (and loaded) once
+
+load_profile() returns the snapshot while the source file is unchanged and
+rebuilds it otherwise, so the full JSON is only parsed after it changes.
+"""
+from __future__ import annotations
+import marshal
+import struct
+import sys
+from pathlib import Path
+from typing import Any, Optional
+
+from utils.json_io import load_json
+
+SNAPSHOT_VERSION = 1
+_MAGIC  = b"MZPS"
+_HEADER = struct.Struct("<4sHHqq")   # magic, version, python/marshal tag, mtime_ns, size
+# marshal's format belongs to the interpreter; a snapshot from another one is rebuilt
+_PY_TAG = (sys.version_info[0] * 100 + sys.version_info[1]) * 10 + marshal.version
+
+_PROFILE_FIELDS = ("name", "given_name", "email", "birthdate")
+_FEATURE_FIELDS = ("valence", "energy")
+_GOOGLE_LISTS   = ("youtube_channels", "gmail_subjects", "tasks")
+_SPOTIFY_LISTS  = ("playlists", "genres", "liked_tracks")
+
+# ---------------------------------------------------------------------------- trim
+def trim_profile(pro: dict) -> dict:
+    """Keep only what MazeGenerator, the prompt builder and the player use."""
+    out: dict[str, Any] = {}
+    if pro.get("full_name"):
+        out["full_name"] = pro["full_name"]
+
+    g = pro.get("google")
+    if g:
+        gp = g.get("profile", {})
+        out["google"] = {
+            "profile": {k: gp[k] for k in _PROFILE_FIELDS if k in gp},
+            "contacts": [{"name": c.get("name", "")} for c in g.get("contacts", [])],
+            "calendar_events": [{"summary": ev.get("summary", ""), "start": ev.get("start", "")}
+                                for ev in g.get("calendar_events", [])],
+            "youtube_history": [{"title": v["title"]} for v in g.get("youtube_history", [])],
+            **{k: list(g.get(k, [])) for k in _GOOGLE_LISTS},
+        }
+
+    s = pro.get("spotify")
+    if s:
+        tracks = [{"id": t["id"], "name": t["name"], "artists": list(t["artists"])}
+                  for t in s.get("top_tracks", [])]
+        feats = s.get("audio_features", {})
+        out["spotify"] = {
+            "top_tracks": tracks,
+            "audio_features": {
+                t["id"]: {k: feats[t["id"]][k] for k in _FEATURE_FIELDS if k in feats[t["id"]]}
+                for t in tracks if t["id"] in feats
+            },
+            "top_artist": s.get("top_artist", ""),
+            **{k: list(s.get(k, [])) for k in _SPOTIFY_LISTS},
+        }
+    return out
+
+# ---------------------------------------------------------------------------- encode
+def _dedup(obj: Any, table: dict[str, str]) -> Any:
+    """Make equal strings the same object so marshal stores each once (as a ref)."""
+    if isinstance(obj, str):
+        return table.setdefault(obj, obj)
+    if isinstance(obj, list):
+        return [_dedup(v, table) for v in obj]
+    if isinstance(obj, dict):
+        return {table.setdefault(k, k): _dedup(v, table) for k, v in obj.items()}
+    return obj
+
+def dump_snapshot(data: dict, mtime_ns: int, size: int) -> bytes:
+    return (_HEADER.pack(_MAGIC, SNAPSHOT_VERSION, _PY_TAG, mtime_ns, size)
+            + marshal.dumps(_dedup(data, {}), marshal.version))
+
+def parse_snapshot(buf: bytes) -> Optional[tuple[int, int, dict]]:
+    """(source mtime_ns, source size, data), or None if `buf` is not a current snapshot."""
+    if len(buf) < _HEADER.size:
+        return None
+    magic, version, py_tag, mtime_ns, size = _HEADER.unpack_from(buf)
+    if magic != _MAGIC or version != SNAPSHOT_VERSION or py_tag != _PY_TAG:
+        return None
+    try:
+        data = marshal.loads(memoryview(buf)[_HEADER.size:])
+    except (EOFError, ValueError, TypeError):
+        return None
+    return (mtime_ns, size, data) if isinstance(data, dict) else None
+
+# ---------------------------------------------------------------------------- files
+def snapshot_path_for(profile_path: str | Path) -> Path:
+    return Path(profile_path).with_suffix(".snapshot.bin")
+
+def refresh_snapshot(profile_path: str | Path, pro: dict) -> dict:
+    """Trim `pro` (the current contents of `profile_path`) and store its snapshot."""
+    data = trim_profile(pro)
+    try:
+        st = Path(profile_path).stat()
+        snapshot_path_for(profile_path).write_bytes(dump_snapshot(data, st.st_mtime_ns, st.st_size))
+    except OSError as e:
+        print(f"[WARN] Could not write profile snapshot: {e}")
+    return data
+
+def load_profile(profile_path: str | Path) -> Optional[dict]:
+    """Trimmed profile for `profile_path`, or None if the profile does not exist."""
+    try:
+        st = Path(profile_path).stat()
+    except OSError:
+        return None
+    try:
+        snap = parse_snapshot(snapshot_path_for(profile_path).read_bytes())
+    except OSError:
+        snap = None
+    if snap and snap[:2] == (st.st_mtime_ns, st.st_size):
+        return snap[2]
+    # full parse only when the source changed; don't keep it in load_json's cache
+    pro = load_json(profile_path, cache=False)
+    if pro is None:
+        return None
+    return refresh_snapshot(profile_path, pro)
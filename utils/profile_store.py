@@ -0,0 +1,41 @@
+# utils/profile_store.py
+"""
+In-memory user_profile.json that collectors contribute sections to.
+
+The file is parsed once when the store is created; each collector replaces
+its own top-level section ("google", "spotify", …) and flush() writes the
+whole document once, atomically, and only if some section changed.
+"""
+from __future__ import annotations
+from pathlib import Path
+from typing import Any
+
+from utils.json_io import load_json, save_json
+
+class ProfileStore:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        # shallow copy: load_json's cached object must not see unsaved sections
+        self.data: dict[str, Any] = dict(load_json(self.path) or {})
+        self._dirty: set[str] = set()
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self.data.get(name, default)
+
+    def set_section(self, name: str, value: Any) -> None:
+        if self.data.get(name) == value:
+            return
+        self.data[name] = value
+        self._dirty.add(name)
+
+    @property
+    def dirty(self) -> frozenset:
+        return frozenset(self._dirty)
+
+    def flush(self) -> bool:
+        """Write the profile if any section changed. Returns True if written."""
+        if not self._dirty:
+            return False
+        save_json(self.path, self.data)
+        self._dirty.clear()
+        return True
@@ -0,0 +1,139 @@
+# utils/profiling.py
+"""
+Opt-in per-operation profiling for real sessions.
+
+    python cli.py --profile            # or MAZE_PROFILE_DIR=profiles python cli.py
+    python llm_worker.py --profile < request.json
+
+OpProfiler.call("talk", fn, ...) runs fn under cProfile and tracemalloc and
+folds the result into that operation's totals.  On close() every operation
+gets a `<op>-<pid>.prof` file (open it with `python -m pstats` or snakeviz),
+`summary-<pid>.json` holds calls / time / peak memory per operation, and
+the top hot spots (own time) and allocation sites are printed.
+
+Only one cProfile can run at a time, so an operation that overlaps another
+(background audio during a talk) is timed but not profiled.  Peak memory
+is process-wide and therefore approximate for overlapping operations.
+A profiler built without a directory is a no-op pass-through.
+"""
+from __future__ import annotations
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Callable, Optional, TextIO
+
+from utils.json_io import save_json
+
+TOP_N        = 15
+TRACE_FRAMES = 8   # tracemalloc stack depth
+
+class OpProfiler:
+    def __init__(self, out_dir: Optional[str | Path] = None, top: int = TOP_N):
+        self.out_dir = Path(out_dir) if out_dir else None
+        self.top = top
+        self._lock = threading.Lock()
+        self._active = threading.Lock()   # held while a cProfile is running
+        self._stats: dict[str, pstats.Stats] = {}
+        self._totals: dict[str, dict] = defaultdict(lambda: {"calls": 0, "total_s": 0.0, "max_s": 0.0,
+                                                             "profiled": 0, "peak_kb": 0.0})
+        if self.enabled and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACE_FRAMES)
+
+    @property
+    def enabled(self) -> bool:
+        return self.out_dir is not None
+
+    def call(self, op: str, fn: Callable, *args: Any, **kwargs: Any) -> Any:
+        if not self.enabled:
+            return fn(*args, **kwargs)
+        prof = cProfile.Profile() if self._active.acquire(blocking=False) else None
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        try:
+            if prof is None:
+                return fn(*args, **kwargs)
+            return prof.runcall(fn, *args, **kwargs)
+        finally:
+            dt = time.perf_counter() - t0
+            peak = (tracemalloc.get_traced_memory()[1] - base) / 1024
+            if prof is not None:
+                self._active.release()
+            self._add(op, dt, peak, prof)
+
+    def wrap(self, op: str, fn: Callable) -> Callable:
+        """`fn` with every call profiled as `op` (for callbacks handed to threads)."""
+        if not self.enabled:
+            return fn
+        return lambda *a, **kw: self.call(op, fn, *a, **kw)
+
+    def _add(self, op: str, dt: float, peak_kb: float, prof: Optional[cProfile.Profile]) -> None:
+        with self._lock:
+            t = self._totals[op]
+            t["calls"] += 1
+            t["total_s"] += dt
+            t["max_s"] = max(t["max_s"], dt)
+            t["peak_kb"] = max(t["peak_kb"], round(peak_kb, 1))
+            if prof is not None:
+                t["profiled"] += 1
+                if op in self._stats:
+                    self._stats[op].add(prof)
+                else:
+                    self._stats[op] = pstats.Stats(prof)
+
+    # ------------------------------------------------------------------  report
+    def hot_spots(self, n: Optional[int] = None) -> list[tuple[float, int, str]]:
+        """(own seconds, calls, "file:line(func)") for the slowest functions over all operations."""
+        merged: dict[tuple, list] = {}
+        with self._lock:
+            for st in self._stats.values():
+                for (fname, line, func), (_, nc, tt, _, _) in st.stats.items():
+                    acc = merged.setdefault((fname, line, func), [0.0, 0])
+                    acc[0] += tt
+                    acc[1] += nc
+        rows = sorted(((tt, nc, f"{_short(fname)}:{line}({func})") for (fname, line, func), (tt, nc) in merged.items()),
+                      reverse=True)
+        return rows[:n or self.top]
+
+    def close(self, out: Optional[TextIO] = None) -> None:
+        """Write the profiles and summary, print the hot spots (to stdout by default), stop tracing."""
+        if not self.enabled:
+            return
+        out = out or sys.stdout
+        self.out_dir.mkdir(parents=True, exist_ok=True)
+        pid = os.getpid()
+        with self._lock:
+            for op, st in self._stats.items():
+                st.dump_stats(str(self.out_dir / f"{op}-{pid}.prof"))
+            totals = {op: {**t, "total_s": round(t["total_s"], 4), "max_s": round(t["max_s"], 4)}
+                      for op, t in self._totals.items()}
+        save_json(self.out_dir / f"summary-{pid}.json", totals)
+
+        print(f"[INFO] Profiles written to {self.out_dir}", file=out)
+        for op, t in sorted(totals.items(), key=lambda kv: -kv[1]["total_s"]):
+            avg = t["total_s"] / t["calls"] * 1000
+            print(f"  {op:<14} {t['calls']:>5}× avg {avg:8.1f} ms  max {t['max_s'] * 1000:8.1f} ms  "
+                  f"peak +{t['peak_kb']:.0f} KiB", file=out)
+        spots = self.hot_spots()
+        if spots:
+            print("[INFO] Hot spots (own time):", file=out)
+            for tt, nc, where in spots:
+                print(f"  {tt * 1000:9.1f} ms {nc:>8}×  {where}", file=out)
+        if tracemalloc.is_tracing():
+            stats = tracemalloc.take_snapshot().statistics("lineno")[:self.top // 2 or 1]
+            print("[INFO] Largest live allocations:", file=out)
+            for s in stats:
+                frame = s.traceback[0]
+                print(f"  {s.size / 1024:9.1f} KiB {s.count:>8}×  {_short(frame.filename)}:{frame.lineno}", file=out)
+            tracemalloc.stop()
+
+def _short(fname: str) -> str:
+    """Path relative to the working directory when it is inside it."""
+    cwd = os.getcwd() + os.sep
+    return fname[len(cwd):] if fname.startswith(cwd) else fname
@@ -0,0 +1,150 @@
+# utils/session_journal.py
+"""
+Append-only session journal (JSON lines).
+
+The first line is a header that references the profile by path + sha1
+instead of embedding it, plus the maze seed and the strings its rooms
+are filled from (some depend on the day).  Every room entered, typed
+event (see maze/event_log.py) and greeting is appended as it happens, so
+saving costs one short write per event and a crash loses at most the line
+being written.  Rooms are journaled as their position and seed, not their
+text; MazeGenerator.restore() rebuilds them.  replay() folds the events
+back into the state cli.py resumes from.
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Optional
+
+JOURNAL_VERSION = 3
+
+def legacy_event(text: str) -> Optional[dict]:
+    """
+    Event record for a version-1 "log" line.  Room lines are dropped: the
+    matching "room" record already replays as a room event.
+    """
+    if text.startswith("Room #"):
+        return None
+    return {"kind": "text", "text": text}
+
+def profile_hash(fp: str | Path) -> str:
+    h = hashlib.sha1()
+    with open(fp, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+def _repair_tail(path: Path, chunk: int = 4096) -> None:
+    """
+    End the journal on a newline before appending to it: a torn last line
+    (crash mid-write) is cut off, a whole one missing only its newline gets
+    it.  Otherwise the next record would be glued onto it and lost on replay.
+    """
+    with open(path, "rb+") as f:
+        end = f.seek(0, os.SEEK_END)
+        pos, tail = end, b""
+        while pos > 0:
+            pos = max(0, pos - chunk)
+            f.seek(pos)
+            tail = f.read(end - pos)
+            cut = tail.rfind(b"\n")
+            if cut != -1:
+                pos, tail = pos + cut + 1, tail[cut + 1:]
+                break
+        if not tail:
+            return
+        try:
+            json.loads(tail)
+        except ValueError:
+            f.truncate(pos)
+        else:
+            f.write(b"\n")
+
+class SessionJournal:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._fh = None
+
+    # ------------------------------------------------------------------  open
+    @classmethod
+    def start(cls, path: str | Path, profile_path: str | Path, maze_seed: Optional[int] = None,
+              room_parts: Optional[dict] = None) -> "SessionJournal":
+        """Begin a new journal (replacing any old one) for `profile_path`."""
+        j = cls(path)
+        j._fh = open(j.path, "w", encoding="utf-8")
+        j._write({
+            "type": "header", "version": JOURNAL_VERSION, "started": time.time(),
+            "profile_path": str(profile_path), "profile_hash": profile_hash(profile_path),
+            "maze_seed": maze_seed, "room_parts": room_parts,
+        })
+        return j
+
+    @classmethod
+    def resume(cls, path: str | Path) -> "SessionJournal":
+        j = cls(path)
+        _repair_tail(j.path)
+        j._fh = open(j.path, "a", encoding="utf-8")
+        return j
+
+    # ------------------------------------------------------------------  write
+    def append(self, kind: str, /, **fields: Any) -> None:
+        self._write({"type": kind, **fields})
+
+    def _write(self, rec: dict) -> None:
+        if self._fh is None:
+            return
+        self._fh.write(json.dumps(rec, ensure_ascii=False) + "\n")
+        self._fh.flush()
+
+    def close(self) -> None:
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+    def delete(self) -> None:
+        self.close()
+        if self.path.exists():
+            os.remove(self.path)
+
+    # ------------------------------------------------------------------  read
+    @staticmethod
+    def replay(path: str | Path) -> Optional[dict]:
+        """Rebuild resumable state from a journal, or None if there is none."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        state: dict[str, Any] = {
+            "profile_path": None, "profile_hash": None, "maze_seed": None, "room_parts": None,
+            "room_idx": 0, "rooms": [], "events": [], "npc_greeted": False,
+        }
+        with open(path, "r", encoding="utf-8") as f:
+            for raw in f:
+                try:
+                    ev = json.loads(raw)
+                except json.JSONDecodeError:
+                    break   # torn final line after a crash
+                kind = ev.get("type")
+                if kind == "header":
+                    state["profile_path"] = ev.get("profile_path")
+                    state["profile_hash"] = ev.get("profile_hash")
+                    state["maze_seed"] = ev.get("maze_seed")
+                    state["room_parts"] = ev.get("room_parts")
+                elif kind == "room":
+                    del ev["type"]   # {"idx", "theme", "x", "y", "seed"}; older versions: "description"
+                    state["room_idx"] = ev["idx"]
+                    state["rooms"].append(ev)
+                    state["npc_greeted"] = False
+                    state["events"].append({"kind": "room", **ev})
+                elif kind == "event":
+                    del ev["type"]
+                    state["events"].append(ev)
+                elif kind == "log":
+                    rec = legacy_event(ev["text"])
+                    if rec is not None:
+                        state["events"].append(rec)
+                elif kind == "greeted":
+                    state["npc_greeted"] = True
+        return state if state["profile_path"] else None
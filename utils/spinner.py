@@ -0,0 +1,37 @@
+# utils/spinner.py
+"""
+Spinner for awaited work.
+
+await_with_spinner() awaits the awaitable directly while a sibling task
+redraws the spinner every SPIN_INTERVAL seconds, so it returns the moment
+the result is ready.  The spinner is only drawn when stdout is a terminal.
+"""
+from __future__ import annotations
+import asyncio
+import itertools
+import sys
+from typing import Any, Awaitable
+
+SPIN_INTERVAL = 0.2
+_FRAMES = "|/-\\"
+
+async def await_with_spinner(aw: Awaitable[Any], msg: str = "Loading...",
+                             color: str = "", reset: str = "") -> Any:
+    """Await `aw` while a spinner task draws (TTY only); return its result."""
+    out = sys.stdout
+    if not out.isatty():
+        return await aw
+
+    async def spin() -> None:
+        for frame in itertools.cycle(_FRAMES):
+            out.write(f"\r{color}{msg} {frame}{reset}")
+            out.flush()
+            await asyncio.sleep(SPIN_INTERVAL)
+
+    task = asyncio.create_task(spin())
+    try:
+        return await aw
+    finally:
+        task.cancel()
+        out.write("\r" + " " * (len(msg) + 2) + "\r")
+        out.flush()